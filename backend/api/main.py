@@ -1384,22 +1384,17 @@ async def get_analytics(days: int = 30):
 
 # ===== Google Drive API Endpoints =====
 
-SYNC_LOG_FILE = "sync_log.json"
-
 @app.get("/api/drive/sync-log")
 async def get_drive_sync_log():
     """Get Google Drive sync log and stats."""
     try:
-        import json
-        from pathlib import Path
+        # The sync script owns the log format (append-only JSON lines)
+        from sync_output_to_drive import load_sync_log
         
-        sync_log = {}
+        sync_log = load_sync_log()
         stats = None
         
-        if Path(SYNC_LOG_FILE).exists():
-            with open(SYNC_LOG_FILE, 'r') as f:
-                sync_log = json.load(f)
-            
+        if sync_log:
             # Calculate stats
             total_files = len(sync_log)
             total_size = sum(int(v.get('size', 0)) for v in sync_log.values())
@@ -13,6 +13,7 @@ class Settings:
     """Application settings with validation and defaults."""
     
     def __init__(self):
+        self._all_settings: Optional[Dict[str, Any]] = None
         self.validate_required_settings()
     
     # API Keys
@@ -138,7 +139,17 @@ class Settings:
             raise ValueError("Missing required settings: Either PERPLEXITY_API_KEY or OPENAI_API_KEY must be set")
     
     def get_all_settings(self) -> Dict[str, Any]:
-        """Get all settings as a dictionary (excluding sensitive data)."""
+        """Get all settings as a dictionary (excluding sensitive data).
+        
+        Built once per instance and returned as a copy, so callers can't
+        change each other's view; call invalidate_cache() after changing
+        the environment.
+        """
+        if self._all_settings is None:
+            self._all_settings = self._build_all_settings()
+        return dict(self._all_settings)
+    
+    def _build_all_settings(self) -> Dict[str, Any]:
         return {
             "debug_mode": self.debug_mode,
             "max_video_duration": self.max_video_duration,
@@ -157,6 +168,10 @@ class Settings:
             "has_pixabay_key": bool(self.pixabay_api_key),
         }
     
+    def invalidate_cache(self):
+        """Drop the cached get_all_settings() result."""
+        self._all_settings = None
+    
     def create_directories(self):
         """Create necessary directories if they don't exist."""
         directories = [
@@ -171,7 +186,8 @@ class Settings:
         ]
         
         for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
+            if not directory.is_dir():
+                directory.mkdir(parents=True, exist_ok=True)
 
 # Global settings instance
 settings = Settings()
\ No newline at end of file
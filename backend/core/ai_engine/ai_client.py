@@ -8,6 +8,7 @@ import logging
 from typing import Optional, List, Dict, Any
 from openai import OpenAI
 from dotenv import load_dotenv
+from backend.utils.rate_limiter import api_rate_limiter
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
@@ -91,12 +92,14 @@ def chat_completion(
     if openai:
         try:
             logger.info("[OpenAI] Using fallback...")
-            response = openai.chat.completions.create(
+            raw_response = openai.chat.completions.with_raw_response.create(
                 model=OPENAI_MODEL,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens
             )
+            api_rate_limiter.observe_response("openai", raw_response.headers)
+            response = raw_response.parse()
             content = response.choices[0].message.content
             logger.debug(f"[OpenAI] Fallback success")
             return content
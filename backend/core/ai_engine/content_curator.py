@@ -11,6 +11,7 @@ import os
 import json
 import random
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
@@ -39,6 +40,13 @@ CONTENT_CATEGORIES = [
 
 # Cache file for tracking uploaded content
 CACHE_FILE = "cache/uploaded_content.json"
+HISTORY_LIMIT = 100
+
+# In-memory copy of the upload history (list keeps order, set gives O(1) lookups)
+_history: Optional[List[str]] = None
+_history_set: set = set()
+# Uploads run in worker threads, so history updates and saves are serialized
+_history_lock = threading.RLock()
 
 
 def get_random_creator_url() -> Optional[str]:
@@ -51,10 +59,13 @@ def get_random_creator_url() -> Optional[str]:
     return f"https://www.meta.ai/@{username}"
 
 
-def get_trending_prompt(category: str = None) -> Dict:
+def get_trending_prompt(category: str = None, seen: Optional[set] = None) -> Dict:
     """
     Get a trending prompt idea using AI.
     Returns prompt + metadata for creating content on Meta AI.
+    
+    Ideas already uploaded, or whose prompt[:50] is in seen, are skipped
+    when a fresh one is available.
     """
     from backend.core.ai_engine.meta_ai_discovery import search_trending_meta_ai_content
     
@@ -71,7 +82,12 @@ def get_trending_prompt(category: str = None) -> Dict:
     
     ideas = search_trending_meta_ai_content(category)
     if ideas:
-        idea = random.choice(ideas)
+        history = _get_history_set()
+        fresh = [
+            i for i in ideas
+            if i["prompt"][:50] not in history and (seen is None or i["prompt"][:50] not in seen)
+        ]
+        idea = random.choice(fresh or ideas)
         idea["category"] = category
         return idea
     
@@ -95,24 +111,44 @@ def load_upload_history() -> List[str]:
 
 
 def save_upload_history(history: List[str]):
-    """Save upload history."""
+    """Atomically save upload history (a crash mid-write keeps the old file)."""
     os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-    with open(CACHE_FILE, 'w') as f:
-        json.dump(history[-100:], f)  # Keep last 100
+    tmp_file = CACHE_FILE + ".tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(history[-HISTORY_LIMIT:], f)
+    os.replace(tmp_file, CACHE_FILE)
+
+
+def _get_history_set() -> set:
+    """Get the upload history as a set, reading the cache file only once."""
+    global _history, _history_set
+    with _history_lock:
+        if _history is None:
+            _history = load_upload_history()
+            _history_set = set(_history)
+        return _history_set
 
 
 def mark_as_uploaded(url_or_prompt: str):
-    """Mark content as uploaded to avoid duplicates."""
-    history = load_upload_history()
-    if url_or_prompt not in history:
-        history.append(url_or_prompt)
-        save_upload_history(history)
+    """Mark content as uploaded to avoid duplicates (safe to call from threads)."""
+    with _history_lock:
+        history_set = _get_history_set()
+        if url_or_prompt in history_set:
+            return
+        
+        _history.append(url_or_prompt)
+        history_set.add(url_or_prompt)
+        
+        # Keep the in-memory copy in step with what gets saved
+        while len(_history) > HISTORY_LIMIT:
+            history_set.discard(_history.pop(0))
+        
+        save_upload_history(_history)
 
 
 def is_already_uploaded(url_or_prompt: str) -> bool:
     """Check if content was already uploaded."""
-    history = load_upload_history()
-    return url_or_prompt in history
+    return url_or_prompt in _get_history_set()
 
 
 def curate_content_for_upload(count: int = 1) -> List[Dict]:
@@ -185,6 +221,7 @@ def get_daily_content_plan(count: int = 3) -> List[Dict]:
     """
     plan = []
     used_categories = []
+    seen = set()
     
     for i in range(count):
         # Try to vary categories
@@ -204,7 +241,8 @@ def get_daily_content_plan(count: int = 3) -> List[Dict]:
                 break
         
         used_categories.append(selected_cat)
-        idea = get_trending_prompt(selected_cat)
+        idea = get_trending_prompt(selected_cat, seen)
+        seen.add(idea["prompt"][:50])
         
         plan.append({
             "slot": i + 1,
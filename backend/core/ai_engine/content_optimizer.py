@@ -9,7 +9,7 @@ from typing import Dict, List, Any, Optional
 from openai import OpenAI
 from dotenv import load_dotenv
 from backend.utils.error_handler import retry_with_backoff, handle_api_error
-from backend.utils.rate_limiter import rate_limit
+from backend.utils.rate_limiter import rate_limit, api_rate_limiter
 from backend.utils.cache_manager import cached
 from backend.config.settings import settings
 
@@ -88,7 +88,7 @@ class ContentOptimizer:
         """
         
         try:
-            response = client.chat.completions.create(
+            raw_response = client.chat.completions.with_raw_response.create(
                 model=model,
                 messages=[
                     {"role": "system", "content": "You are a viral content expert who analyzes short-form video scripts. Return only valid JSON."},
@@ -97,6 +97,8 @@ class ContentOptimizer:
                 temperature=0.3,
                 timeout=30
             )
+            api_rate_limiter.observe_response("openai", raw_response.headers)
+            response = raw_response.parse()
             
             import json
             analysis = json.loads(response.choices[0].message.content.strip())
@@ -163,7 +165,7 @@ class ContentOptimizer:
         """
         
         try:
-            response = client.chat.completions.create(
+            raw_response = client.chat.completions.with_raw_response.create(
                 model=model,
                 messages=[
                     {"role": "system", "content": "You are a viral content optimizer. Create engaging, scroll-stopping scripts."},
@@ -172,6 +174,8 @@ class ContentOptimizer:
                 temperature=0.7,
                 timeout=30
             )
+            api_rate_limiter.observe_response("openai", raw_response.headers)
+            response = raw_response.parse()
             
             optimized_script = response.choices[0].message.content.strip()
             
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 from openai import OpenAI
 from dotenv import load_dotenv
 from backend.utils.error_handler import retry_with_backoff, handle_api_error
-from backend.utils.rate_limiter import rate_limit
+from backend.utils.rate_limiter import rate_limit, api_rate_limiter
 from backend.utils.cache_manager import cached
 from backend.config.settings import settings
 
@@ -246,7 +246,7 @@ class TrendAnalyzer:
         """
         
         try:
-            response = client.chat.completions.create(
+            raw_response = client.chat.completions.with_raw_response.create(
                 model=model,
                 messages=[
                     {"role": "system", "content": "You are a viral content trend analyst. Return only valid JSON."},
@@ -255,6 +255,8 @@ class TrendAnalyzer:
                 temperature=0.3,
                 timeout=30
             )
+            api_rate_limiter.observe_response("openai", raw_response.headers)
+            response = raw_response.parse()
             
             import json
             analysis = json.loads(response.choices[0].message.content.strip())
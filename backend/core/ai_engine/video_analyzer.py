@@ -3,12 +3,25 @@ Video Content Analyzer
 Extracts frames from video and uses AI to describe the content.
 """
 import os
+import io
 import base64
+import hashlib
 import logging
+import functools
+import threading
 import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional, List
 from dotenv import load_dotenv
 
+try:
+    import numpy as np
+    from PIL import Image
+    DHASH_AVAILABLE = True
+except ImportError:
+    DHASH_AVAILABLE = False
+
 load_dotenv("config.env")
 logger = logging.getLogger(__name__)
 
@@ -16,6 +29,47 @@ logger = logging.getLogger(__name__)
 OPENAI_KEY = os.getenv("OPENAI_API_KEY")
 PERPLEXITY_KEY = os.getenv("PERPLEXITY_API_KEY")
 
+# Part of the analysis cache key - bump the version when the vision prompt changes
+VISION_MODEL = "gpt-4o-mini"
+ANALYSIS_PROMPT_VERSION = 2
+
+# All unique sampled frames go to the vision model in a single request
+VISION_MAX_FRAMES = 4
+
+# Frames are extracted/OCR'd in parallel; repeated frames reuse earlier OCR text
+OCR_CONCURRENCY = int(os.getenv("OCR_CONCURRENCY", "4"))
+OCR_CACHE_MAXSIZE = 1024
+_ocr_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# In-process caches are LRU-bounded and shared by OCR worker threads
+_cache_lock = threading.Lock()
+
+def _cache_get(cache: OrderedDict, key: str):
+    """Get a cached value (None if absent), marking it most recently used."""
+    with _cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+def _cache_put(cache: OrderedDict, key: str, value, maxsize: int):
+    """Store a value, evicting the least recently used entries beyond maxsize."""
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+
+# Never sample analysis frames closer together than this (content rarely changes faster)
+TARGET_FPS = 1
+
+# Frames within this dHash (Hamming) distance of an earlier frame are skipped
+DHASH_MAX_DISTANCE = 4
+
+# Analyses by video content hash, so one pipeline run never analyzes the same video twice
+ANALYSIS_CACHE_MAXSIZE = 256
+_analysis_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
 def find_ffmpeg():
     import shutil
     import glob
@@ -38,13 +92,43 @@ def extract_frame(video_path: str, output_path: str, time_sec: float = 1.0) -> b
     except:
         return False
 
-def extract_multiple_frames(video_path: str, output_dir: str, count: int = 3) -> List[str]:
-    """Extract multiple frames from video at different timestamps."""
+@functools.lru_cache(maxsize=1)
+def has_cuda_decode() -> bool:
+    """Check (once) whether ffmpeg was built with CUDA/NVDEC decoding."""
     if not FFMPEG_PATH:
-        return []
+        return False
+    try:
+        result = subprocess.run([FFMPEG_PATH, '-hide_banner', '-hwaccels'],
+                                capture_output=True, text=True, timeout=10)
+        return "cuda" in result.stdout.split()
+    except:
+        return False
+
+def extract_frame_bytes(video_path: str, time_sec: float = 1.0) -> Optional[bytes]:
+    """Extract a single frame at the specified time as JPEG bytes (piped, no temp file).
     
-    os.makedirs(output_dir, exist_ok=True)
-    frames = []
+    Decodes on the GPU when ffmpeg supports CUDA, falling back to software
+    decode if that fails (no device, unsupported codec).
+    """
+    if not FFMPEG_PATH:
+        return None
+    
+    hwaccel_args = [['-hwaccel', 'cuda'], []] if has_cuda_decode() else [[]]
+    for hwaccel in hwaccel_args:
+        try:
+            cmd = [FFMPEG_PATH, *hwaccel, '-ss', str(time_sec), '-i', video_path,
+                   '-vframes', '1', '-q:v', '2', '-f', 'image2pipe', '-vcodec', 'mjpeg', '-']
+            result = subprocess.run(cmd, capture_output=True, timeout=30)
+            if result.returncode == 0 and result.stdout:
+                return result.stdout
+        except:
+            pass
+    return None
+
+def extract_multiple_frames(video_path: str, count: int = 3) -> List[bytes]:
+    """Extract multiple frames (JPEG bytes) from video at different timestamps."""
+    if not FFMPEG_PATH:
+        return []
     
     # Get video duration
     try:
@@ -56,24 +140,62 @@ def extract_multiple_frames(video_path: str, output_dir: str, count: int = 3) ->
     except:
         duration = 10.0
     
-    # Extract frames at different points
+    # Extract frames at different points (seeking with -ss, so nothing in between is decoded)
+    count = max(1, min(count, int(duration * TARGET_FPS)))
     times = [duration * i / (count + 1) for i in range(1, count + 1)]
     
-    for i, t in enumerate(times):
-        frame_path = os.path.join(output_dir, f"frame_{i}.jpg")
-        if extract_frame(video_path, frame_path, t):
-            frames.append(frame_path)
+    with ThreadPoolExecutor(max_workers=OCR_CONCURRENCY) as pool:
+        extracted = list(pool.map(lambda t: extract_frame_bytes(video_path, t), times))
     
-    return frames
+    return [frame for frame in extracted if frame]
+
+def dhash_frames(frames: List[bytes]) -> "np.ndarray":
+    """Compute a 64-bit difference hash per frame as an (N, 64) bool array."""
+    # Each frame -> 9x8 grayscale, stacked so the comparison runs once over all frames
+    pixels = np.stack([
+        np.asarray(Image.open(io.BytesIO(frame)).convert("L").resize((9, 8)), dtype=np.int16)
+        for frame in frames
+    ])
+    return (pixels[:, :, 1:] > pixels[:, :, :-1]).reshape(len(frames), 64)
 
-def analyze_video_content(video_path: str) -> Dict:
+def dedupe_frames(frames: List[bytes]) -> List[bytes]:
+    """Drop frames that look the same as an earlier one (difference hash)."""
+    if not DHASH_AVAILABLE or len(frames) < 2:
+        return frames
+    
+    try:
+        bits = dhash_frames(frames)
+    except Exception as e:
+        logger.warning(f"Frame hashing failed, keeping all frames: {e}")
+        return frames
+    
+    # Pairwise Hamming distances in one vectorized pass
+    distances = (bits[:, None, :] != bits[None, :, :]).sum(axis=2)
+    
+    keep = []
+    for i in range(len(frames)):
+        if all(distances[i, j] > DHASH_MAX_DISTANCE for j in keep):
+            keep.append(i)
+    
+    if len(keep) < len(frames):
+        logger.info(f"Skipping {len(frames) - len(keep)} near-duplicate frame(s)")
+    return [frames[i] for i in keep]
+
+def analyze_video_content(video_path: str, content_hash: Optional[str] = None) -> Dict:
     """
     Analyze video content using AI vision.
     Returns description of what's in the video.
+    
+    Pass the video's content_hash to reuse an analysis already done in this process.
+    The result's "source" is "vision", or "ocr" when it came from the OCR fallback.
     """
-    # Extract frames
-    temp_dir = os.path.join(os.path.dirname(video_path), "analysis_frames")
-    frames = extract_multiple_frames(video_path, temp_dir, count=3)
+    if content_hash:
+        cached = _cache_get(_analysis_cache, content_hash)
+        if cached is not None:
+            return dict(cached)
+    
+    # Extract frames (kept in memory as JPEG bytes)
+    frames = dedupe_frames(extract_multiple_frames(video_path, count=VISION_MAX_FRAMES))
     
     if not frames:
         logger.error("Could not extract frames from video")
@@ -89,16 +211,16 @@ def analyze_video_content(video_path: str) -> Dict:
             
             # Encode frames as base64
             images = []
-            for frame_path in frames[:2]:  # Use max 2 frames to save tokens
-                with open(frame_path, "rb") as f:
-                    img_data = base64.b64encode(f.read()).decode()
-                    images.append({
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{img_data}"}
-                    })
+            for frame in frames[:VISION_MAX_FRAMES]:
+                img_data = base64.b64encode(frame).decode()
+                images.append({
+                    "type": "image_url",
+                    # Low detail is a flat token cost per image, so batching more frames stays cheap
+                    "image_url": {"url": f"data:image/jpeg;base64,{img_data}", "detail": "low"}
+                })
             
             response = client.chat.completions.create(
-                model="gpt-4o-mini",
+                model=VISION_MODEL,
                 messages=[{
                     "role": "user",
                     "content": [
@@ -125,6 +247,7 @@ Be concise. Return JSON: {"description": "...", "visible_text": "...", "style":
                 content = content.split("```")[1].split("```")[0]
             
             result = json.loads(content)
+            result["source"] = "vision"
             logger.info(f"Video analysis: {result.get('description', '')[:100]}")
             
         except Exception as e:
@@ -135,20 +258,38 @@ Be concise. Return JSON: {"description": "...", "visible_text": "...", "style":
         # No OpenAI, try OCR
         result = _analyze_with_ocr(frames)
     
-    # Cleanup
-    import shutil
-    shutil.rmtree(temp_dir, ignore_errors=True)
-    
+    if content_hash:
+        _cache_put(_analysis_cache, content_hash, dict(result), ANALYSIS_CACHE_MAXSIZE)
     return result
 
-def _analyze_with_ocr(frames: List[str]) -> Dict:
+def _ocr_frame(frame: bytes) -> str:
+    """OCR a single frame, reusing the result for frames with identical bytes."""
+    import pytesseract
+    from PIL import Image
+    
+    try:
+        frame_hash = hashlib.md5(frame).hexdigest()
+        cached = _cache_get(_ocr_cache, frame_hash)
+        if cached is not None:
+            return cached
+        
+        text = pytesseract.image_to_string(Image.open(io.BytesIO(frame)))
+        # Clean up OCR text, ignoring very short text
+        clean_text = " ".join(text.strip().split())
+        clean_text = clean_text if len(clean_text) > 5 else ""
+        _cache_put(_ocr_cache, frame_hash, clean_text, OCR_CACHE_MAXSIZE)
+        return clean_text
+    except Exception as e:
+        logger.warning(f"OCR error on frame: {e}")
+        return ""
+
+def _analyze_with_ocr(frames: List[bytes]) -> Dict:
     """Fallback: Extract text from frames using Tesseract OCR."""
-    result = {"description": "", "visible_text": "", "style": "animation", "mood": ""}
+    result = {"description": "", "visible_text": "", "style": "animation", "mood": "", "source": "ocr"}
     
     # Try to use pytesseract if available
     try:
         import pytesseract
-        from PIL import Image
         
         # Set Tesseract path for Windows
         if os.name == 'nt':
@@ -166,19 +307,12 @@ def _analyze_with_ocr(frames: List[str]) -> Dict:
                 logger.warning("Tesseract not found in common paths")
                 return result
         
-        all_text = []
-        for frame_path in frames:
-            try:
-                img = Image.open(frame_path)
-                text = pytesseract.image_to_string(img)
-                if text.strip():
-                    # Clean up OCR text
-                    clean_text = " ".join(text.strip().split())
-                    if len(clean_text) > 5:  # Ignore very short text
-                        all_text.append(clean_text)
-            except Exception as e:
-                logger.warning(f"OCR error on frame {frame_path}: {e}")
-                continue
+        all_text = [""] * len(frames)
+        with ThreadPoolExecutor(max_workers=OCR_CONCURRENCY) as pool:
+            futures = {pool.submit(_ocr_frame, frame): i for i, frame in enumerate(frames)}
+            for future in as_completed(futures):
+                all_text[futures[future]] = future.result()
+        all_text = [text for text in all_text if text]
         
         if all_text:
             result["visible_text"] = " | ".join(all_text)[:300]
@@ -194,7 +328,8 @@ def _analyze_with_ocr(frames: List[str]) -> Dict:
     return result
 
 
-def generate_metadata_from_video(video_path: str, original_prompt: str = "") -> Dict:
+def generate_metadata_from_video(video_path: str, original_prompt: str = "",
+                                 content_hash: Optional[str] = None) -> Dict:
     """
     Generate metadata by analyzing actual video content.
     Combines video analysis with original prompt for best results.
@@ -202,7 +337,7 @@ def generate_metadata_from_video(video_path: str, original_prompt: str = "") ->
     from backend.core.ai_engine.video_metadata import _generate_with_perplexity
     
     # Analyze video content
-    analysis = analyze_video_content(video_path)
+    analysis = analyze_video_content(video_path, content_hash)
     
     video_description = analysis.get("description", "")
     visible_text = analysis.get("visible_text", "")
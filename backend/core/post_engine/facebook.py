@@ -3,6 +3,7 @@ import requests
 import logging
 from dotenv import load_dotenv
 from pathlib import Path
+from backend.utils.error_handler import retry_with_backoff, is_transient_error, TRANSIENT_STATUS_CODES
 
 # Load config
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
@@ -15,11 +16,69 @@ def get_fb_credentials():
     access_token = os.getenv("FB_ACCESS_TOKEN")
     return page_id, access_token
 
-def upload_facebook_reel(video_path: str, caption: str = "") -> str:
+# Init and binary transfer are safe to repeat; the publish POST is not, since a
+# retried "finish" after Facebook already accepted it would post the Reel twice
+retry_transient = retry_with_backoff(max_retries=4, backoff_factor=2.0, max_wait=60,
+                                     jitter=True, retry_if=is_transient_error)
+
+
+@retry_transient
+def _init_reel_upload(http, page_id: str, access_token: str) -> dict:
+    """Start a Reel upload session. Returns the init response (video_id, upload_url)."""
+    init_url = f"https://graph.facebook.com/v20.0/{page_id}/video_reels"
+    init_payload = {
+        "upload_phase": "start",
+        "access_token": access_token
+    }
+    
+    logger.info("Initializing Facebook Reel upload...")
+    init_res = http.post(init_url, data=init_payload)
+    
+    # Log the response for debugging
+    logger.info(f"Init response status: {init_res.status_code}")
+    logger.info(f"Init response body: {init_res.text}")
+    
+    # Let throttling/server errors surface as HTTPError so they get retried
+    if init_res.status_code in TRANSIENT_STATUS_CODES:
+        init_res.raise_for_status()
+    
+    if init_res.status_code != 200:
+        try:
+            error_data = init_res.json()
+            error_msg = error_data.get('error', {}).get('message', 'Unknown error')
+            error_code = error_data.get('error', {}).get('code', 'N/A')
+            raise Exception(f"Facebook Init Error ({error_code}): {error_msg}")
+        except Exception as e:
+            if "Facebook Init Error" in str(e):
+                raise
+            raise Exception(f"Facebook Init Failed: {init_res.status_code} - {init_res.text}")
+    
+    return init_res.json()
+
+
+@retry_transient
+def _upload_reel_binary(http, upload_url: str, access_token: str, video_path: str):
+    """Send the whole video file to an initialized upload session (restarting from offset 0)."""
+    file_size = os.path.getsize(video_path)
+    logger.info(f"Uploading {file_size} bytes...")
+    
+    with open(video_path, "rb") as f:
+        headers = {
+            "Authorization": f"OAuth {access_token}",
+            "offset": "0",
+            "file_size": str(file_size)
+        }
+        upload_res = http.post(upload_url, data=f, headers=headers)
+        upload_res.raise_for_status()
+
+
+def upload_facebook_reel(video_path: str, caption: str = "", session: requests.Session = None) -> str:
     """
     Upload a video as a Reel to Facebook Page.
+    Pass a shared requests.Session to reuse its pooled connections.
     Returns: post_id or raises Exception
     """
+    http = session or requests
     PAGE_ID, ACCESS_TOKEN = get_fb_credentials()
     
     if not PAGE_ID or not ACCESS_TOKEN:
@@ -30,7 +89,7 @@ def upload_facebook_reel(video_path: str, caption: str = "") -> str:
     try:
         logger.info(f"Exchanging token for Page {PAGE_ID} access...")
         token_url = f"https://graph.facebook.com/v20.0/{PAGE_ID}?fields=access_token&access_token={ACCESS_TOKEN}"
-        token_res = requests.get(token_url)
+        token_res = http.get(token_url)
         if token_res.status_code == 200:
             data = token_res.json()
             if "access_token" in data:
@@ -47,54 +106,19 @@ def upload_facebook_reel(video_path: str, caption: str = "") -> str:
         raise FileNotFoundError(f"Video file not found: {video_path}")
 
     # 1. Initialize Upload
-    init_url = f"https://graph.facebook.com/v20.0/{PAGE_ID}/video_reels"
-    init_payload = {
-        "upload_phase": "start",
-        "access_token": ACCESS_TOKEN
-    }
-    
-    logger.info("Initializing Facebook Reel upload...")
-    init_res = requests.post(init_url, data=init_payload)
-    
-    # Log the response for debugging
-    logger.info(f"Init response status: {init_res.status_code}")
-    logger.info(f"Init response body: {init_res.text}")
-    
-    if init_res.status_code != 200:
-        try:
-            error_data = init_res.json()
-            error_msg = error_data.get('error', {}).get('message', 'Unknown error')
-            error_code = error_data.get('error', {}).get('code', 'N/A')
-            raise Exception(f"Facebook Init Error ({error_code}): {error_msg}")
-        except Exception as e:
-            if "Facebook Init Error" in str(e):
-                raise
-            raise Exception(f"Facebook Init Failed: {init_res.status_code} - {init_res.text}")
-    
-    init_res.raise_for_status()
-    init_data = init_res.json()
+    init_data = _init_reel_upload(http, PAGE_ID, ACCESS_TOKEN)
     
     video_id = init_data["video_id"]
     upload_url = init_data["upload_url"]
     
     logger.info(f"Upload initialized. Video ID: {video_id}")
     
-    # 2. Upload Video Binary
-    file_size = os.path.getsize(video_path)
-    logger.info(f"Uploading {file_size} bytes...")
+    # 2. Upload Video Binary (retries reuse the same video_id/upload_url)
+    _upload_reel_binary(http, upload_url, ACCESS_TOKEN, video_path)
     
-    with open(video_path, "rb") as f:
-        headers = {
-            "Authorization": f"OAuth {ACCESS_TOKEN}",
-            "offset": "0",
-            "file_size": str(file_size)
-        }
-        upload_res = requests.post(upload_url, data=f, headers=headers)
-        upload_res.raise_for_status()
-        
     logger.info("Binary upload complete.")
     
-    # 3. Publish Reel
+    # 3. Publish Reel (never retried - see retry_transient)
     publish_url = f"https://graph.facebook.com/v20.0/{PAGE_ID}/video_reels"
     publish_payload = {
         "access_token": ACCESS_TOKEN,
@@ -105,7 +129,7 @@ def upload_facebook_reel(video_path: str, caption: str = "") -> str:
     }
     
     logger.info("Publishing Reel...")
-    pub_res = requests.post(publish_url, data=publish_payload)
+    pub_res = http.post(publish_url, data=publish_payload)
     
     # Check for specific FB errors
     if pub_res.status_code != 200:
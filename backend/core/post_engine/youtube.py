@@ -12,6 +12,9 @@ import random
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for resumable uploads that report progress (must be a multiple of 256 KB)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 def sanitize_text(text, max_length=5000):
     """Sanitize text for YouTube API"""
     return sanitize_text_input(text, max_length)
@@ -19,7 +22,7 @@ def sanitize_text(text, max_length=5000):
 @retry_with_backoff(max_retries=3)
 @handle_api_error
 @rate_limit("youtube_upload")
-def upload_youtube_short(video_path, title, description, privacy_status="public"):
+def upload_youtube_short(video_path, title, description, privacy_status="public", progress_callback=None):
     """
     Uploads a short video to YouTube.
     
@@ -28,6 +31,8 @@ def upload_youtube_short(video_path, title, description, privacy_status="public"
         title (str): Video title.
         description (str): Video description.
         privacy_status (str): "private", "unlisted", or "public". Defaults to "public" for monetization.
+        progress_callback (callable): Optional fn(bytes_uploaded, total_bytes), called after each
+            8 MB chunk. Without it the file is sent in a single request.
     """
     logger.info(f"Starting YouTube upload: {title.encode('ascii', 'ignore').decode()}")
     
@@ -64,10 +69,22 @@ def upload_youtube_short(video_path, title, description, privacy_status="public"
                     "selfDeclaredMadeForKids": False
                 }
             },
-            media_body=MediaFileUpload(video_path, chunksize=-1, resumable=True)
+            media_body=MediaFileUpload(
+                video_path,
+                chunksize=UPLOAD_CHUNK_SIZE if progress_callback else -1,
+                resumable=True
+            )
         )
 
-        response = request.execute()
+        if progress_callback:
+            response = None
+            while response is None:
+                status, response = request.next_chunk()
+                if status:
+                    progress_callback(status.resumable_progress, status.total_size)
+            progress_callback(os.path.getsize(video_path), os.path.getsize(video_path))
+        else:
+            response = request.execute()
         video_id = response["id"]
         logger.info(f"[OK] YouTube upload successful! Video ID: {video_id}")
         return video_id
@@ -11,6 +11,8 @@ import logging
 import subprocess
 import shutil
 import glob
+import json
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Optional, List
 from pathlib import Path
@@ -98,25 +100,57 @@ def has_audio(video_path: str) -> bool:
     except:
         return False
 
-def get_video_info(video_path: str) -> Dict:
-    """Get video dimensions and duration."""
-    info = {"width": 0, "height": 0, "duration": 0, "has_audio": False}
-    if not FFPROBE_PATH or not os.path.exists(video_path):
-        return info
+@dataclass
+class VideoProbe:
+    """Everything the pipeline needs to know about a video file, from one ffprobe run."""
+    path: str
+    exists: bool = False
+    has_video: bool = False
+    duration: float = 0.0
+    width: int = 0
+    height: int = 0
+    has_audio: bool = False
+    
+    @property
+    def is_valid(self) -> bool:
+        """Same meaning as is_valid_video(): exists and has a video stream."""
+        return self.exists and self.has_video
+    
+    def as_info(self) -> Dict:
+        """Get the dict returned by get_video_info()."""
+        return {"width": self.width, "height": self.height,
+                "duration": self.duration, "has_audio": self.has_audio}
+
+def probe_video(video_path: str) -> VideoProbe:
+    """Stat and ffprobe a video once, instead of one subprocess per property."""
+    probe = VideoProbe(path=video_path, exists=bool(video_path) and os.path.exists(video_path))
+    if not FFPROBE_PATH or not probe.exists:
+        return probe
     try:
-        cmd = [FFPROBE_PATH, '-v', 'error', '-select_streams', 'v:0',
-               '-show_entries', 'stream=width,height,duration', '-of', 'csv=p=0', video_path]
+        cmd = [FFPROBE_PATH, '-v', 'error',
+               '-show_entries', 'stream=codec_type,width,height,duration:format=duration',
+               '-of', 'json', video_path]
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            parts = result.stdout.strip().split(',')
-            if len(parts) >= 3:
-                info["width"] = int(parts[0])
-                info["height"] = int(parts[1])
-                info["duration"] = float(parts[2])
-        info["has_audio"] = has_audio(video_path)
+        if result.returncode != 0:
+            return probe
+        data = json.loads(result.stdout or "{}")
+        for stream in data.get("streams", []):
+            if stream.get("codec_type") == "video" and not probe.has_video:
+                probe.has_video = True
+                probe.width = int(stream.get("width") or 0)
+                probe.height = int(stream.get("height") or 0)
+                probe.duration = float(stream.get("duration") or 0)
+            elif stream.get("codec_type") == "audio":
+                probe.has_audio = True
+        if not probe.duration:
+            probe.duration = float(data.get("format", {}).get("duration") or 0)
     except:
         pass
-    return info
+    return probe
+
+def get_video_info(video_path: str) -> Dict:
+    """Get video dimensions and duration."""
+    return probe_video(video_path).as_info()
 
 def download_with_ytdlp(url: str, output_dir: str) -> Optional[Dict]:
     """Download Meta AI video using yt-dlp (handles fragmented streams)."""
@@ -161,8 +195,9 @@ def download_with_ytdlp(url: str, output_dir: str) -> Optional[Dict]:
         for f in os.listdir(temp_dir):
             if f.endswith('.mp4'):
                 path = os.path.join(temp_dir, f)
-                if is_valid_video(path):
-                    info = get_video_info(path)
+                probe = probe_video(path)
+                if probe.is_valid:
+                    info = probe.as_info()
                     info["path"] = path
                     info["size"] = os.path.getsize(path)
                     info["is_vertical"] = info["height"] > info["width"]
@@ -462,9 +497,12 @@ def process_results(media: MediaCapture, output_dir: str) -> Dict:
     
     if best_video:
         final_path = os.path.join(output_dir, "video.mp4")
-        shutil.copy(best_video["path"], final_path)
+        # Move rather than copy so the best capture isn't written to disk twice
+        shutil.move(best_video["path"], final_path)
         # Clean up other videos
         for v in media.videos:
+            if v is best_video:
+                continue
             try:
                 os.remove(v["path"])
             except:
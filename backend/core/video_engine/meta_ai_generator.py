@@ -50,6 +50,8 @@ class MetaAIGenerator:
         self.browser = None
         self.context = None
         self.page = None
+        self.loop = None
+        self.logged_in = False
     
     async def start(self):
         """Start browser with persistent profile."""
@@ -58,6 +60,8 @@ class MetaAIGenerator:
         
         os.makedirs(BROWSER_PROFILE_DIR, exist_ok=True)
         
+        # Remember the owning loop so other threads can schedule work on this browser
+        self.loop = asyncio.get_running_loop()
         self.playwright = await async_playwright().start()
         
         # Use persistent context to keep login session
@@ -899,16 +903,18 @@ class MetaAIGenerator:
             
             logger.info(f"[*] Downloading video from: {video_url[:60]}...")
             
+            # Stream straight to disk so the whole video is never held in memory
             async with httpx.AsyncClient(timeout=60) as client:
-                response = await client.get(video_url)
-                if response.status_code == 200:
+                async with client.stream("GET", video_url) as response:
+                    if response.status_code != 200:
+                        logger.error(f"[X] Download failed: {response.status_code}")
+                        return False
                     with open(output_path, 'wb') as f:
-                        f.write(response.content)
-                    logger.info(f"[OK] Downloaded: {len(response.content) / 1024 / 1024:.2f} MB")
-                    return True
-                else:
-                    logger.error(f"[X] Download failed: {response.status_code}")
-                    return False
+                        async for chunk in response.aiter_bytes(chunk_size=1 << 20):
+                            f.write(chunk)
+            
+            logger.info(f"[OK] Downloaded: {os.path.getsize(output_path) / 1024 / 1024:.2f} MB")
+            return True
         except Exception as e:
             logger.error(f"[X] Download error: {e}")
             return False
@@ -1097,7 +1103,8 @@ class MetaAIGenerator:
 
 
 async def generate_and_download(prompt: str, headless: bool = False, add_music: bool = True,
-                                target_duration: int = 15) -> Optional[Dict]:
+                                target_duration: int = 15,
+                                generator: Optional[MetaAIGenerator] = None) -> Optional[Dict]:
     """
     Full pipeline: Generate video on Meta AI, extend it, add music, and download.
     
@@ -1106,6 +1113,7 @@ async def generate_and_download(prompt: str, headless: bool = False, add_music:
         headless: Run browser in headless mode
         add_music: Whether to add music using Meta AI's built-in feature
         target_duration: Target video duration in seconds (default 15)
+        generator: Already started generator to reuse (left running afterwards)
     
     Returns:
         Download result dict or None
@@ -1113,13 +1121,16 @@ async def generate_and_download(prompt: str, headless: bool = False, add_music:
     import os
     from datetime import datetime
     
-    generator = MetaAIGenerator(headless=headless)
+    owns_browser = generator is None
+    if owns_browser:
+        generator = MetaAIGenerator(headless=headless)
     
     try:
-        await generator.start()
+        if owns_browser:
+            await generator.start()
         
-        # Check login
-        if not await generator.is_logged_in():
+        # Check login (once per browser session)
+        if not generator.logged_in and not await generator.is_logged_in():
             logger.info("[!] Not logged in. Attempting auto-login...")
             
             # Try auto-login first
@@ -1128,11 +1139,12 @@ async def generate_and_download(prompt: str, headless: bool = False, add_music:
                     logger.info("[OK] Auto-login successful!")
                 else:
                     logger.warning("[!] Auto-login failed, opening browser for manual login...")
-                    await generator.stop()
-                    
-                    # Reopen in non-headless mode for manual login
-                    generator = MetaAIGenerator(headless=False)
-                    await generator.start()
+                    if owns_browser:
+                        await generator.stop()
+                        
+                        # Reopen in non-headless mode for manual login
+                        generator = MetaAIGenerator(headless=False)
+                        await generator.start()
                     
                     if not await generator.wait_for_login(timeout=120):
                         logger.error("[X] Login failed")
@@ -1140,13 +1152,15 @@ async def generate_and_download(prompt: str, headless: bool = False, add_music:
             else:
                 # No credentials, open browser for manual login
                 logger.info("[!] No credentials found, opening browser for manual login...")
-                await generator.stop()
-                generator = MetaAIGenerator(headless=False)
-                await generator.start()
+                if owns_browser:
+                    await generator.stop()
+                    generator = MetaAIGenerator(headless=False)
+                    await generator.start()
                 
                 if not await generator.wait_for_login(timeout=120):
                     logger.error("[X] Login failed")
                     return None
+        generator.logged_in = True
         
         # Generate video
         logger.info(f"[*] Generating video with prompt: {prompt[:60]}...")
@@ -1154,7 +1168,8 @@ async def generate_and_download(prompt: str, headless: bool = False, add_music:
         
         if not video_url:
             logger.error("[X] Could not get video URL")
-            await generator.stop()
+            if owns_browser:
+                await generator.stop()
             return None
         
         logger.info(f"[OK] Video URL: {video_url[:80]}...")
@@ -1240,7 +1255,8 @@ async def generate_and_download(prompt: str, headless: bool = False, add_music:
                     f.write(prompt)
                 
                 file_size = os.path.getsize(video_path)
-                await generator.stop()
+                if owns_browser:
+                    await generator.stop()
                 
                 return {
                     "success": True,
@@ -1267,7 +1283,8 @@ async def generate_and_download(prompt: str, headless: bool = False, add_music:
             
             file_size = os.path.getsize(video_path)
             
-            await generator.stop()
+            if owns_browser:
+                await generator.stop()
             
             return {
                 "success": True,
@@ -1285,7 +1302,8 @@ async def generate_and_download(prompt: str, headless: bool = False, add_music:
                 "message": "Video downloaded (5s, no music - fallback)"
             }
         else:
-            await generator.stop()
+            if owns_browser:
+                await generator.stop()
             return None
         
     except Exception as e:
@@ -1293,16 +1311,26 @@ async def generate_and_download(prompt: str, headless: bool = False, add_music:
         import traceback
         traceback.print_exc()
         try:
-            await generator.stop()
+            if owns_browser:
+                await generator.stop()
         except:
             pass
         return None
 
 
 def run_generate_and_download(prompt: str, headless: bool = False, target_duration: int = 15, 
-                              add_music: bool = True) -> Optional[Dict]:
-    """Sync wrapper for generate_and_download with Meta AI extension and music."""
-    return asyncio.run(generate_and_download(prompt, headless, add_music=add_music, target_duration=target_duration))
+                              add_music: bool = True,
+                              generator: Optional[MetaAIGenerator] = None) -> Optional[Dict]:
+    """Sync wrapper for generate_and_download with Meta AI extension and music.
+    
+    With a shared generator, the work runs on the generator's own event loop
+    (which must be running in another thread) and the browser stays open.
+    """
+    coro = generate_and_download(prompt, headless, add_music=add_music,
+                                 target_duration=target_duration, generator=generator)
+    if generator is not None:
+        return asyncio.run_coroutine_threadsafe(coro, generator.loop).result()
+    return asyncio.run(coro)
 
 
 async def add_music_to_create_url(create_url: str, headless: bool = False, extend_to: int = 15) -> Optional[Dict]:
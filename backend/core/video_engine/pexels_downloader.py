@@ -3,6 +3,8 @@ import os
 import requests
 import random
 
+from backend.utils.rate_limiter import api_rate_limiter
+
 PEXELS_API_KEY = os.getenv("PEXELS_API_KEY")
 
 def search_pexels_video(query, orientation="portrait", size="medium", min_duration=30):
@@ -20,6 +22,7 @@ def search_pexels_video(query, orientation="portrait", size="medium", min_durati
     
     try:
         response = requests.get(url, headers=headers)
+        api_rate_limiter.observe_response("pexels", response.headers)
         if response.status_code == 200:
             data = response.json()
             videos = data.get("videos", [])
@@ -3,8 +3,20 @@ YouTube Video Downloader using yt-dlp (FREE, No API needed)
 Download YouTube videos for analysis, backup, or research
 """
 import os
+import threading
 import yt_dlp
 
+# Metadata lookups reuse one YoutubeDL per thread instead of building one per call
+_info_local = threading.local()
+
+
+def _info_downloader():
+    """Get this thread's metadata-only YoutubeDL instance, creating it on first use."""
+    ydl = getattr(_info_local, "ydl", None)
+    if ydl is None:
+        ydl = _info_local.ydl = yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True})
+    return ydl
+
 def download_youtube_video(video_url: str, output_dir: str = "output/downloads", format: str = "best"):
     """
     Download a YouTube video using yt-dlp (completely free, no API key needed)
@@ -87,21 +99,18 @@ def get_video_info(video_url: str):
     Returns:
         dict: Video information
     """
-    ydl_opts = {'quiet': True, 'no_warnings': True}
-    
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(video_url, download=False)
-        
-        return {
-            "title": info.get("title"),
-            "duration": info.get("duration"),
-            "views": info.get("view_count"),
-            "likes": info.get("like_count"),
-            "channel": info.get("channel"),
-            "upload_date": info.get("upload_date"),
-            "thumbnail": info.get("thumbnail"),
-            "description": info.get("description", "")[:200],  # First 200 chars
-        }
+    info = _info_downloader().extract_info(video_url, download=False)
+    
+    return {
+        "title": info.get("title"),
+        "duration": info.get("duration"),
+        "views": info.get("view_count"),
+        "likes": info.get("like_count"),
+        "channel": info.get("channel"),
+        "upload_date": info.get("upload_date"),
+        "thumbnail": info.get("thumbnail"),
+        "description": (info.get("description") or "")[:200],  # First 200 chars
+    }
 
 
 def download_shorts_format(video_url: str, output_dir: str = "output/downloads"):
@@ -117,6 +117,20 @@ class DatabaseManager:
             )
         """)
         
+        # Pipeline runs table - Idempotency record per source URL (keyed by sha256 of the URL)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pipeline_runs (
+                url_sha256 TEXT PRIMARY KEY,
+                video_path TEXT,
+                title TEXT,
+                description TEXT,
+                tags_json TEXT,
+                youtube_id TEXT,
+                facebook_id TEXT,
+                ts TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
         conn.commit()
         conn.close()
     
@@ -408,6 +422,45 @@ class DatabaseManager:
                 return row[0]
         return default
     
+    # ===== Pipeline Runs =====
+    def get_pipeline_run(self, url_sha256: str) -> Optional[Dict]:
+        """Get the recorded pipeline run for a source URL hash"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM pipeline_runs WHERE url_sha256 = ?", (url_sha256,))
+        row = cursor.fetchone()
+        
+        if row:
+            columns = [col[0] for col in cursor.description]
+            run = dict(zip(columns, row))
+        else:
+            run = None
+        
+        conn.close()
+        return run
+    
+    def save_pipeline_run(self, url_sha256: str, **kwargs):
+        """Create or update a pipeline run (only the given columns are changed)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT OR IGNORE INTO pipeline_runs (url_sha256) VALUES (?)
+        """, (url_sha256,))
+        
+        if kwargs:
+            set_clause = ", ".join([f"{k} = ?" for k in kwargs.keys()])
+            set_clause += ", ts = CURRENT_TIMESTAMP"
+            
+            cursor.execute(f"""
+                UPDATE pipeline_runs SET {set_clause}
+                WHERE url_sha256 = ?
+            """, list(kwargs.values()) + [url_sha256])
+        
+        conn.commit()
+        conn.close()
+    
     # ===== Analytics =====
     def update_analytics(self, date: str = None, **kwargs):
         """Update analytics for a date"""
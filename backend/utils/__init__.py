@@ -2,7 +2,7 @@
 Utilities Module
 """
 from backend.utils.error_handler import retry_with_backoff, handle_api_error, error_tracker
-from backend.utils.rate_limiter import api_rate_limiter, rate_limit
+from backend.utils.rate_limiter import api_rate_limiter, rate_limit, RateLimitExceeded
 from backend.utils.cache_manager import cache_manager, cached
 from backend.utils.health_checker import health_checker
 from backend.utils.monitoring import performance_monitor, timed_operation
@@ -14,6 +14,7 @@ __all__ = [
     "error_tracker",
     "api_rate_limiter",
     "rate_limit",
+    "RateLimitExceeded",
     "cache_manager",
     "cached",
     "health_checker",
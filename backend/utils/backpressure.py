@@ -0,0 +1,86 @@
+"""
+Adaptive concurrency control for provider-facing pipeline stages
+"""
+import random
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease concurrency controller.
+
+    Every healthy observation (success within the latency target) grows the
+    allowed concurrency by alpha; every error or slow call multiplies it by
+    beta. While the provider is unhealthy, gate() holds callers back with
+    full-jitter exponential backoff (uniform over [0, min(max_backoff,
+    2**attempt)]) so concurrent workers don't retry in lockstep.
+    """
+
+    def __init__(self, c_min: int = 1, c_max: int = 4, alpha: float = 0.5,
+                 beta: float = 0.5, L_target: float = 20.0, max_backoff: float = 30.0):
+        self.c_min = c_min
+        self.c_max = c_max
+        self.alpha = alpha
+        self.beta = beta
+        self.L_target = L_target
+        self.max_backoff = max_backoff
+        self.attempt = 0
+        self.concurrency = float(c_min)
+        self.healthy = True
+        self.in_flight = 0
+        self._condition = None
+
+    def current(self) -> int:
+        """Get the currently allowed number of concurrent calls."""
+        return max(self.c_min, int(self.concurrency))
+
+    def observe(self, latency: float, success: bool = True):
+        """Record the outcome of one call and adjust concurrency."""
+        self.healthy = success and latency <= self.L_target
+
+        if self.healthy:
+            self.concurrency = min(self.c_max, self.concurrency + self.alpha)
+            self.attempt = max(0, self.attempt - 1)
+        else:
+            self.concurrency = max(self.c_min, self.concurrency * self.beta)
+            self.attempt += 1
+            logger.info(f"Backing off: concurrency now {self.current()} "
+                        f"(latency {latency:.1f}s, success={success})")
+
+        if self._condition is not None:
+            asyncio.ensure_future(self._notify())
+
+    async def _notify(self):
+        async with self._condition:
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the current() concurrency slots for the duration of a call."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.current())
+            self.in_flight += 1
+
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def backoff(self) -> float:
+        """Get a jittered delay for the next call (0 once healthy again)."""
+        if self.attempt == 0:
+            return 0.0
+        return random.uniform(0, min(self.max_backoff, 2 ** self.attempt))
+
+    async def gate(self):
+        """Wait before the next call only while the provider is pushing back."""
+        delay = self.backoff()
+        if delay > 0:
+            await asyncio.sleep(delay)
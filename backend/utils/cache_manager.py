@@ -3,6 +3,7 @@ Caching system for OneClick Reels AI
 """
 import os
 import json
+import mmap
 import hashlib
 import time
 from pathlib import Path
@@ -21,6 +22,7 @@ class CacheManager:
         (self.cache_dir / "videos").mkdir(exist_ok=True)
         (self.cache_dir / "api_responses").mkdir(exist_ok=True)
         (self.cache_dir / "voiceovers").mkdir(exist_ok=True)
+        (self.cache_dir / "analysis").mkdir(exist_ok=True)
     
     def _get_cache_key(self, key: str) -> str:
         """Generate a safe cache key."""
@@ -185,4 +187,25 @@ def cache_video_url(keyword: str, video_url: str, ttl: int = 3600):  # 1 hour
 
 def get_cached_video_url(keyword: str) -> Optional[str]:
     """Get a cached video URL."""
-    return cache_manager.get("videos", keyword)
\ No newline at end of file
+    return cache_manager.get("videos", keyword)
+
+def file_content_hash(path: str) -> str:
+    """Hash a file's contents (stable across renames and re-downloads).
+    
+    The file is memory-mapped, so the hash reads straight from the page cache
+    that the later analysis and upload reads of the same file also hit.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+    return digest.hexdigest()
+
+def cache_analysis(key: str, analysis: Dict, metadata: Dict, ttl: int = 604800):  # 7 days
+    """Cache video analysis and generated metadata for a content-hash key."""
+    return cache_manager.set("analysis", key, {"analysis": analysis, "metadata": metadata}, ttl)
+
+def get_cached_analysis(key: str) -> Optional[Dict]:
+    """Get cached video analysis and metadata ({"analysis", "metadata"})."""
+    return cache_manager.get("analysis", key)
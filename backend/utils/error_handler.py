@@ -2,13 +2,19 @@
 Centralized error handling and retry logic
 """
 import time
+import random
 import logging
 import functools
 from typing import Callable, Any, Optional, Type, Tuple
 from enum import Enum
+import requests
+from backend.utils.rate_limiter import RateLimitExceeded
 
 logger = logging.getLogger(__name__)
 
+# HTTP statuses worth retrying (throttled or server-side failures)
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
 class ErrorType(Enum):
     API_ERROR = "api_error"
     NETWORK_ERROR = "network_error"
@@ -29,12 +35,35 @@ class NonRetryableError(Exception):
         super().__init__(message)
         self.error_type = error_type
 
+def is_transient_error(e: Exception) -> bool:
+    """Check if an error is a network failure or a 429/5xx response (requests or googleapiclient)."""
+    if isinstance(e, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)):
+        return True
+    
+    # requests errors carry .response (status_code), googleapiclient HttpError carries .resp (status)
+    response = getattr(e, "response", None)
+    if response is None:
+        response = getattr(e, "resp", None)
+    status = getattr(response, "status_code", None) or getattr(response, "status", None)
+    try:
+        return status is not None and int(status) in TRANSIENT_STATUS_CODES
+    except (TypeError, ValueError):
+        return False
+
 def retry_with_backoff(
     max_retries: int = 3,
     backoff_factor: float = 2.0,
-    exceptions: Tuple[Type[Exception], ...] = (Exception,)
+    exceptions: Tuple[Type[Exception], ...] = (Exception,),
+    max_wait: Optional[float] = None,
+    jitter: bool = False,
+    retry_if: Optional[Callable[[Exception], bool]] = None
 ):
-    """Decorator for retrying functions with exponential backoff."""
+    """Decorator for retrying functions with exponential backoff.
+    
+    max_wait caps each delay, jitter picks the delay uniformly from [0, delay]
+    so concurrent callers spread out, and retry_if(e) can restrict retries to
+    errors worth repeating (e.g. is_transient_error).
+    """
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
@@ -51,11 +80,15 @@ def retry_with_backoff(
                         raise
                     
                     # Check if it's a non-retryable error
-                    if isinstance(e, NonRetryableError):
+                    if isinstance(e, NonRetryableError) or (retry_if is not None and not retry_if(e)):
                         logger.error(f"Non-retryable error in {func.__name__}: {e}")
                         raise
                     
                     wait_time = backoff_factor ** attempt
+                    if max_wait is not None:
+                        wait_time = min(wait_time, max_wait)
+                    if jitter:
+                        wait_time = random.uniform(0, wait_time)
                     if isinstance(e, RetryableError):
                         wait_time = max(wait_time, e.retry_after)
                     
@@ -78,7 +111,9 @@ def handle_api_error(func: Callable) -> Callable:
             logger.error(error_msg)
             
             # Classify error type
-            if "rate limit" in str(e).lower():
+            if isinstance(e, RateLimitExceeded):
+                raise RetryableError(error_msg, ErrorType.API_ERROR, retry_after=e.wait_time)
+            elif "rate limit" in str(e).lower():
                 raise RetryableError(error_msg, ErrorType.API_ERROR, retry_after=60)
             elif "network" in str(e).lower() or "connection" in str(e).lower():
                 raise RetryableError(error_msg, ErrorType.NETWORK_ERROR)
@@ -2,49 +2,258 @@
 Rate limiting utilities for API protection
 """
 import time
+import heapq
 import asyncio
-from typing import Dict, Optional
-from collections import defaultdict, deque
 import threading
+import itertools
+from typing import Dict, Mapping, Optional, Tuple
+from collections import OrderedDict
+
+# Most identifiers tracked per limiter before least recently used ones are evicted
+MAX_IDENTIFIERS = 10_000
+
+# Sweep identifiers idle for over a window every this many calls
+GC_INTERVAL = 1024
+
+# Provider headers reporting remaining requests, in lookup order
+REMAINING_HEADERS = (
+    "anthropic-ratelimit-requests-remaining",
+    "x-ratelimit-remaining-requests",
+    "x-ratelimit-remaining",
+)
+
+# Provider headers reporting when the remaining count resets
+RESET_HEADERS = (
+    "x-ratelimit-reset-requests",
+    "x-ratelimit-reset",
+)
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a rate limited call is over its service's limit.
+    
+    The message is only formatted if something actually prints it.
+    """
+    __slots__ = ("service", "wait_time")
+    
+    def __init__(self, service: str, wait_time: float):
+        super().__init__(service, wait_time)
+        self.service = service
+        self.wait_time = wait_time
+    
+    def __str__(self):
+        return f"Rate limit exceeded for {self.service}. Try again in {self.wait_time:.1f} seconds."
 
 class RateLimiter:
-    """Thread-safe rate limiter using token bucket algorithm."""
+    """Rate limiter using the token bucket algorithm.
     
-    def __init__(self, max_requests: int, time_window: int):
+    Tokens refill continuously at max_requests / time_window per second up
+    to capacity, so a quiet period banks credit that can be spent in a burst.
+    Each identifier keeps only (tokens, last_refill).
+    
+    acquire() reads, refills and writes back an identifier's state under one
+    lock, so concurrent threads can't each spend the same token.
+    Identifiers are kept in LRU order so idle ones can be evicted cheaply.
+    """
+    
+    def __init__(self, max_requests: int, time_window: int, capacity: Optional[int] = None):
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = defaultdict(deque)
-        self.lock = threading.Lock()
+        self.rate = max_requests / time_window
+        self.capacity = capacity if capacity is not None else max_requests
+        self.state: OrderedDict = OrderedDict()
+        # Provider-reported (remaining, reset_at) taking precedence over the bucket
+        self.overrides: Dict[str, Tuple[int, float]] = {}
+        self.calls = 0
+        self._lock = threading.Lock()
     
-    def is_allowed(self, identifier: str) -> bool:
-        """Check if request is allowed for given identifier."""
-        with self.lock:
+    def _tokens(self, identifier: str, now: float) -> float:
+        """Get the identifier's token count refilled up to now."""
+        state = self.state.get(identifier)
+        if state is None:
+            return float(self.capacity)
+        tokens, last_refill = state
+        return min(self.capacity, tokens + (now - last_refill) * self.rate)
+    
+    def _touch(self, identifier: str, tokens: float, now: float):
+        """Store state as most recently used and keep the state bounded."""
+        state = self.state
+        state[identifier] = (tokens, now)
+        state.move_to_end(identifier)
+        if len(state) > MAX_IDENTIFIERS:
+            state.popitem(last=False)
+        
+        self.calls += 1
+        if self.calls % GC_INTERVAL == 0:
+            self._collect(now - self.capacity / self.rate)
+    
+    def _collect(self, stale_before: float):
+        """Drop identifiers idle long enough for their bucket to be full again."""
+        state = self.state
+        while state:
+            oldest = next(iter(state))
+            if state[oldest][1] >= stale_before:
+                break
+            state.pop(oldest)
+    
+    def _active_override(self, identifier: str, now: float) -> Optional[Tuple[int, float]]:
+        """Get the provider-reported state for identifier, dropping it once reset."""
+        override = self.overrides.get(identifier)
+        if override is not None and now >= override[1]:
+            self.overrides.pop(identifier, None)
+            return None
+        return override
+    
+    def override_remaining(self, remaining: int, reset_after: Optional[float] = None,
+                           identifier: str = "default"):
+        """Replace the local estimate with the provider-reported remaining count.
+        
+        Args:
+            remaining: Requests the provider says are left
+            reset_after: Seconds until the provider resets (defaults to time_window)
+            identifier: Identifier the response belongs to
+        """
+        if reset_after is None:
+            reset_after = self.time_window
+        with self._lock:
+            self.overrides[identifier] = (max(0, remaining), time.time() + reset_after)
+    
+    def is_throttled(self, identifier: str = "default") -> bool:
+        """Check if the provider reports we are nearly out of requests."""
+        override = self._active_override(identifier, time.time())
+        if override is None:
+            return False
+        remaining = override[0]
+        return remaining <= 2 and remaining < self.max_requests * 0.1
+    
+    def acquire(self, identifier: str) -> Tuple[bool, float]:
+        """Take a token if one is available.
+        
+        Returns:
+            (allowed, seconds until the next request would be allowed)
+        """
+        with self._lock:
             now = time.time()
-            request_times = self.requests[identifier]
+            override = self._active_override(identifier, now)
+            if override is not None:
+                remaining, reset_at = override
+                if remaining <= 0:
+                    return False, max(0.0, reset_at - now)
+                self.overrides[identifier] = (remaining - 1, reset_at)
             
-            # Remove old requests outside time window
-            while request_times and request_times[0] <= now - self.time_window:
-                request_times.popleft()
+            tokens = self._tokens(identifier, now)
             
-            # Check if under limit
-            if len(request_times) < self.max_requests:
-                request_times.append(now)
-                return True
+            if override is not None or tokens >= 1:
+                self._touch(identifier, max(0.0, tokens - 1), now)
+                return True, 0.0
             
-            return False
+            self._touch(identifier, tokens, now)
+            return False, (1 - tokens) / self.rate
+    
+    def is_allowed(self, identifier: str) -> bool:
+        """Check if request is allowed for given identifier."""
+        return self.acquire(identifier)[0]
     
     def time_until_allowed(self, identifier: str) -> float:
         """Get seconds until next request is allowed."""
-        with self.lock:
-            now = time.time()
-            request_times = self.requests[identifier]
+        now = time.time()
+        override = self._active_override(identifier, now)
+        if override is not None:
+            remaining, reset_at = override
+            return 0.0 if remaining > 0 else max(0.0, reset_at - now)
+        
+        tokens = self._tokens(identifier, now)
+        if tokens >= 1:
+            return 0.0
+        return (1 - tokens) / self.rate
+
+class FairQueuedLimiter:
+    """Start-time fair queueing in front of a RateLimiter.
+    
+    The wrapped limiter's budget is shared by all callers of a service; each
+    identifier (tenant) gets its own virtual clock and requests are released
+    in virtual start-time order, so one busy tenant cannot starve another.
+    Intended for async callers on a single event loop.
+    """
+    
+    def __init__(self, limiter: RateLimiter, shared_identifier: str = "default"):
+        self.limiter = limiter
+        self.shared_identifier = shared_identifier
+        self.virtual_time = 0.0
+        self.finish_times: Dict[str, float] = {}
+        self.queue: list = []  # heap of (start_tag, seq, identifier, future)
+        self._seq = itertools.count()
+        self._drainer: Optional[asyncio.Task] = None
+    
+    async def acquire(self, identifier: str = "default", weight: float = 1.0):
+        """Wait for this identifier's fair turn at the shared budget."""
+        start = max(self.virtual_time, self.finish_times.get(identifier, 0.0))
+        self.finish_times[identifier] = start + 1.0 / weight
+        
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.queue, (start, next(self._seq), identifier, future))
+        
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.ensure_future(self._drain())
+        await future
+    
+    async def _drain(self):
+        """Release queued requests in virtual-time order as the budget allows."""
+        queue = self.queue
+        while queue:
+            if queue[0][3].cancelled():
+                heapq.heappop(queue)
+                continue
             
-            if len(request_times) < self.max_requests:
-                return 0.0
+            allowed, wait_time = self.limiter.acquire(self.shared_identifier)
+            if not allowed:
+                await asyncio.sleep(wait_time)
+                continue
             
-            # Time until oldest request expires
-            oldest_request = request_times[0]
-            return max(0.0, (oldest_request + self.time_window) - now)
+            start, _, _, future = heapq.heappop(queue)
+            self.virtual_time = start
+            if not future.cancelled():
+                future.set_result(None)
+        
+        # Idle: every tenant starts level again
+        self.finish_times.clear()
+
+def _parse_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a reset header value into seconds from now.
+    
+    Accepts plain seconds ("30"), unix timestamps ("1700000000"),
+    and OpenAI-style durations ("1m30s", "250ms").
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = 0.0
+        number = ""
+        rest = value
+        units = (("ms", 0.001), ("h", 3600), ("m", 60), ("s", 1))
+        while rest:
+            if rest[0].isdigit() or rest[0] == ".":
+                number += rest[0]
+                rest = rest[1:]
+                continue
+            for unit, scale in units:
+                if rest.startswith(unit) and number:
+                    seconds += float(number) * scale
+                    number = ""
+                    rest = rest[len(unit):]
+                    break
+            else:
+                return None
+        if number:
+            return None
+        return seconds
+    
+    # Large values are absolute unix timestamps
+    if seconds > 10 ** 9:
+        seconds -= time.time()
+    return max(0.0, seconds)
 
 class APIRateLimiter:
     """Rate limiter for different API endpoints."""
@@ -70,55 +279,154 @@ class APIRateLimiter:
             # General API limits per user
             "user_api": RateLimiter(max_requests=100, time_window=3600),  # 100 per hour per user
         }
+        self.fair_queues: Dict[str, FairQueuedLimiter] = {}
+    
+    def fair_queue(self, service: str) -> Optional[FairQueuedLimiter]:
+        """Get the fair queue sharing a service's budget between identifiers."""
+        queue = self.fair_queues.get(service)
+        if queue is None:
+            limiter = self.limiters.get(service)
+            if limiter is None:
+                return None
+            queue = self.fair_queues[service] = FairQueuedLimiter(limiter)
+        return queue
     
     def check_limit(self, service: str, identifier: str = "default") -> bool:
         """Check if request is within rate limit."""
-        if service not in self.limiters:
+        limiter = self.limiters.get(service)
+        if limiter is None:
             return True
         
-        return self.limiters[service].is_allowed(identifier)
+        return limiter.is_allowed(identifier)
+    
+    def acquire(self, service: str, identifier: str = "default") -> Tuple[bool, float]:
+        """Take a request slot if available, returning (allowed, wait_time)."""
+        limiter = self.limiters.get(service)
+        if limiter is None:
+            return True, 0.0
+        
+        return limiter.acquire(identifier)
     
     def wait_time(self, service: str, identifier: str = "default") -> float:
         """Get wait time until next request is allowed."""
-        if service not in self.limiters:
+        limiter = self.limiters.get(service)
+        if limiter is None:
             return 0.0
         
-        return self.limiters[service].time_until_allowed(identifier)
+        return limiter.time_until_allowed(identifier)
+    
+    def observe_response(self, service: str, headers: Mapping[str, str], identifier: str = "default"):
+        """Feed provider rate-limit headers back into the limiter state.
+        
+        Args:
+            service: Limiter name (e.g. "openai", "pexels")
+            headers: HTTP response headers
+            identifier: Identifier the response belongs to
+        """
+        limiter = self.limiters.get(service)
+        if limiter is None or not headers:
+            return
+        
+        headers = {k.lower(): v for k, v in headers.items()}
+        
+        retry_after = _parse_seconds(headers.get("retry-after"))
+        if retry_after is not None:
+            limiter.override_remaining(0, retry_after, identifier)
+            return
+        
+        remaining = None
+        for name in REMAINING_HEADERS:
+            if name in headers:
+                try:
+                    remaining = int(headers[name])
+                except (TypeError, ValueError):
+                    pass
+                break
+        if remaining is None:
+            return
+        
+        reset_after = None
+        for name in RESET_HEADERS:
+            if name in headers:
+                reset_after = _parse_seconds(headers[name])
+                break
+        
+        limiter.override_remaining(remaining, reset_after, identifier)
+    
+    def is_throttled(self, service: str, identifier: str = "default") -> bool:
+        """Check if the provider reports the service as nearly exhausted."""
+        limiter = self.limiters.get(service)
+        return limiter is not None and limiter.is_throttled(identifier)
     
     async def wait_if_needed(self, service: str, identifier: str = "default"):
-        """Async wait if rate limit exceeded."""
-        wait_time = self.wait_time(service, identifier)
-        if wait_time > 0:
+        """Async wait if rate limit exceeded, then take the request slot.
+        
+        The allowed path returns without yielding to the event loop.
+        """
+        limiter = self.limiters.get(service)
+        if limiter is None:
+            return
+        
+        allowed, wait_time = limiter.acquire(identifier)
+        while not allowed:
             await asyncio.sleep(wait_time)
+            allowed, wait_time = limiter.acquire(identifier)
 
 # Global rate limiter instance
 api_rate_limiter = APIRateLimiter()
 
 def rate_limit(service: str, identifier_func: Optional[callable] = None):
-    """Decorator for rate limiting functions."""
+    """Decorator for rate limiting functions.
+    
+    The limiter is resolved once at decoration time and bound into the
+    wrapper's closure, so each call skips the global/attribute lookups.
+    """
+    limiter = api_rate_limiter.limiters.get(service)
+    
     def decorator(func):
+        if limiter is None:
+            return func
+        acquire = limiter.acquire
+        
         def wrapper(*args, **kwargs):
-            identifier = "default"
-            if identifier_func:
-                identifier = identifier_func(*args, **kwargs)
-            
-            if not api_rate_limiter.check_limit(service, identifier):
-                wait_time = api_rate_limiter.wait_time(service, identifier)
-                raise Exception(f"Rate limit exceeded for {service}. Try again in {wait_time:.1f} seconds.")
+            identifier = identifier_func(*args, **kwargs) if identifier_func else "default"
+            allowed, wait_time = acquire(identifier)
+            if not allowed:
+                raise RateLimitExceeded(service, wait_time)
             
             return func(*args, **kwargs)
         return wrapper
     return decorator
 
 def async_rate_limit(service: str, identifier_func: Optional[callable] = None):
-    """Async decorator for rate limiting functions."""
+    """Async decorator for rate limiting functions.
+    
+    With an identifier_func (e.g. lambda req: req.user_id), callers share the
+    service budget through its fair queue instead of waiting independently.
+    """
+    limiter = api_rate_limiter.limiters.get(service)
+    
     def decorator(func):
+        if limiter is None:
+            return func
+        
+        if identifier_func:
+            fair_acquire = api_rate_limiter.fair_queue(service).acquire
+            
+            async def fair_wrapper(*args, **kwargs):
+                await fair_acquire(identifier_func(*args, **kwargs))
+                return await func(*args, **kwargs)
+            return fair_wrapper
+        
+        acquire = limiter.acquire
+        sleep = asyncio.sleep
+        
         async def wrapper(*args, **kwargs):
-            identifier = "default"
-            if identifier_func:
-                identifier = identifier_func(*args, **kwargs)
+            allowed, wait_time = acquire("default")
+            while not allowed:
+                await sleep(wait_time)
+                allowed, wait_time = acquire("default")
             
-            await api_rate_limiter.wait_if_needed(service, identifier)
             return await func(*args, **kwargs)
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
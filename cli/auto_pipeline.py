@@ -18,10 +18,13 @@ Usage:
 """
 import os
 import sys
+import time
+import asyncio
 import argparse
 import logging
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 # Setup path
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -31,40 +34,43 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from dotenv import load_dotenv
 load_dotenv("config.env")
 
+from backend.core.ai_engine.content_curator import get_trending_prompt, get_daily_content_plan, mark_as_uploaded
+from backend.core.ai_engine.video_analyzer import generate_metadata_from_video
+from backend.core.ai_engine.video_metadata import format_youtube_description, generate_video_metadata
+from backend.core.video_engine.video_extender import extend_video, get_video_duration, convert_to_vertical
+from backend.utils.backpressure import AIMDController
+
+# Optional stages: a missing dependency only disables the step that needs it
+try:
+    from backend.core.video_engine.meta_ai_generator import MetaAIGenerator, run_generate_and_download
+except ImportError:
+    MetaAIGenerator = run_generate_and_download = None
+
+try:
+    from backend.core.video_engine.smart_audio import add_smart_audio, video_has_audio
+except ImportError:
+    add_smart_audio = video_has_audio = None
+
+try:
+    from backend.core.post_engine.youtube import upload_youtube_short
+except ImportError:
+    upload_youtube_short = None
+
+try:
+    from backend.core.post_engine.facebook import upload_facebook_reel
+except ImportError:
+    upload_facebook_reel = None
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# A batch upload slower than this multiple of the fastest one so far counts as backpressure
+UPLOAD_SLOWDOWN = 2.0
 
-def run_full_pipeline(
-    prompt: str = None,
-    category: str = None,
-    headless: bool = False,
-    upload_youtube: bool = True,
-    upload_facebook: bool = False
-) -> dict:
-    """
-    Run the full automated pipeline.
-    
-    Args:
-        prompt: Custom prompt (if None, generates trending prompt)
-        category: Content category (funny, music, artistic, nature)
-        headless: Run browser in headless mode
-        upload_youtube: Upload to YouTube
-        upload_facebook: Upload to Facebook
-    
-    Returns:
-        Result dict with all info
-    """
-    from backend.core.ai_engine.content_curator import get_trending_prompt, mark_as_uploaded
-    from backend.core.video_engine.meta_ai_generator import run_generate_and_download
-    from backend.core.ai_engine.video_analyzer import generate_metadata_from_video
-    from backend.core.ai_engine.video_metadata import format_youtube_description
-    
-    print("\n" + "=" * 60)
-    print("FULLY AUTOMATED META AI TO YOUTUBE PIPELINE")
-    print("=" * 60)
-    
-    result = {
+
+def _new_result() -> dict:
+    """Create the result dict shared by the pipeline stages."""
+    return {
         "success": False,
         "prompt": None,
         "video_path": None,
@@ -72,7 +78,19 @@ def run_full_pipeline(
         "facebook_url": None,
         "error": None
     }
+
+
+def generate_stage(result: dict, prompt: str = None, category: str = None,
+                   headless: bool = False, generator=None) -> Optional[dict]:
+    """
+    Steps 1-2: pick a prompt and generate/download the video on Meta AI.
+    
+    Args:
+        generator: Started MetaAIGenerator to reuse instead of launching a browser
     
+    Returns:
+        Meta AI download result, or None on failure (result["error"] is set)
+    """
     # Step 1: Get prompt
     print("\n[1/6] Getting viral prompt...")
     if prompt:
@@ -84,26 +102,41 @@ def run_full_pipeline(
     
     prompt = idea["prompt"]
     result["prompt"] = prompt
+    result["category"] = idea.get("category", "ai_animation")
     print(f"      Prompt: {prompt[:70]}...")
     
     # Step 2: Generate on Meta AI (5s only - we'll extend with FFmpeg)
     print("\n[2/6] Generating video on Meta AI...")
     print("      (This may take 1-2 minutes)")
     
+    if run_generate_and_download is None:
+        error = "Meta AI generator not available (missing dependencies)"
+        print(f"      [X] {error}")
+        result["error"] = error
+        return None
+    
     download_result = run_generate_and_download(prompt, headless=headless, 
-                                                 target_duration=0, add_music=False)
+                                                 target_duration=0, add_music=False,
+                                                 generator=generator)
     
     if not download_result or not download_result.get("success"):
         error = "Failed to generate/download video from Meta AI"
         print(f"      [X] {error}")
         result["error"] = error
-        return result
+        return None
     
-    video_path = download_result.get("file_path")
-    result["video_path"] = video_path
-    print(f"      [OK] Video: {video_path}")
+    result["video_path"] = download_result.get("file_path")
+    print(f"      [OK] Video: {result['video_path']}")
     print(f"      [OK] Size: {download_result.get('file_size', 0) / 1024 / 1024:.2f} MB")
     
+    return download_result
+
+
+def postprocess_stage(result: dict, download_result: dict):
+    """Steps 2.5-4: extend, reframe, add music, analyze and build metadata."""
+    prompt = result["prompt"]
+    video_path = result["video_path"]
+    
     # Check if Meta AI extended and added music
     meta_extended = download_result.get("extended", False)
     meta_music = download_result.get("music_added", False)
@@ -118,8 +151,6 @@ def run_full_pipeline(
     if not meta_extended or meta_duration < 10:
         print("\n[2.5/6] Extending video (FFmpeg fallback)...")
         try:
-            from backend.core.video_engine.video_extender import extend_video, get_video_duration, convert_to_vertical
-            
             duration = get_video_duration(video_path)
             print(f"      Current: {duration:.1f}s")
             
@@ -150,7 +181,6 @@ def run_full_pipeline(
         # Still convert to vertical even if Meta AI extended
         print("\n[2.5/6] Converting to 9:16 vertical...")
         try:
-            from backend.core.video_engine.video_extender import convert_to_vertical
             vertical_result = convert_to_vertical(video_path)
             if vertical_result.get("success") and vertical_result.get("output"):
                 video_path = vertical_result["output"]
@@ -163,8 +193,6 @@ def run_full_pipeline(
     if not meta_music:
         print("\n[2.6/6] Adding music (FFmpeg fallback)...")
         try:
-            from backend.core.video_engine.smart_audio import add_smart_audio, video_has_audio
-            
             if not video_has_audio(video_path):
                 audio_result = add_smart_audio(video_path, prompt)
                 if audio_result.get("success") and audio_result.get("output"):
@@ -192,10 +220,8 @@ def run_full_pipeline(
     # Step 4: Generate metadata
     print("\n[4/6] Generating metadata...")
     if not metadata or not metadata.get("title"):
-        from backend.core.ai_engine.video_metadata import generate_video_metadata
         # Pass the category from content curator for better emoji selection
-        category = idea.get("category", "ai_animation")
-        metadata = generate_video_metadata(prompt, category)
+        metadata = generate_video_metadata(prompt, result["category"])
     
     title = metadata.get("title", prompt[:50])[:100]
     description = format_youtube_description(metadata)
@@ -207,12 +233,19 @@ def run_full_pipeline(
     
     print(f"      Title: {title}")
     print(f"      Tags: {', '.join(tags[:5])}")
+
+
+def upload_stage(result: dict, upload_youtube: bool = True, upload_facebook: bool = False):
+    """Steps 5-6: upload to YouTube/Facebook and mark the prompt as used."""
+    video_path = result["video_path"]
+    title = result["title"]
+    description = result["description"]
     
     # Step 5: Upload to YouTube
+    upload_started = time.time()
     if upload_youtube:
         print("\n[5/6] Uploading to YouTube...")
         try:
-            from backend.core.post_engine.youtube import upload_youtube_short
             video_id = upload_youtube_short(video_path, title, description)
             youtube_url = f"https://youtube.com/shorts/{video_id}"
             result["youtube_url"] = youtube_url
@@ -228,7 +261,6 @@ def run_full_pipeline(
     if upload_facebook:
         print("\n[6/6] Uploading to Facebook...")
         try:
-            from backend.core.post_engine.facebook import upload_facebook_reel
             fb_caption = f"{title}\n\n{description}"
             fb_id = upload_facebook_reel(video_path, fb_caption)
             facebook_url = f"https://facebook.com/reel/{fb_id}"
@@ -241,53 +273,72 @@ def run_full_pipeline(
     else:
         print("\n[6/6] Skipping Facebook upload")
     
+    result["upload_time"] = time.time() - upload_started
+    
     # Mark as uploaded
-    mark_as_uploaded(prompt[:50])
+    mark_as_uploaded(result["prompt"][:50])
     
     result["success"] = True
-    
-    # Summary
+
+
+def _print_summary(result: dict):
+    """Print the end-of-pipeline summary for one video."""
     print("\n" + "=" * 60)
     print("PIPELINE COMPLETE")
     print("=" * 60)
-    print(f"Prompt: {prompt[:60]}...")
-    print(f"Video: {video_path}")
-    print(f"Title: {title}")
+    print(f"Prompt: {result['prompt'][:60]}...")
+    print(f"Video: {result['video_path']}")
+    print(f"Title: {result['title']}")
     if result.get("youtube_url"):
         print(f"YouTube: {result['youtube_url']}")
     if result.get("facebook_url"):
         print(f"Facebook: {result['facebook_url']}")
     print("=" * 60 + "\n")
+
+
+def run_full_pipeline(
+    prompt: str = None,
+    category: str = None,
+    headless: bool = False,
+    upload_youtube: bool = True,
+    upload_facebook: bool = False
+) -> dict:
+    """
+    Run the full automated pipeline.
+    
+    Args:
+        prompt: Custom prompt (if None, generates trending prompt)
+        category: Content category (funny, music, artistic, nature)
+        headless: Run browser in headless mode
+        upload_youtube: Upload to YouTube
+        upload_facebook: Upload to Facebook
+    
+    Returns:
+        Result dict with all info
+    """
+    print("\n" + "=" * 60)
+    print("FULLY AUTOMATED META AI TO YOUTUBE PIPELINE")
+    print("=" * 60)
+    
+    result = _new_result()
+    
+    download_result = generate_stage(result, prompt, category, headless)
+    if download_result is None:
+        return result
+    
+    postprocess_stage(result, download_result)
+    upload_stage(result, upload_youtube, upload_facebook)
+    _print_summary(result)
     
     return result
 
 
 def run_batch_pipeline(count: int = 3, **kwargs):
     """Run pipeline multiple times with different prompts."""
-    from backend.core.ai_engine.content_curator import get_daily_content_plan
-    
     print(f"\n[*] Running batch pipeline for {count} videos...")
     
     plan = get_daily_content_plan(count)
-    results = []
-    
-    for i, item in enumerate(plan, 1):
-        print(f"\n{'#' * 60}")
-        print(f"# VIDEO {i}/{count}")
-        print(f"{'#' * 60}")
-        
-        result = run_full_pipeline(
-            prompt=item["prompt"],
-            category=item["category"],
-            **kwargs
-        )
-        results.append(result)
-        
-        # Wait between uploads to avoid rate limits
-        if i < count:
-            import time
-            print("\n[*] Waiting 30 seconds before next video...")
-            time.sleep(30)
+    results = asyncio.run(_run_batch(plan, count, **kwargs))
     
     # Summary
     print("\n" + "=" * 60)
@@ -304,6 +355,85 @@ def run_batch_pipeline(count: int = 3, **kwargs):
     return results
 
 
+async def _run_batch(plan: list, count: int, headless: bool = False,
+                     upload_youtube: bool = True, upload_facebook: bool = False) -> list:
+    """
+    Run the plan as a three-stage pipeline so stages overlap across videos.
+    
+    Meta AI generation of video K+1 runs while video K is post-processed and
+    video K-1 uploads. Generation stays one-at-a-time (single browser profile);
+    uploads run concurrently up to the AIMD controller's current limit.
+    
+    An upload counts as slow once it takes UPLOAD_SLOWDOWN times the fastest
+    successful upload so far; a fixed target can't fit whole-video uploads,
+    whose duration depends on file size and link speed.
+    """
+    # No target until the first upload has been timed
+    controller = AIMDController(c_min=1, c_max=4, alpha=0.5, beta=0.5, L_target=float("inf"))
+    fastest_upload = float("inf")
+    generated = asyncio.Queue(maxsize=2)
+    processed = asyncio.Queue(maxsize=2)
+    results = [_new_result() for _ in plan]
+    
+    # One browser for the whole batch instead of a Chromium launch per video
+    generator = None
+    if MetaAIGenerator is not None:
+        try:
+            generator = MetaAIGenerator(headless=headless)
+            await generator.start()
+        except Exception as e:
+            logger.warning(f"Could not start shared browser, launching per video: {e}")
+            generator = None
+    
+    async def generate_worker():
+        for i, item in enumerate(plan):
+            print(f"\n{'#' * 60}")
+            print(f"# VIDEO {i + 1}/{count}")
+            print(f"{'#' * 60}")
+            
+            result = results[i]
+            download_result = await asyncio.to_thread(
+                generate_stage, result, item["prompt"], item["category"], headless, generator
+            )
+            if download_result is not None:
+                await generated.put((result, download_result))
+        await generated.put(None)
+    
+    async def postprocess_worker():
+        while (job := await generated.get()) is not None:
+            await asyncio.to_thread(postprocess_stage, *job)
+            await processed.put(job[0])
+        await processed.put(None)
+    
+    async def upload(result: dict):
+        nonlocal fastest_upload
+        async with controller.slot():
+            await asyncio.to_thread(upload_stage, result, upload_youtube, upload_facebook)
+        upload_ok = not (result.get("youtube_error") or result.get("facebook_error"))
+        if upload_ok:
+            fastest_upload = min(fastest_upload, result["upload_time"])
+            controller.L_target = UPLOAD_SLOWDOWN * fastest_upload
+        controller.observe(result["upload_time"], success=upload_ok)
+        _print_summary(result)
+    
+    async def upload_worker():
+        uploads = []
+        while (result := await processed.get()) is not None:
+            # Only hold back the next upload when uploads are being pushed back
+            if controller.attempt:
+                print(f"\n[*] Upload backpressure, backing off before next upload (attempt {controller.attempt})...")
+            await controller.gate()
+            uploads.append(asyncio.create_task(upload(result)))
+        await asyncio.gather(*uploads)
+    
+    try:
+        await asyncio.gather(generate_worker(), postprocess_worker(), upload_worker())
+    finally:
+        if generator is not None:
+            await generator.stop()
+    return results
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Fully Automated Meta AI to YouTube Pipeline")
     parser.add_argument("--prompt", "-p", help="Custom prompt for video generation")
@@ -322,8 +452,6 @@ if __name__ == "__main__":
         # Just open browser for login
         print("[*] Opening browser for Meta AI login...")
         print("[*] Please login and close the browser when done.")
-        import asyncio
-        from backend.core.video_engine.meta_ai_generator import MetaAIGenerator
         
         async def do_login():
             gen = MetaAIGenerator(headless=False)
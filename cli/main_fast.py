@@ -44,7 +44,8 @@ def run_fast_mode(super_fast=False):
     print(f"[cyan]🌐 Searching for background video: '{topic}'...[/cyan]")
     video_start = time.time()
     
-    # Try Pixabay first, then Pexels
+    # Try Pixabay first, then Pexels (only existence matters here - the
+    # builders take their duration from the voiceover, not this clip)
     video_path = get_pixabay_video(topic)
     if not video_path or not os.path.exists(video_path):
         print("[yellow]⚠️ Pixabay failed, trying Pexels...[/yellow]")
@@ -109,24 +109,22 @@ def test_video(video_path: str):
     """Test if video plays correctly."""
     import subprocess
     
-    if not os.path.exists(video_path):
+    # Get video info (one stat + one ffprobe for everything below)
+    from backend.core.video_engine.meta_ai_downloader import probe_video
+    probe = probe_video(video_path)
+    
+    if not probe.exists:
         print(f"[X] Video not found: {video_path}")
         return False
     
-    # Get video info
-    from backend.core.video_engine.meta_ai_downloader import get_video_info, is_valid_video, has_audio
-    
-    if not is_valid_video(video_path):
+    if not probe.is_valid:
         print(f"[X] Invalid video file")
         return False
     
-    info = get_video_info(video_path)
-    audio = has_audio(video_path)
-    
     print(f"\n[VIDEO INFO]")
-    print(f"  Resolution: {info['width']}x{info['height']}")
-    print(f"  Duration: {info['duration']:.1f}s")
-    print(f"  Has Audio: {audio}")
+    print(f"  Resolution: {probe.width}x{probe.height}")
+    print(f"  Duration: {probe.duration:.1f}s")
+    print(f"  Has Audio: {probe.has_audio}")
     print(f"  File Size: {os.path.getsize(video_path) / 1024 / 1024:.2f} MB")
     
     # Try to play with default player
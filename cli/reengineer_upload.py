@@ -7,24 +7,53 @@ Usage:
     python cli/reengineer_upload.py <meta_ai_url> --youtube
     python cli/reengineer_upload.py <meta_ai_url> --facebook
     python cli/reengineer_upload.py <meta_ai_url> --no-upload
+    python cli/reengineer_upload.py <meta_ai_url> --json   (print only the result as JSON; progress goes to stderr)
 """
 import os
 import sys
+import json
+import asyncio
+import contextlib
+import hashlib
 import argparse
 import logging
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Setup path
 PROJECT_ROOT = Path(__file__).parent.parent
 os.chdir(PROJECT_ROOT)
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from dotenv import load_dotenv
-load_dotenv("config.env")
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+RULE = "=" * 60
+
+
+@lru_cache(maxsize=None)
+def _get_session():
+    """Get the pooled session for this run's HTTP calls, built on first use.
+    
+    Retries only cover idempotent methods.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504)),
+    ))
+    return session
+
 
 def reengineer_and_upload(
     meta_url: str,
@@ -37,14 +66,15 @@ def reengineer_and_upload(
     2. Analyze video content (OCR, AI vision)
     3. Generate optimized metadata with AI
     4. Upload to YouTube and/or Facebook
+    
+    Re-running on the same URL resumes from the recorded run: steps 1-3 and
+    any upload that already succeeded are skipped.
     """
-    from backend.core.video_engine.meta_ai_downloader import download_meta_ai_content
-    from backend.core.ai_engine.video_analyzer import analyze_video_content, generate_metadata_from_video
-    from backend.core.ai_engine.video_metadata import format_youtube_description
+    from backend.database import db
     
-    print("\n" + "=" * 60)
+    print("\n" + RULE)
     print("RE-ENGINEER & UPLOAD PIPELINE")
-    print("=" * 60)
+    print(RULE)
     
     result = {
         "success": False,
@@ -55,6 +85,78 @@ def reengineer_and_upload(
         "error": None
     }
     
+    url_hash = hashlib.sha256(meta_url.encode()).hexdigest()
+    run = db.get_pipeline_run(url_hash) or {}
+    
+    if run.get("video_path") and run.get("title") and os.path.exists(run["video_path"]):
+        print("\n[1-3/5] Already processed, reusing earlier run")
+        print(f"      [OK] Video: {run['video_path']}")
+        print(f"      [OK] Title: {run['title']}")
+        video_path = run["video_path"]
+        title = run["title"]
+        description = run["description"]
+        tags = json.loads(run["tags_json"] or "[]")
+        result.update({"video_path": video_path, "title": title,
+                       "description": description, "tags": tags})
+    else:
+        prepared = _download_and_describe(meta_url, result)
+        if prepared is None:
+            return result
+        video_path, title, description, tags = prepared
+        db.save_pipeline_run(url_hash, video_path=video_path, title=title,
+                             description=description, tags_json=json.dumps(tags))
+    
+    # Don't upload twice to a platform that already has this video
+    if run.get("youtube_id"):
+        print(f"\n      [OK] Already on YouTube: {run['youtube_id']}")
+        result["youtube_id"] = run["youtube_id"]
+        result["youtube_url"] = f"https://youtube.com/shorts/{run['youtube_id']}"
+        upload_youtube = False
+    if run.get("facebook_id"):
+        print(f"\n      [OK] Already on Facebook: {run['facebook_id']}")
+        result["facebook_id"] = run["facebook_id"]
+        result["facebook_url"] = f"https://facebook.com/reel/{run['facebook_id']}"
+        upload_facebook = False
+    
+    # Steps 4-5: Upload to YouTube and Facebook concurrently
+    asyncio.run(_upload_all(result, video_path, title, description,
+                            upload_youtube, upload_facebook))
+    
+    uploaded = {k: result[k] for k in ("youtube_id", "facebook_id") if result.get(k)}
+    if uploaded:
+        db.save_pipeline_run(url_hash, **uploaded)
+    
+    result["success"] = True
+    
+    # Summary
+    print("\n" + RULE)
+    print("PIPELINE COMPLETE")
+    print(RULE)
+    print(f"Video: {video_path}")
+    print(f"Title: {title}")
+    if result.get("youtube_url"):
+        print(f"YouTube: {result['youtube_url']}")
+    if result.get("facebook_url"):
+        print(f"Facebook: {result['facebook_url']}")
+    if not result.get("youtube_url") and not result.get("facebook_url"):
+        print("No uploads performed")
+    print(RULE + "\n")
+    
+    return result
+
+
+def _download_and_describe(meta_url: str, result: dict):
+    """Steps 1-3: download, analyze and generate metadata.
+    
+    Returns (video_path, title, description, tags), or None with result["error"] set.
+    """
+    from backend.core.video_engine.meta_ai_downloader import download_meta_ai_content
+    from backend.core.ai_engine.video_analyzer import (
+        analyze_video_content, generate_metadata_from_video, VISION_MODEL, ANALYSIS_PROMPT_VERSION
+    )
+    from backend.utils.cache_manager import file_content_hash, cache_analysis, get_cached_analysis
+    from backend.core.ai_engine.video_metadata import format_youtube_description
+    
     # Step 1: Download from Meta AI
     print(f"\n[1/5] Downloading from Meta AI...")
     print(f"      URL: {meta_url}")
@@ -64,12 +166,12 @@ def reengineer_and_upload(
     except Exception as e:
         print(f"      [X] Download failed: {e}")
         result["error"] = str(e)
-        return result
+        return None
     
     if not download_result.get("success"):
         print(f"      [X] Download failed: {download_result.get('message')}")
         result["error"] = download_result.get("message")
-        return result
+        return None
     
     video_path = download_result.get("file_path")
     original_prompt = download_result.get("prompt", "")
@@ -81,11 +183,21 @@ def reengineer_and_upload(
     
     result["video_path"] = video_path
     
+    # Hash the video once; it keys the analysis cache and the analyzer's own reuse
+    video_hash = file_content_hash(video_path)
+    result["content_hash"] = video_hash
+    cache_key = f"{video_hash}:{VISION_MODEL}:v{ANALYSIS_PROMPT_VERSION}"
+    cached = get_cached_analysis(cache_key)
+    
     # Step 2: Analyze video content
     print(f"\n[2/5] Analyzing video content...")
     
     try:
-        analysis = analyze_video_content(video_path)
+        if cached:
+            analysis = cached["analysis"]
+            print(f"      [OK] Using cached analysis ({video_hash[:12]})")
+        else:
+            analysis = analyze_video_content(video_path, content_hash=video_hash)
         
         if analysis.get("visible_text"):
             print(f"      [OK] Text detected: {analysis.get('visible_text')[:60]}...")
@@ -103,15 +215,25 @@ def reengineer_and_upload(
     print(f"\n[3/5] Generating AI metadata...")
     
     try:
-        # Use video analysis if available, otherwise use original prompt
-        content_for_metadata = (
-            analysis.get("visible_text") or 
-            analysis.get("description") or 
-            original_prompt or 
-            "AI Generated Video"
-        )
-        
-        metadata = generate_metadata_from_video(video_path, content_for_metadata)
+        if cached:
+            metadata = cached["metadata"]
+        else:
+            # Use video analysis if available, otherwise use original prompt
+            content_for_metadata = (
+                analysis.get("visible_text") or 
+                analysis.get("description") or 
+                original_prompt or 
+                "AI Generated Video"
+            )
+            
+            metadata = generate_metadata_from_video(video_path, content_for_metadata,
+                                                    content_hash=video_hash)
+            # Only a real vision result is worth keeping for the cache TTL; a failed
+            # or OCR-fallback analysis should be retried on the next run
+            if analysis.get("source") == "vision" and (
+                analysis.get("description") or analysis.get("visible_text")
+            ):
+                cache_analysis(cache_key, analysis, metadata)
         
         title = metadata.get("title", "AI Video")[:100]
         description = format_youtube_description(metadata)
@@ -131,64 +253,107 @@ def reengineer_and_upload(
     result["description"] = description
     result["tags"] = tags
     
-    # Step 4: Upload to YouTube
+    return video_path, title, description, tags
+
+
+async def _upload_all(result: dict, video_path: str, title: str, description: str,
+                      upload_youtube: bool, upload_facebook: bool):
+    """Run the selected uploads at the same time and merge their outcomes into result."""
+    
+    from rich.progress import Progress, BarColumn, DownloadColumn, TextColumn, TimeElapsedColumn
+    
+    file_size = os.path.getsize(video_path)
+    progress = Progress(
+        TextColumn("      {task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TimeElapsedColumn(),
+    )
+    
+    async def _yt_task():
+        from backend.core.post_engine.youtube import upload_youtube_short
+        task = progress.add_task("YouTube", total=file_size)
+        
+        def on_progress(uploaded, total):
+            progress.update(task, completed=uploaded, total=total)
+        
+        return await asyncio.to_thread(upload_youtube_short, video_path, title, description,
+                                       progress_callback=on_progress)
+    
+    async def _fb_task():
+        from backend.core.post_engine.facebook import upload_facebook_reel
+        # The Reels binary upload is a single request, so this only completes at the end
+        task = progress.add_task("Facebook", total=file_size)
+        fb_caption = f"{title}\n\n{description}"
+        video_id = await asyncio.to_thread(upload_facebook_reel, video_path, fb_caption,
+                                           session=_get_session())
+        progress.update(task, completed=file_size)
+        return video_id
+    
+    tasks = {}
     if upload_youtube:
         print(f"\n[4/5] Uploading to YouTube...")
-        try:
-            from backend.core.post_engine.youtube import upload_youtube_short
-            video_id = upload_youtube_short(video_path, title, description)
-            youtube_url = f"https://youtube.com/shorts/{video_id}"
-            result["youtube_url"] = youtube_url
-            result["youtube_id"] = video_id
-            print(f"      [OK] YouTube: {youtube_url}")
-        except Exception as e:
-            print(f"      [X] YouTube error: {e}")
-            result["youtube_error"] = str(e)
+        tasks["youtube"] = _yt_task()
     else:
         print(f"\n[4/5] Skipping YouTube upload")
     
-    # Step 5: Upload to Facebook
     if upload_facebook:
         print(f"\n[5/5] Uploading to Facebook...")
-        try:
-            from backend.core.post_engine.facebook import upload_facebook_reel
-            fb_caption = f"{title}\n\n{description}"
-            fb_id = upload_facebook_reel(video_path, fb_caption)
-            facebook_url = f"https://facebook.com/reel/{fb_id}"
-            result["facebook_url"] = facebook_url
-            result["facebook_id"] = fb_id
-            print(f"      [OK] Facebook: {facebook_url}")
-        except Exception as e:
-            print(f"      [X] Facebook error: {e}")
-            result["facebook_error"] = str(e)
+        tasks["facebook"] = _fb_task()
     else:
         print(f"\n[5/5] Skipping Facebook upload")
     
-    result["success"] = True
+    with progress:
+        outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
     
-    # Summary
-    print("\n" + "=" * 60)
-    print("PIPELINE COMPLETE")
-    print("=" * 60)
-    print(f"Video: {video_path}")
-    print(f"Title: {title}")
-    if result.get("youtube_url"):
-        print(f"YouTube: {result['youtube_url']}")
-    if result.get("facebook_url"):
-        print(f"Facebook: {result['facebook_url']}")
-    if not result.get("youtube_url") and not result.get("facebook_url"):
-        print("No uploads performed")
-    print("=" * 60 + "\n")
+    for platform, outcome in zip(tasks, outcomes):
+        if platform == "youtube":
+            if isinstance(outcome, BaseException):
+                print(f"      [X] YouTube error: {outcome}")
+                result["youtube_error"] = str(outcome)
+            else:
+                youtube_url = f"https://youtube.com/shorts/{outcome}"
+                result["youtube_url"] = youtube_url
+                result["youtube_id"] = outcome
+                print(f"      [OK] YouTube: {youtube_url}")
+        else:
+            if isinstance(outcome, BaseException):
+                print(f"      [X] Facebook error: {outcome}")
+                result["facebook_error"] = str(outcome)
+            else:
+                facebook_url = f"https://facebook.com/reel/{outcome}"
+                result["facebook_url"] = facebook_url
+                result["facebook_id"] = outcome
+                print(f"      [OK] Facebook: {facebook_url}")
+
+
+def dump_result(result: dict):
+    """Write the pipeline result to stdout as indented JSON."""
+    if ORJSON_AVAILABLE:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+def _init():
+    """Load config and set up logging (only when run as a script, so importing stays cheap)."""
+    from dotenv import load_dotenv
+    load_dotenv("config.env")
     
-    return result
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
 
 if __name__ == "__main__":
+    _init()
+    
     parser = argparse.ArgumentParser(description="Re-Engineer & Upload Meta AI Video")
     parser.add_argument("url", help="Meta AI post URL")
     parser.add_argument("--youtube", "-yt", action="store_true", help="Upload to YouTube")
     parser.add_argument("--facebook", "-fb", action="store_true", help="Upload to Facebook")
     parser.add_argument("--no-upload", action="store_true", help="Skip all uploads")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON (progress goes to stderr)")
     
     args = parser.parse_args()
     
@@ -200,8 +365,13 @@ if __name__ == "__main__":
         upload_yt = False
         upload_fb = False
     
-    reengineer_and_upload(
-        args.url,
-        upload_youtube=upload_yt,
-        upload_facebook=upload_fb
-    )
+    # With --json, stdout carries only the JSON document; progress goes to stderr
+    with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+        result = reengineer_and_upload(
+            args.url,
+            upload_youtube=upload_yt,
+            upload_facebook=upload_fb
+        )
+    
+    if args.json:
+        dump_result(result)
@@ -4,6 +4,7 @@ Run with: python -m cli.run
 """
 import os
 import sys
+import argparse
 from pathlib import Path
 
 # Add project root to path
@@ -13,23 +14,16 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from dotenv import load_dotenv
 load_dotenv("config.env")
 
-# Initialize logging
-from backend.config.logging_config import setup_logging
-setup_logging()
-
 import logging
 from rich.console import Console
 from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
-from rich.table import Table
-
-from backend.config.settings import settings
-from backend.utils.health_checker import health_checker
-from backend.utils.cache_manager import cache_manager
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Built on first show_menu() call and reprinted after that
+_menu_table = None
+
 def show_banner():
     console.print(Panel.fit(
         "[bold cyan]🎬 OneClick Reels AI[/bold cyan]\n"
@@ -38,6 +32,14 @@ def show_banner():
     ))
 
 def show_menu():
+    global _menu_table
+    if _menu_table is not None:
+        console.print(_menu_table)
+        console.print()
+        return
+    
+    from rich.table import Table
+    
     table = Table(show_header=False, box=None)
     table.add_column("Option", style="bold yellow")
     table.add_column("Description")
@@ -53,11 +55,15 @@ def show_menu():
     table.add_row("9", "🧹 Clear Cache")
     table.add_row("0", "❌ Exit")
     
+    _menu_table = table
     console.print(table)
     console.print()
 
 def check_configuration():
     """Check configuration status."""
+    from rich.table import Table
+    from backend.config.settings import settings
+    
     console.print("\n[bold green]🔧 Configuration Status[/bold green]\n")
     
     config_status = settings.get_all_settings()
@@ -77,6 +83,9 @@ def check_configuration():
 
 def run_health_check():
     """Run health check."""
+    from rich.table import Table
+    from backend.utils.health_checker import health_checker
+    
     console.print("\n[bold green]🏥 Running Health Check...[/bold green]\n")
     
     with console.status("[bold green]Checking services..."):
@@ -99,6 +108,9 @@ def run_health_check():
 
 def clear_cache():
     """Clear cache."""
+    from rich.prompt import Confirm
+    from backend.utils.cache_manager import cache_manager
+    
     console.print("\n[bold yellow]🧹 Cache Management[/bold yellow]\n")
     
     stats = cache_manager.get_cache_stats()
@@ -111,6 +123,7 @@ def clear_cache():
 
 def one_click_mode():
     """Full automated mode."""
+    from rich.prompt import Confirm
     from backend.core.ai_engine.niche_selector import select_niche
     from backend.core.ai_engine.script_generator import generate_script
     from backend.core.ai_engine.caption_hashtags import generate_caption
@@ -176,31 +189,61 @@ def one_click_mode():
         console.print(f"[red]❌ Error: {e}[/red]")
         logger.error(f"One-click mode error: {e}", exc_info=True)
 
-def main():
-    """Main CLI loop."""
+# Menu choice -> handler (also used for non-interactive --mode runs)
+MENU_ACTIONS = {
+    "1": one_click_mode,
+    "6": check_configuration,
+    "8": run_health_check,
+    "9": clear_cache,
+}
+
+MODES = {
+    "one_click": "1",
+    "config": "6",
+    "health": "8",
+    "cache": "9",
+}
+
+def dispatch(choice: str):
+    """Run the handler for a menu choice."""
+    action = MENU_ACTIONS.get(choice)
+    if action:
+        action()
+    else:
+        console.print(f"[yellow]⚠️ Option {choice} not implemented yet[/yellow]")
+
+def main(argv=None):
+    """Main CLI loop (or a single action with --mode)."""
+    parser = argparse.ArgumentParser(description="OneClick Reels AI CLI")
+    parser.add_argument("--mode", choices=sorted(MODES), help="Run one action and exit (no menu)")
+    args = parser.parse_args(argv)
+    
+    from backend.config.settings import settings
+    from backend.config.logging_config import setup_logging
+    
+    # Initialize logging (importing backend.config pulls in settings/security)
+    setup_logging()
+    settings.create_directories()
+    
+    if args.mode:
+        dispatch(MODES[args.mode])
+        return
+    
+    from rich.prompt import Prompt
+    
     try:
-        settings.create_directories()
         show_banner()
         
         while True:
             show_menu()
             choice = Prompt.ask("Choose option", choices=["0", "1", "2", "3", "4", "5", "6", "7", "8", "9"])
             
+            if choice == "0":
+                console.print("[yellow]👋 Goodbye![/yellow]")
+                break
+            
             try:
-                if choice == "0":
-                    console.print("[yellow]👋 Goodbye![/yellow]")
-                    break
-                elif choice == "1":
-                    one_click_mode()
-                elif choice == "6":
-                    check_configuration()
-                elif choice == "8":
-                    run_health_check()
-                elif choice == "9":
-                    clear_cache()
-                else:
-                    console.print(f"[yellow]⚠️ Option {choice} not implemented yet[/yellow]")
-                
+                dispatch(choice)
                 console.print("\n" + "="*50 + "\n")
                 
             except KeyboardInterrupt:
@@ -4,8 +4,8 @@
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 Features:
-  ✅ True parallel async I/O (reads ALL files concurrently)
-  ✅ Incremental backup (only changed files via SHA256 hash)
+  ✅ True parallel async I/O streamed straight into the ZIP (bounded memory)
+  ✅ Incremental backup (only changed files via BLAKE3 hash)
   ✅ Daily folder organization (YYYY-MM-DD/HH-MM-SS.zip)
   ✅ Atomic writes (temp file → rename on success)
   ✅ ZIP integrity verification after creation
@@ -19,47 +19,121 @@ Usage:
   python backup_world_class.py          # Run scheduled backups
   python backup_world_class.py --once   # Run once and exit
   python backup_world_class.py --full   # Force full backup (no incremental)
+  python backup_world_class.py --rehash # Ignore the files cache, re-read and re-hash everything
   python backup_world_class.py --cleanup # Run cleanup only
   python backup_world_class.py --verify path/to/file.zip  # Verify ZIP
 
+Reads, hashing and compression release the GIL and run on thread/process
+pools; on a free-threaded build the Python glue runs in parallel too:
+  PYTHON_GIL=0 python3.13t backup_world_class.py --once
+
 Author: QuantAlgo
 """
 
 import os
+import re
 import sys
 import time
 import json
+import mmap
+import struct
 import asyncio
 import hashlib
+import itertools
 import zipfile
 import shutil
+import functools
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Set
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 # Optional imports with fallbacks
 try:
-    import aiofiles
-    HAS_AIOFILES = True
+    from tqdm import tqdm
 except ImportError:
-    HAS_AIOFILES = False
-    print("⚠️ 'aiofiles' not installed. Using sync file reads.")
+    # Fallback tqdm
+    class tqdm:
+        def __init__(self, iterable=None, **kwargs):
+            self.iterable = iterable
+        def __iter__(self):
+            return iter(self.iterable)
+        def update(self, n=1):
+            pass
+        def close(self):
+            pass
 
 try:
-    from tqdm import tqdm
+    import blake3
+    HAS_BLAKE3 = True
 except ImportError:
-    # Fallback tqdm
-    def tqdm(iterable, **kwargs):
-        return iterable
+    HAS_BLAKE3 = False
+
+try:
+    # ISA-L's SIMD DEFLATE/CRC32, used by zipfile in place of zlib
+    from isal import isal_zlib
+    zipfile.zlib = isal_zlib
+    HAS_ISAL = True
+except ImportError:
+    HAS_ISAL = False
+
+try:
+    # zlib-ng: runtime-dispatched PCLMULQDQ CRC32 (same IEEE polynomial ZIP requires)
+    from zlib_ng import zlib_ng
+    HAS_ZLIB_NG = True
+    if not HAS_ISAL:
+        zipfile.zlib = zlib_ng
+except ImportError:
+    HAS_ZLIB_NG = False
+
+try:
+    # fastcrc: VPCLMULQDQ-folded CRC-32/ISO-HDLC (the IEEE polynomial ZIP uses)
+    from fastcrc import crc32 as fastcrc32
+
+    def fast_crc32(data, value: int = 0) -> int:
+        return fastcrc32.iso_hdlc(data, initial=value)
+    HAS_FASTCRC = True
+except ImportError:
+    HAS_FASTCRC = False
+
+# zipfile binds crc32 at import, so swapping zipfile.zlib doesn't reach it;
+# ZipExtFile checks every entry read through it, so use the fastest available
+if HAS_FASTCRC:
+    zipfile.crc32 = fast_crc32
+elif HAS_ISAL:
+    zipfile.crc32 = isal_zlib.crc32
+elif HAS_ZLIB_NG:
+    zipfile.crc32 = zlib_ng.crc32
+
+# Zstandard ZIP entries (method 93): native on Python 3.14+, else via zipfile-zstd
+ZIP_ZSTANDARD = getattr(zipfile, "ZIP_ZSTANDARD", None)
+if ZIP_ZSTANDARD is None:
+    try:
+        import zipfile_zstd  # noqa: F401  (registers method 93 with zipfile)
+        ZIP_ZSTANDARD = 93
+    except ImportError:
+        pass
 
 try:
-    import schedule
-    HAS_SCHEDULE = True
+    import hyperscan
+    HAS_HYPERSCAN = True
 except ImportError:
-    HAS_SCHEDULE = False
-    print("⚠️ 'schedule' not installed. Scheduled backups disabled.")
+    HAS_HYPERSCAN = False
+
+try:
+    # io_uring (Linux): batched open/read submissions instead of one blocking read per thread
+    import liburing
+    HAS_IORING = sys.platform.startswith("linux")
+except ImportError:
+    HAS_IORING = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 try:
     from dotenv import load_dotenv
@@ -90,9 +164,11 @@ class BackupConfig:
     })
     
     # Backup settings
-    compression_level: int = 6  # 1=fast, 9=max compression
+    compression_level: int = 6  # 1=fast, 9=max compression (zstd: up to 22)
+    compression_algo: str = "deflate"  # "deflate" or "zstd" (faster, but not every unzip tool reads it)
     max_concurrent_reads: int = 100  # Parallel file reads
     incremental: bool = True  # Only backup changed files
+    files_cache: bool = True  # Trust unchanged (size, mtime_ns, inode) instead of re-reading
     verify_after_backup: bool = True
     
     # Retention
@@ -138,6 +214,7 @@ CONFIG = BackupConfig()
 CONFIG.source_dir = os.getenv("BACKUP_SOURCE_DIR", "") or find_project_root()
 CONFIG.backup_base_dir = os.getenv("BACKUP_BASE_DIR", "") or r"D:\oneclick_reels_ai"
 CONFIG.compression_level = int(os.getenv("BACKUP_COMPRESSION", "6"))
+CONFIG.compression_algo = os.getenv("BACKUP_COMPRESSION_ALGO", "deflate").lower()
 CONFIG.keep_days = int(os.getenv("BACKUP_KEEP_DAYS", "7"))
 CONFIG.incremental = os.getenv("BACKUP_INCREMENTAL", "true").lower() == "true"
 CONFIG.auto_sync_to_cloud = os.getenv("BACKUP_AUTO_SYNC", "true").lower() == "true"
@@ -168,92 +245,239 @@ logger = logging.getLogger("BackupSystem")
 # 🔐 HASH MANIFEST (Incremental Backup)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+def new_hasher(data: bytes = b"", large: bool = False):
+    """Content hasher: BLAKE3 (SIMD, multi-threaded for large files) or BLAKE2b fallback."""
+    if HAS_BLAKE3:
+        if large:
+            return blake3.blake3(data, max_threads=blake3.blake3.AUTO)
+        return blake3.blake3(data)
+    return hashlib.blake2b(data, digest_size=8)
+
+
+def short_digest(hasher) -> str:
+    """16 hex chars (64 bits) of a new_hasher() digest."""
+    return hasher.hexdigest(length=8) if HAS_BLAKE3 else hasher.hexdigest()
+
+
+HASH_ALGO = "blake3" if HAS_BLAKE3 else "blake2b"
+
+
 class HashManifest:
     """Tracks file hashes for incremental backup."""
     
     MANIFEST_FILE = ".backup_manifest.json"
+    VERSION = 2  # v1 was a flat {path: entry} dict of SHA256 hashes
     
     def __init__(self, backup_dir: str):
         self.manifest_path = os.path.join(backup_dir, self.MANIFEST_FILE)
         self.hashes: Dict[str, dict] = {}
+        self._dirty = False
         self._load()
     
     def _load(self):
         try:
             if os.path.exists(self.manifest_path):
-                with open(self.manifest_path, 'r') as f:
-                    self.hashes = json.load(f)
+                with open(self.manifest_path, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+                # Older manifests (or ones hashed with another algorithm) can't be compared
+                if data.get("version") == self.VERSION and data.get("algo") == HASH_ALGO:
+                    self.hashes = data.get("files", {})
+                else:
+                    logger.info("Manifest format changed, next backup will be full")
         except Exception as e:
             logger.warning(f"Could not load manifest: {e}")
             self.hashes = {}
     
-    def save(self):
+    def stage(self) -> bool:
+        """Write the manifest to a temp file if anything changed: True if staged."""
+        if not self._dirty:
+            return False
         try:
             os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
-            with open(self.manifest_path, 'w') as f:
-                json.dump(self.hashes, f, indent=2)
+            data = {"version": self.VERSION, "algo": HASH_ALGO, "files": self.hashes}
+            # Compact: pretty-printing roughly triples the size of a large manifest
+            if HAS_ORJSON:
+                raw = orjson.dumps(data)
+            else:
+                raw = json.dumps(data, separators=(',', ':')).encode()
+            with open(self.manifest_path + ".tmp", 'wb') as f:
+                f.write(raw)
+            return True
         except Exception as e:
             logger.error(f"Failed to save manifest: {e}")
+            return False
+    
+    def commit(self):
+        """Atomically replace the manifest with the staged one."""
+        try:
+            os.replace(self.manifest_path + ".tmp", self.manifest_path)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Failed to save manifest: {e}")
+    
+    def discard(self):
+        """Drop a staged manifest (the backup it describes was rejected)."""
+        try:
+            os.remove(self.manifest_path + ".tmp")
+        except FileNotFoundError:
+            pass
     
-    def has_changed(self, rel_path: str, size: int, mtime: float) -> bool:
-        if rel_path not in self.hashes:
+    def save(self):
+        """Persist the manifest atomically; a no-op when nothing changed."""
+        if self.stage():
+            self.commit()
+    
+    def has_changed(self, rel_path: str, size: int, mtime_ns: int, ino: int) -> bool:
+        """Borg-style files cache: matching (size, mtime_ns, inode) means unchanged."""
+        old = self.hashes.get(rel_path)
+        if old is None:
             return True
-        old = self.hashes[rel_path]
-        return old.get('size') != size or abs(old.get('mtime', 0) - mtime) > 1
+        return old.get('size') != size or old.get('mtime_ns') != mtime_ns or old.get('ino') != ino
     
-    def update(self, rel_path: str, size: int, mtime: float, content_hash: str):
+    def update(self, rel_path: str, size: int, mtime: float, content_hash: str,
+               mtime_ns: int = 0, ino: int = 0, zip_name: str = ""):
         self.hashes[rel_path] = {
             'size': size,
             'mtime': mtime,
+            'mtime_ns': mtime_ns,
+            'ino': ino,
             'hash': content_hash,
+            'zip': zip_name,  # Backup (relative to backup_base_dir) holding this content
             'last_backup': datetime.now().isoformat()
         }
+        self._dirty = True
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 📁 FILE COLLECTION
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def should_exclude(rel_path: str, filename: str) -> bool:
-    """Check if file should be excluded."""
-    parts = Path(rel_path).parts
+def is_glob(pattern: str) -> bool:
+    """Check if an exclusion entry is a wildcard pattern rather than an exact name."""
+    return '*' in pattern or '?' in pattern
+
+
+class GlobMatcher:
+    """Matches a name against every glob pattern in one scan.
     
-    # Excluded directories
-    if any(part in CONFIG.excluded_dirs for part in parts):
-        return True
+    All patterns compile into a single Hyperscan database (a DFA, no
+    backtracking) when hyperscan is installed, else into one alternation
+    regex. Exact names are better served by a frozenset and don't go here.
+    """
     
-    # Excluded files
-    if filename in CONFIG.excluded_files:
+    def __init__(self, patterns):
+        expressions = [
+            "^" + re.escape(p).replace(r"\*", ".*").replace(r"\?", ".") + "$"
+            for p in patterns
+        ]
+        self.database = None
+        self.regex = None
+        if not expressions:
+            return
+        
+        if HAS_HYPERSCAN:
+            try:
+                database = hyperscan.Database()
+                database.compile(
+                    expressions=[e.encode() for e in expressions],
+                    flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_DOTALL] * len(expressions),
+                )
+                self.database = database
+                return
+            except Exception as e:
+                logger.debug(f"Hyperscan compile failed, using re: {e}")
+        self.regex = re.compile("|".join(f"(?:{e})" for e in expressions), re.DOTALL)
+    
+    def match(self, name: str) -> bool:
+        """Check if name matches any of the patterns."""
+        if self.database is not None:
+            matches = []
+            self.database.scan(name.encode('utf-8', 'surrogateescape'),
+                               match_event_handler=lambda *args: matches.append(args[0]))
+            return bool(matches)
+        return self.regex is not None and self.regex.match(name) is not None
+
+
+# Frozen once at startup: O(1) membership for exact names, one matcher for all globs
+EXCLUDED_DIRS = frozenset(d for d in CONFIG.excluded_dirs if not is_glob(d))
+EXCLUDED_DIR_GLOBS = GlobMatcher(d for d in CONFIG.excluded_dirs if is_glob(d))
+EXCLUDED_FILES = frozenset(f for f in CONFIG.excluded_files if not is_glob(f))
+EXCLUDED_FILE_GLOBS = GlobMatcher(f for f in CONFIG.excluded_files if is_glob(f))
+EXCLUDED_EXTENSIONS = frozenset(CONFIG.excluded_extensions)
+
+
+def should_exclude(filename: str) -> bool:
+    """Check if file should be excluded (excluded dirs are pruned by the walk)."""
+    if filename in EXCLUDED_FILES:
         return True
-    
-    # Excluded extensions
-    ext = os.path.splitext(filename)[1].lower()
-    if ext in CONFIG.excluded_extensions:
+    if os.path.splitext(filename)[1].lower() in EXCLUDED_EXTENSIONS:
         return True
-    
-    return False
+    return EXCLUDED_FILE_GLOBS.match(filename)
 
 
-def collect_files() -> List[Tuple[str, str, int, float]]:
-    """Collect all files: (abs_path, rel_path, size, mtime)"""
-    files = []
-    source = Path(CONFIG.source_dir)
+@functools.lru_cache(maxsize=4096)
+def is_excluded_dir(name: str) -> bool:
+    """Check if a directory (and everything below it) should be skipped."""
+    return name in EXCLUDED_DIRS or EXCLUDED_DIR_GLOBS.match(name)
+
+
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def scan_tree(top: str, rel_top: str, files: list, subdirs: Optional[list] = None):
+    """Append every file under top to files (iterative os.scandir walk).
     
-    for file_path in source.rglob('*'):
-        if not file_path.is_file():
-            continue
-        
-        rel_path = str(file_path.relative_to(source))
-        filename = file_path.name
-        
-        if should_exclude(rel_path, filename):
-            continue
-        
+    With subdirs given, only top itself is listed and its directories are
+    appended to subdirs instead of being descended into.
+    """
+    stack = [(top, rel_top)]
+    
+    while stack:
+        dir_path, rel_dir = stack.pop()
         try:
-            stat = file_path.stat()
-            files.append((str(file_path), rel_path, stat.st_size, stat.st_mtime))
-        except (OSError, PermissionError) as e:
-            logger.warning(f"Cannot access {rel_path}: {e}")
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not is_excluded_dir(entry.name):
+                                (subdirs if subdirs is not None else stack).append((entry.path, rel_path))
+                            continue
+                        if not entry.is_file() or should_exclude(entry.name):
+                            continue
+                        
+                        stat = entry.stat()
+                        files.append((entry.path, rel_path, stat.st_size, stat.st_mtime,
+                                      stat.st_mtime_ns, stat.st_ino))
+                    except OSError as e:
+                        logger.warning(f"Cannot access {rel_path}: {e}")
+        except OSError as e:
+            logger.warning(f"Cannot scan {rel_dir or dir_path}: {e}")
+
+
+def collect_files() -> List[Tuple[str, str, int, float, int, int]]:
+    """Collect all files: (abs_path, rel_path, size, mtime, mtime_ns, ino)
+    
+    DirEntry caches the file type (and on Windows the stat) from the
+    directory listing, and excluded directories are pruned before
+    descending. Each top-level subtree is walked in its own thread:
+    scandir/stat release the GIL, so on a cold cache many metadata
+    lookups are in flight at once instead of one after another.
+    """
+    files = []
+    subdirs = []
+    scan_tree(CONFIG.source_dir, "", files, subdirs)
+    
+    if subdirs:
+        def scan_subtree(subdir):
+            subtree_files = []
+            scan_tree(subdir[0], subdir[1], subtree_files)
+            return subtree_files
+        
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(subdirs))) as pool:
+            for subtree_files in pool.map(scan_subtree, subdirs):
+                files.extend(subtree_files)
     
     return files
 
@@ -262,105 +486,534 @@ def collect_files() -> List[Tuple[str, str, int, float]]:
 # ⚡ PARALLEL ASYNC FILE READING
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-async def read_file_async(file_path: str, semaphore: asyncio.Semaphore) -> Tuple[str, Optional[bytes], str]:
-    """Read file and compute hash concurrently."""
-    async with semaphore:
-        try:
-            if HAS_AIOFILES:
-                async with aiofiles.open(file_path, 'rb') as f:
-                    data = await f.read()
-            else:
-                # Fallback to sync read in executor
-                loop = asyncio.get_event_loop()
-                with open(file_path, 'rb') as f:
-                    data = await loop.run_in_executor(None, f.read)
-            
-            content_hash = hashlib.sha256(data).hexdigest()[:16]
-            return (file_path, data, content_hash)
-        except Exception as e:
-            logger.error(f"Failed to read {file_path}: {e}")
-            return (file_path, None, "")
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1 MiB read/write chunks
+PREFETCH_MAX_SIZE = 8 * 1024 * 1024  # Larger files are streamed from disk by the ZIP writer
+ZIP64_THRESHOLD = 2 ** 31 - 1
+WRITE_BUFFER_SIZE = 1024 * 1024  # ZIP output buffer (default 8 KiB means many tiny write() calls)
+PARALLEL_MIN_SIZE = 64 * 1024  # Smaller files aren't worth the trip to a worker process
 
+# Already-compressed formats: deflating them burns CPU for ~0% gain, so they are stored as-is
+STORE_EXTENSIONS = frozenset({
+    '.mp4', '.mov', '.mkv', '.webm', '.mp3', '.aac', '.opus', '.m4a',
+    '.jpg', '.jpeg', '.png', '.webp', '.gif',
+    '.zip', '.gz', '.xz', '.zst', '.7z', '.br', '.bz2',
+})
 
-async def read_all_files_parallel(files: List[Tuple[str, str, int, float]]) -> Dict[str, Tuple[bytes, str]]:
-    """Read ALL files concurrently using asyncio.gather."""
-    semaphore = asyncio.Semaphore(CONFIG.max_concurrent_reads)
-    
-    # Create tasks for ALL files at once
-    tasks = [read_file_async(abs_path, semaphore) for abs_path, _, _, _ in files]
+
+def is_precompressed(rel_path: str) -> bool:
+    """Check if a file is already compressed and should be stored, not deflated."""
+    return os.path.splitext(rel_path)[1].lower() in STORE_EXTENSIONS
+
+
+# Reads and hashes release the GIL, so these threads run truly in parallel
+IO_POOL = ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2, thread_name_prefix="backup-io")
+
+
+def read_and_hash(file_path: str) -> Tuple[str, Optional[bytes], str]:
+    """Read a file and hash it in one blocking call (run on IO_POOL)."""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        return (file_path, data, short_digest(new_hasher(data)))
+    except Exception as e:
+        logger.error(f"Failed to read {file_path}: {e}")
+        return (file_path, None, "")
+
+
+RING_BATCH = 256  # Files opened/read per io_uring submission batch
+RING_WORKERS = 4  # Batches in flight, so reading overlaps hashing and compression
+
+
+def ring_read_and_hash(paths: List[str], sizes: List[int]) -> List[Tuple[str, Optional[bytes], str]]:
+    """Read and hash a batch of files through one io_uring (run on IO_POOL).
     
-    # Execute ALL reads in parallel
-    logger.info(f"⚡ Reading {len(tasks)} files in parallel...")
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    All opens are submitted in one batch, then all reads, so the storage
+    sees RING_BATCH requests at once instead of one per pool thread.
+    Falls back to read_and_hash if the kernel refuses io_uring.
+    """
+    global HAS_IORING
+    ring, cqe = liburing.Ring(), liburing.Cqe()
+    try:
+        liburing.io_uring_queue_init(RING_BATCH, ring)
+    except OSError as e:
+        # e.g. disabled by sysctl or a container's seccomp profile
+        logger.warning(f"⚠️ io_uring unavailable, using thread reads: {e}")
+        HAS_IORING = False
+        return [read_and_hash(path) for path in paths]
+    
+    fds: Dict[int, int] = {}
+    buffers: Dict[int, bytearray] = {}
+    results: Dict[int, Tuple[str, Optional[bytes], str]] = {}
+    
+    def submit_and_reap(count: int, on_complete):
+        liburing.io_uring_submit(ring)
+        for _ in range(count):
+            liburing.io_uring_wait_cqe(ring, cqe)
+            entry = cqe[0]
+            index = entry.user_data
+            try:
+                on_complete(index, entry.res)
+            except OSError as e:
+                logger.error(f"Failed to read {paths[index]}: {e}")
+                results[index] = (paths[index], None, "")
+            finally:
+                liburing.io_uring_cqe_seen(ring, entry)
+    
+    def opened(index, fd):
+        fds[index] = fd
+    
+    def read(index, nbytes):
+        data = buffers[index]
+        if nbytes != len(data):
+            # Short read (or the file shrank since the scan): take the plain path
+            results[index] = read_and_hash(paths[index])
+            return
+        results[index] = (paths[index], data, short_digest(new_hasher(data)))
     
-    # Map results
-    file_data = {}
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            logger.error(f"Read error: {result}")
-            continue
-        abs_path, content, content_hash = result
-        if content is not None:
-            rel_path = files[i][1]
-            file_data[rel_path] = (content, content_hash)
+    try:
+        for index, path in enumerate(paths):
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_open(sqe, path, os.O_RDONLY)
+            sqe.user_data = index
+        submit_and_reap(len(paths), opened)
+        
+        for index, fd in fds.items():
+            buffers[index] = bytearray(sizes[index])
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_read(sqe, fd, buffers[index], 0)
+            sqe.user_data = index
+        submit_and_reap(len(fds), read)
+    finally:
+        for fd in fds.values():
+            os.close(fd)
+        liburing.io_uring_queue_exit(ring)
     
-    return file_data
+    return [results[index] for index in range(len(paths))]
+
+
+async def read_file_async(file_path: str) -> Tuple[str, Optional[bytes], str]:
+    """Read file and compute hash concurrently."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(IO_POOL, read_and_hash, file_path)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 🗜️ ZIP CREATION (ATOMIC + VERIFIED)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def create_zip_atomic(
+def zip_compression() -> Tuple[int, int, str]:
+    """Get (compression method, level, label) for CONFIG.compression_algo."""
+    level = CONFIG.compression_level
+    if CONFIG.compression_algo == "zstd":
+        if ZIP_ZSTANDARD is not None:
+            return ZIP_ZSTANDARD, min(max(level, 1), 22), "zstd"
+        logger.warning("⚠️ zstd needs Python 3.14+ or 'zipfile-zstd'. Using deflate.")
+        CONFIG.compression_algo = "deflate"
+    if HAS_ISAL:
+        # ISA-L only has levels 0-3
+        return zipfile.ZIP_DEFLATED, min(3, level // 3), "deflate/isa-l"
+    if HAS_ZLIB_NG:
+        return zipfile.ZIP_DEFLATED, level, "deflate/zlib-ng"
+    return zipfile.ZIP_DEFLATED, level, "deflate"
+
+
+def new_zip_info(rel_path: str, compress_type: int) -> zipfile.ZipInfo:
+    """Create a ZipInfo with the same timestamp and mode ZipFile.open(name, 'w') uses."""
+    info = zipfile.ZipInfo(rel_path, time.localtime(time.time())[:6])
+    info.compress_type = compress_type
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def write_zip_entry(
+    zipf: zipfile.ZipFile,
+    rel_path: str,
+    abs_path: str,
+    size: int,
+    data: Optional[bytes] = None,
+    content_hash: str = ""
+) -> Tuple[int, str]:
+    """Write one file into the open ZIP: (bytes_written, content_hash).
+    
+    Prefetched data is written as-is. Otherwise the file is memory-mapped:
+    the hasher sees the whole mapping in one call (letting BLAKE3 use all
+    cores) and the compressor reads slices of it, with no bytes copy and
+    pages the OS can evict under pressure. Files that can't be mapped are
+    streamed in chunks instead.
+    """
+    if is_precompressed(rel_path):
+        target = new_zip_info(rel_path, zipfile.ZIP_STORED)
+    else:
+        target = rel_path
+    
+    with zipf.open(target, 'w', force_zip64=size > ZIP64_THRESHOLD) as dest:
+        if data is not None:
+            dest.write(data)
+            return len(data), content_hash
+        
+        digest = new_hasher(large=True)
+        written = 0
+        with open(abs_path, 'rb') as src:
+            try:
+                mapped = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mapped = None
+            
+            if mapped is not None:
+                with mapped, memoryview(mapped) as view:
+                    digest.update(view)
+                    for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+                        dest.write(view[offset:offset + STREAM_CHUNK_SIZE])
+                    written = len(view)
+                return written, short_digest(digest)
+            
+            for chunk in iter(lambda: src.read(STREAM_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                dest.write(chunk)
+                written += len(chunk)
+        return written, short_digest(digest)
+
+
+def compress_entry(data: bytes, level: int) -> Tuple[bytes, int]:
+    """Raw-deflate one file body in a worker process: (compressed, crc32)."""
+    zlib = zipfile.zlib  # ISA-L or zlib-ng when installed
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    crc = zipfile.crc32(data, 0)
+    return compressor.compress(data) + compressor.flush(), crc
+
+
+def append_raw_entry(zipf: zipfile.ZipFile, info: zipfile.ZipInfo, chunks):
+    """Append an entry whose compressed bytes, CRC and sizes are already known."""
+    dest_fp = zipf.fp
+    info.header_offset = dest_fp.tell()
+    dest_fp.write(info.FileHeader())
+    for chunk in chunks:
+        dest_fp.write(chunk)
+    
+    zipf.filelist.append(info)
+    zipf.NameToInfo[info.filename] = info
+    zipf.start_dir = dest_fp.tell()
+    zipf._didModify = True
+
+
+def write_compressed_entry(zipf: zipfile.ZipFile, rel_path: str, compressed: bytes,
+                           crc: int, size: int) -> int:
+    """Write a body deflated by compress_entry: uncompressed size."""
+    info = new_zip_info(rel_path, zipfile.ZIP_DEFLATED)
+    info.CRC = crc
+    info.compress_size = len(compressed)
+    info.file_size = size
+    append_raw_entry(zipf, info, (compressed,))
+    return size
+
+
+def copy_zip_entry_raw(zipf: zipfile.ZipFile, src_zip: zipfile.ZipFile, rel_path: str) -> int:
+    """Copy an entry's compressed bytes from an older backup: uncompressed size.
+    
+    The stored CRC and sizes are reused, so the file is neither read from
+    the source tree nor decompressed and recompressed.
+    """
+    src_info = src_zip.getinfo(rel_path)
+    info = zipfile.ZipInfo(src_info.filename, src_info.date_time)
+    info.compress_type = src_info.compress_type
+    info.external_attr = src_info.external_attr
+    info.CRC = src_info.CRC
+    info.compress_size = src_info.compress_size
+    info.file_size = src_info.file_size
+    
+    # Skip the source's local header (its name/extra lengths can differ from the central directory)
+    src_fp = src_zip.fp
+    src_fp.seek(src_info.header_offset)
+    fheader = struct.unpack(zipfile.structFileHeader, src_fp.read(zipfile.sizeFileHeader))
+    name_length, extra_length = fheader[10], fheader[11]
+    src_fp.seek(name_length + extra_length, os.SEEK_CUR)
+    
+    def chunks():
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = src_fp.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise EOFError(f"Truncated entry {rel_path} in {src_zip.filename}")
+            yield chunk
+            remaining -= len(chunk)
+    
+    append_raw_entry(zipf, info, chunks())
+    return info.file_size
+
+
+async def create_zip_atomic(
     zip_path: str,
-    file_data: Dict[str, Tuple[bytes, str]],
-    manifest: HashManifest,
-    files_meta: Dict[str, Tuple[int, float]]
-) -> Tuple[bool, int, int]:
-    """Create ZIP atomically: write to temp, rename on success."""
+    files: List[Tuple[str, str, int, float, int, int]],
+    manifest: HashManifest
+) -> Tuple[bool, int, int, int]:
+    """Read files in parallel and stream them into a ZIP atomically (temp file → rename).
+    
+    max_concurrent_reads workers prefetch small files into a bounded queue; a single
+    consumer owns the ZipFile and writes entries in an executor thread, so
+    at most 2 × max_concurrent_reads small files (queued plus in-hand) are
+    held in memory at once.
+    Files the manifest's files cache says are unchanged are copied raw from
+    the backup that already holds them; in incremental mode, prefetched
+    files whose hash matches the manifest are left out. Prefetched files
+    over PARALLEL_MIN_SIZE are deflated across cores in a process pool
+    before they reach the consumer.
+    
+    Returns:
+        (success, files_added, bytes_written, files_unchanged)
+    """
     temp_path = zip_path + ".tmp"
+    zip_name = os.path.relpath(zip_path, CONFIG.backup_base_dir)
     files_added = 0
+    files_unchanged = 0
     bytes_written = 0
     
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=CONFIG.max_concurrent_reads)
+    source_zips: Dict[str, zipfile.ZipFile] = {}
+    compression, level, _ = zip_compression()
+    pool: Optional[ProcessPoolExecutor] = None
+    parallel = True
+    
+    def cached_source(entry) -> Optional[str]:
+        """Get the older backup holding this unchanged file, if any."""
+        _, rel_path, size, _, mtime_ns, ino = entry
+        if not CONFIG.files_cache or manifest.has_changed(rel_path, size, mtime_ns, ino):
+            return None
+        old_zip = manifest.hashes[rel_path].get('zip')
+        if not old_zip:
+            return None
+        old_path = os.path.join(CONFIG.backup_base_dir, old_zip)
+        return old_path if os.path.exists(old_path) else None
+    
+    async def compress(data: bytes) -> Optional[Tuple[bytes, int]]:
+        nonlocal pool, parallel
+        if not parallel:
+            return None
+        try:
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+            return await loop.run_in_executor(pool, compress_entry, data, level)
+        except Exception as e:
+            # No usable worker processes (or unpicklable worker): the consumer compresses in-thread
+            if parallel:
+                logger.warning(f"⚠️ Parallel compression unavailable, compressing in-thread: {e}")
+                parallel = False
+            return None
+    
+    async def produce(entry):
+        if await route(entry):
+            return
+        _, data, content_hash = await read_file_async(entry[0])
+        await emit(entry, data, content_hash)
+    
+    async def route(entry) -> bool:
+        """Queue entries that don't need prefetching: True if handled."""
+        rel_path, size = entry[1], entry[2]
+        source_zip = cached_source(entry)
+        if source_zip is not None:
+            await queue.put((entry, None, manifest.hashes[rel_path]['hash'], source_zip, None))
+            return True
+        if size > PREFETCH_MAX_SIZE:
+            await queue.put((entry, None, "", None, None))
+            return True
+        return False
+    
+    async def emit(entry, data: Optional[bytes], content_hash: str):
+        """Queue a prefetched file, compressing it first when worthwhile."""
+        nonlocal files_unchanged
+        _, rel_path, size, mtime, mtime_ns, ino = entry
+        if data is None:
+            return
+        
+        # Touched but identical: only refresh the files cache
+        old = manifest.hashes.get(rel_path)
+        if (CONFIG.incremental and old is not None
+                and old.get('hash') == content_hash and old.get('zip')):
+            manifest.update(rel_path, size, mtime, content_hash, mtime_ns, ino, old['zip'])
+            files_unchanged += 1
+            progress.update(1)
+            return
+        
+        compressed = None
+        if (compression == zipfile.ZIP_DEFLATED and len(data) >= PARALLEL_MIN_SIZE
+                and not is_precompressed(rel_path)):
+            compressed = await compress(data)
+        if compressed is not None:
+            await queue.put((entry, None, content_hash, None, compressed + (len(data),)))
+        else:
+            await queue.put((entry, data, content_hash, None, None))
+    
+    def copy_or_write(entry, data, content_hash, source_zip, compressed) -> Tuple[int, str]:
+        abs_path, rel_path, size = entry[:3]
+        if compressed is not None:
+            return write_compressed_entry(zipf, rel_path, *compressed), content_hash
+        if source_zip is not None:
+            try:
+                src = source_zips.get(source_zip)
+                if src is None:
+                    src = source_zips[source_zip] = zipfile.ZipFile(source_zip, 'r')
+                return copy_zip_entry_raw(zipf, src, rel_path), content_hash
+            except (KeyError, OSError, zipfile.BadZipFile, struct.error) as e:
+                logger.warning(f"Cannot reuse {rel_path} from {source_zip}, re-reading: {e}")
+        return write_zip_entry(zipf, rel_path, abs_path, size, data, content_hash)
+    
+    async def produce_all():
+        # A fixed set of workers share one iterator: concurrency is bounded by
+        # worker count, not one Task per file
+        pending = iter(files)
+        
+        async def worker():
+            for entry in pending:
+                await produce(entry)
+        
+        async def ring_worker():
+            while batch := list(itertools.islice(pending, RING_BATCH)):
+                to_read = [entry for entry in batch if not await route(entry)]
+                if not to_read:
+                    continue
+                results = await loop.run_in_executor(
+                    IO_POOL, ring_read_and_hash, [e[0] for e in to_read], [e[2] for e in to_read]
+                )
+                for entry, (_, data, content_hash) in zip(to_read, results):
+                    await emit(entry, data, content_hash)
+        
+        try:
+            if HAS_IORING:
+                await asyncio.gather(*(ring_worker() for _ in range(RING_WORKERS)))
+            else:
+                workers = min(CONFIG.max_concurrent_reads, len(files))
+                await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            await queue.put(None)
+    
+    producer = None
     try:
-        with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED, 
-                            compresslevel=CONFIG.compression_level) as zipf:
-            for rel_path, (content, content_hash) in tqdm(file_data.items(), 
-                                                          desc="📦 Compressing", unit="file"):
-                try:
-                    zipf.writestr(rel_path, content)
-                    files_added += 1
-                    bytes_written += len(content)
-                    
-                    # Update manifest
-                    size, mtime = files_meta.get(rel_path, (len(content), time.time()))
-                    manifest.update(rel_path, size, mtime, content_hash)
-                except Exception as e:
-                    logger.error(f"Failed to add {rel_path}: {e}")
+        with open(temp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as out:
+            with zipfile.ZipFile(out, 'w', compression, compresslevel=level) as zipf:
+                progress = tqdm(total=len(files), desc="📦 Compressing", unit="file")
+                producer = asyncio.ensure_future(produce_all())
+                
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    entry = item[0]
+                    _, rel_path, size, mtime, mtime_ns, ino = entry
+                
+                    try:
+                        written, content_hash = await loop.run_in_executor(IO_POOL, copy_or_write, *item)
+                        files_added += 1
+                        bytes_written += written
+                
+                        # Update manifest
+                        manifest.update(rel_path, size, mtime, content_hash, mtime_ns, ino, zip_name)
+                    except Exception as e:
+                        logger.error(f"Failed to add {rel_path}: {e}")
+                    progress.update(1)
+                
+                progress.close()
+                await producer
+            
+            # Durable before the rename publishes it
+            out.flush()
+            os.fsync(out.fileno())
         
         # Atomic rename
-        if os.path.exists(zip_path):
-            os.remove(zip_path)
-        os.rename(temp_path, zip_path)
+        os.replace(temp_path, zip_path)
         
-        return True, files_added, bytes_written
+        return True, files_added, bytes_written, files_unchanged
     
     except Exception as e:
         logger.error(f"ZIP creation failed: {e}")
+        if producer is not None and not producer.done():
+            producer.cancel()
         if os.path.exists(temp_path):
             os.remove(temp_path)
-        return False, 0, 0
+        return False, 0, 0, 0
+    
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        for src in source_zips.values():
+            src.close()
+
+
+PARALLEL_VERIFY_MIN_SIZE = 32 * 1024 * 1024  # Below this, worker start-up costs more than it saves
+# CRC mismatches plus the decompression errors of the active zlib (stdlib, ISA-L or zlib-ng)
+ZIP_READ_ERRORS = (zipfile.BadZipFile, zipfile.zlib.error, EOFError)
+
+
+def fadvise(fd: int, advice: str):
+    """Pass a POSIX_FADV_* hint for the whole file where supported."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, f"POSIX_FADV_{advice}"))
+        except OSError:
+            pass
+
+
+def verify_entries(zip_path: str, names: List[str]) -> List[str]:
+    """Stream and CRC-check entries in a worker: every bad name with its error."""
+    bad = []
+    with open(zip_path, 'rb') as fh:
+        # Read-ahead for the streaming pass; drop the pages once checked
+        fadvise(fh.fileno(), "SEQUENTIAL")
+        try:
+            with zipfile.ZipFile(fh, 'r') as zipf:
+                for name in names:
+                    try:
+                        # ZipExtFile checks the CRC once the entry is fully read
+                        with zipf.open(name) as f:
+                            while f.read(STREAM_CHUNK_SIZE):
+                                pass
+                    except ZIP_READ_ERRORS as e:
+                        bad.append(f"{name} ({e})")
+        finally:
+            fadvise(fh.fileno(), "DONTNEED")
+    return bad
 
 
 def verify_zip(zip_path: str) -> bool:
-    """Verify ZIP integrity."""
+    """Verify ZIP integrity.
+    
+    Entries are split into size-balanced batches that are decompressed and
+    CRC-checked concurrently, each worker with its own ZipFile handle.
+    zlib releases the GIL while inflating and checksumming, so threads are
+    used for smaller archives; large ones go to worker processes. Every
+    corrupted entry is logged, not just the first.
+    """
     try:
         with zipfile.ZipFile(zip_path, 'r') as zipf:
-            bad_file = zipf.testzip()
-            if bad_file:
-                logger.error(f"Corrupted file in ZIP: {bad_file}")
-                return False
-        return True
+            infos = zipf.infolist()
+        
+        workers = min(os.cpu_count() or 1, len(infos))
+        total = sum(info.file_size for info in infos)
+        if workers > 1:
+            # Largest first into the lightest batch
+            batches = [[] for _ in range(workers)]
+            loads = [0] * workers
+            for info in sorted(infos, key=lambda i: i.file_size, reverse=True):
+                i = loads.index(min(loads))
+                batches[i].append(info.filename)
+                loads[i] += info.file_size
+            
+            results = None
+            if total >= PARALLEL_VERIFY_MIN_SIZE:
+                try:
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        results = list(pool.map(verify_entries, [zip_path] * workers, batches))
+                except Exception as e:
+                    logger.warning(f"⚠️ Process verify unavailable, using threads: {e}")
+            if results is None:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(verify_entries, [zip_path] * workers, batches))
+        else:
+            results = [verify_entries(zip_path, [info.filename for info in infos])]
+        
+        bad = [name for batch in results for name in batch]
+        for name in bad:
+            logger.error(f"Corrupted file in ZIP: {name}")
+        return not bad
     except Exception as e:
         logger.error(f"ZIP verification failed: {e}")
         return False
@@ -391,19 +1044,19 @@ async def backup_project_async() -> bool:
     # Collect files
     logger.info("📂 Scanning files...")
     all_files = collect_files()
-    total_size = sum(size for _, _, size, _ in all_files)
+    total_size = sum(entry[2] for entry in all_files)
     logger.info(f"   Found {len(all_files)} files ({total_size / 1024 / 1024:.1f} MB)")
     
     # Incremental check
     manifest = HashManifest(CONFIG.backup_base_dir)
     files_to_backup = all_files
     
-    if CONFIG.incremental and manifest.hashes:
+    if CONFIG.incremental and CONFIG.files_cache and manifest.hashes:
         logger.info("🔍 Incremental mode: checking for changes...")
-        changed = []
-        for abs_path, rel_path, size, mtime in all_files:
-            if manifest.has_changed(rel_path, size, mtime):
-                changed.append((abs_path, rel_path, size, mtime))
+        changed = [
+            entry for entry in all_files
+            if manifest.has_changed(entry[1], entry[2], entry[4], entry[5])
+        ]
         
         if len(changed) < len(all_files):
             logger.info(f"   {len(changed)}/{len(all_files)} files changed")
@@ -413,39 +1066,51 @@ async def backup_project_async() -> bool:
         logger.info("✅ No changes detected. Skipping backup.")
         return True
     
-    # Build metadata
-    files_meta = {rel_path: (size, mtime) for _, rel_path, size, mtime in files_to_backup}
-    
-    # ⚡ PARALLEL READ - THE KEY DIFFERENCE
-    read_start = time.time()
-    file_data = await read_all_files_parallel(files_to_backup)
-    read_time = time.time() - read_start
-    logger.info(f"   Read {len(file_data)} files in {read_time:.2f}s")
-    
-    if not file_data:
-        logger.error("❌ No files to backup!")
-        return False
-    
-    # Create ZIP
-    logger.info(f"🗜️ Creating ZIP (level {CONFIG.compression_level})...")
+    # ⚡ PARALLEL READ → STREAMING ZIP
+    _, level, algo = zip_compression()
+    logger.info(f"🗜️ Creating ZIP ({algo} level {level})...")
     zip_start = time.time()
-    success, files_added, bytes_written = create_zip_atomic(zip_path, file_data, manifest, files_meta)
+    success, files_added, bytes_written, files_unchanged = await create_zip_atomic(
+        zip_path, files_to_backup, manifest
+    )
     zip_time = time.time() - zip_start
     
     if not success:
         logger.error("❌ Backup FAILED!")
         return False
     
-    # Verify
+    if not files_added and files_unchanged:
+        logger.info("✅ Changed files are identical to the last backup. Skipping backup.")
+        os.remove(zip_path)
+        manifest.save()
+        return True
+    
+    if not files_added:
+        logger.error("❌ No files to backup!")
+        os.remove(zip_path)
+        return False
+    
+    # Verify while the manifest is written out; it only replaces the old one once the ZIP checks out
+    loop = asyncio.get_running_loop()
+    staged = loop.run_in_executor(IO_POOL, manifest.stage)
     if CONFIG.verify_after_backup:
         logger.info("🔍 Verifying ZIP...")
-        if not verify_zip(zip_path):
+        verified = await loop.run_in_executor(None, verify_zip, zip_path)
+        if not verified:
+            await staged
+            manifest.discard()
             logger.error("❌ ZIP verification FAILED!")
             return False
         logger.info("   ✅ ZIP verified")
     
     # Save manifest
-    manifest.save()
+    if await staged:
+        manifest.commit()
+    
+    index = BackupIndex(CONFIG.backup_base_dir)
+    index.record(zip_path, files_added)
+    index.save()
+    invalidate_backup_scan()
     
     # Stats
     zip_size = os.path.getsize(zip_path)
@@ -457,7 +1122,7 @@ async def backup_project_async() -> bool:
     logger.info(f"   📁 Files: {files_added}")
     logger.info(f"   📊 Original: {bytes_written / 1024 / 1024:.1f} MB")
     logger.info(f"   📦 Compressed: {zip_size / 1024 / 1024:.1f} MB ({compression_ratio:.1f}% saved)")
-    logger.info(f"   ⏱️ Time: {total_time:.2f}s (Read: {read_time:.2f}s, ZIP: {zip_time:.2f}s)")
+    logger.info(f"   ⏱️ Time: {total_time:.2f}s (Read + ZIP: {zip_time:.2f}s)")
     logger.info(f"   📍 {zip_path}")
     
     # ☁️ AUTO-SYNC TO CLOUD
@@ -469,6 +1134,26 @@ async def backup_project_async() -> bool:
     return True
 
 
+def copy_backup(src: str, dst: str):
+    """Copy a backup file, in-kernel where possible, keeping its timestamps.
+    
+    On Linux os.copy_file_range never moves the data through userspace and
+    can reflink on Btrfs/XFS; elsewhere (or when it isn't supported for
+    this pair of filesystems) shutil does the copy.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+                while os.copy_file_range(src_fd, dst_fd, 1 << 30):
+                    pass
+            shutil.copystat(src, dst)
+            return
+        except OSError as e:
+            logger.debug(f"copy_file_range unavailable ({e}), falling back to shutil")
+    shutil.copy2(src, dst)
+
+
 def sync_to_cloud(zip_path: str) -> bool:
     """Auto-sync backup to OneDrive folder."""
     try:
@@ -482,7 +1167,7 @@ def sync_to_cloud(zip_path: str) -> bool:
         filename = os.path.basename(zip_path)
         dest_path = os.path.join(CONFIG.cloud_backup_dir, filename)
         
-        shutil.copy2(zip_path, dest_path)
+        copy_backup(zip_path, dest_path)
         logger.info(f"   ☁️ Synced to OneDrive: {filename}")
         return True
     except Exception as e:
@@ -503,6 +1188,84 @@ def backup_project():
 # 🧹 CLEANUP
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+DATE_FOLDER_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def parse_date_folder(name: str) -> Optional[datetime]:
+    """Get the date of a YYYY-MM-DD backup folder (fromisoformat is C, unlike strptime)."""
+    if not DATE_FOLDER_RE.fullmatch(name):
+        return None
+    try:
+        return datetime.fromisoformat(name)
+    except ValueError:
+        return None
+
+
+class BackupIndex:
+    """Sidecar cache of each backup ZIP's entry count.
+    
+    Entries are keyed by path relative to the backup dir and validated
+    against the ZIP's (mtime_ns, size), so listings only open ZIPs that are
+    new or were rewritten.
+    """
+    
+    INDEX_FILE = ".backup_index.json"
+    
+    def __init__(self, backup_dir: str):
+        self.backup_dir = backup_dir
+        self.index_path = os.path.join(backup_dir, self.INDEX_FILE)
+        self.zips: Dict[str, list] = {}  # rel_path -> [mtime_ns, size, file_count]
+        self._dirty = False
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r') as f:
+                    self.zips = json.load(f).get("zips", {})
+        except Exception as e:
+            logger.warning(f"Could not load backup index: {e}")
+    
+    def record(self, zip_path: str, file_count: int):
+        """Remember a ZIP's entry count (e.g. right after writing it)."""
+        stat = os.stat(zip_path)
+        rel_path = os.path.relpath(zip_path, self.backup_dir)
+        self.zips[rel_path] = [stat.st_mtime_ns, stat.st_size, file_count]
+        self._dirty = True
+    
+    def file_count(self, zip_path: str, stat: os.stat_result) -> Optional[int]:
+        """Get a ZIP's entry count, opening it only on a cache miss."""
+        rel_path = os.path.relpath(zip_path, self.backup_dir)
+        cached = self.zips.get(rel_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zf:
+                count = len(zf.infolist())
+        except Exception:
+            return None
+        self.zips[rel_path] = [stat.st_mtime_ns, stat.st_size, count]
+        self._dirty = True
+        return count
+    
+    def forget_folder(self, folder_name: str):
+        """Drop entries for a removed backup folder."""
+        prefix = folder_name + os.sep
+        for rel_path in [r for r in self.zips if r.startswith(prefix)]:
+            del self.zips[rel_path]
+            self._dirty = True
+    
+    def save(self):
+        """Write the index atomically if anything changed."""
+        if not self._dirty:
+            return
+        try:
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"zips": self.zips}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Could not save backup index: {e}")
+
+
 def cleanup_old_backups():
     """Remove old backups based on retention policy."""
     logger.info("🧹 Running cleanup...")
@@ -514,24 +1277,26 @@ def cleanup_old_backups():
     folders = []
     for item in backup_path.iterdir():
         if item.is_dir() and not item.name.startswith('.'):
-            try:
-                folder_date = datetime.strptime(item.name, '%Y-%m-%d')
+            folder_date = parse_date_folder(item.name)
+            if folder_date is not None:
                 folders.append((folder_date, item))
-            except ValueError:
-                continue
     
     folders.sort(key=lambda x: x[0], reverse=True)
     cutoff = datetime.now() - timedelta(days=CONFIG.keep_days)
     
+    index = BackupIndex(CONFIG.backup_base_dir)
     removed = 0
     for i, (folder_date, folder_path) in enumerate(folders):
         if i >= CONFIG.keep_min_backups and folder_date < cutoff:
             try:
                 shutil.rmtree(folder_path)
+                index.forget_folder(folder_path.name)
+                invalidate_backup_scan()
                 logger.info(f"   🗑️ Removed: {folder_path.name}")
                 removed += 1
             except Exception as e:
                 logger.error(f"   Failed: {folder_path}: {e}")
+    index.save()
     
     logger.info(f"   Removed {removed} old backup(s)" if removed else "   Nothing to remove")
 
@@ -540,6 +1305,59 @@ def cleanup_old_backups():
 # 📋 LIST BACKUPS
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+# One scandir pass shared by list/stats/verify/upload: (root, root mtime_ns, [(path, stat)])
+_backup_scan: Optional[Tuple[str, int, List[Tuple[Path, os.stat_result]]]] = None
+
+
+def invalidate_backup_scan():
+    """Forget the cached backup scan after backups are written or removed."""
+    global _backup_scan
+    _backup_scan = None
+
+
+def scan_backups(root: Optional[str] = None) -> List[Tuple[Path, os.stat_result]]:
+    """Get every backup ZIP under root with its stat, newest first.
+    
+    The walk stats each ZIP once and is reused until a backup is written or
+    cleaned up (or the backup root itself changes).
+    """
+    global _backup_scan
+    root = root or CONFIG.backup_base_dir
+    try:
+        root_mtime = os.stat(root).st_mtime_ns
+    except OSError:
+        return []
+    if _backup_scan is not None and _backup_scan[:2] == (root, root_mtime):
+        return _backup_scan[2]
+    
+    found = []
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".zip"):
+                    try:
+                        found.append((Path(entry.path), entry.stat()))
+                    except OSError:
+                        pass
+    
+    found.sort(key=lambda item: item[1].st_mtime, reverse=True)
+    _backup_scan = (root, root_mtime, found)
+    return found
+
+
+def latest_zip(root: str) -> Optional[str]:
+    """Find the newest ZIP under root."""
+    backups = scan_backups(root)
+    return str(backups[0][0]) if backups else None
+
+
 def list_all_backups() -> List[Path]:
     """List all backups with details."""
     backup_path = Path(CONFIG.backup_base_dir)
@@ -547,13 +1365,15 @@ def list_all_backups() -> List[Path]:
         print("⚠️ No backups folder found")
         return []
     
-    all_zips = list(backup_path.rglob("*.zip"))
-    if not all_zips:
+    backups = scan_backups(str(backup_path))
+    if not backups:
         print("⚠️ No backups found")
         return []
     
-    # Sort by modification time (newest first)
-    all_zips.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    # Newest first, stats from the shared scan
+    all_zips = [z for z, _ in backups]
+    stats = dict(backups)
+    index = BackupIndex(CONFIG.backup_base_dir)
     
     print()
     print("━" * 70)
@@ -563,15 +1383,13 @@ def list_all_backups() -> List[Path]:
     print("─" * 70)
     
     for i, zip_path in enumerate(all_zips, 1):
-        stat = zip_path.stat()
+        stat = stats[zip_path]
         size_mb = stat.st_size / 1024 / 1024
         mtime = datetime.fromtimestamp(stat.st_mtime)
         
-        # Count files in ZIP
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as zf:
-                file_count = len(zf.namelist())
-        except:
+        # Count files in ZIP (cached in the backup index)
+        file_count = index.file_count(str(zip_path), stat)
+        if file_count is None:
             file_count = "?"
         
         rel_path = zip_path.relative_to(backup_path)
@@ -580,6 +1398,7 @@ def list_all_backups() -> List[Path]:
     print("─" * 70)
     print(f"Total: {len(all_zips)} backup(s)")
     print()
+    index.save()
     
     return all_zips
 
@@ -663,23 +1482,21 @@ def show_backup_stats():
         print("⚠️ No backups folder found")
         return
     
-    all_zips = list(backup_path.rglob("*.zip"))
-    if not all_zips:
+    backups = scan_backups(str(backup_path))
+    if not backups:
         print("⚠️ No backups found")
         return
+    all_zips = [z for z, _ in backups]
     
-    # Calculate stats
-    total_size = sum(z.stat().st_size for z in all_zips)
-    oldest = min(all_zips, key=lambda p: p.stat().st_mtime)
-    newest = max(all_zips, key=lambda p: p.stat().st_mtime)
-    
-    oldest_time = datetime.fromtimestamp(oldest.stat().st_mtime)
-    newest_time = datetime.fromtimestamp(newest.stat().st_mtime)
+    # Calculate stats (scan is sorted newest first)
+    total_size = sum(st.st_size for _, st in backups)
+    newest_time = datetime.fromtimestamp(backups[0][1].st_mtime)
+    oldest_time = datetime.fromtimestamp(backups[-1][1].st_mtime)
     
     # Count by date
     dates = {}
-    for z in all_zips:
-        date = datetime.fromtimestamp(z.stat().st_mtime).strftime('%Y-%m-%d')
+    for _, st in backups:
+        date = datetime.fromtimestamp(st.st_mtime).strftime('%Y-%m-%d')
         dates[date] = dates.get(date, 0) + 1
     
     print()
@@ -728,16 +1545,16 @@ def get_onedrive_path() -> Optional[str]:
 
 def upload_to_cloud():
     """Upload latest backup to OneDrive."""
-    backup_path = Path(CONFIG.backup_base_dir)
-    all_zips = list(backup_path.rglob("*.zip"))
+    backups = scan_backups()
     
-    if not all_zips:
+    if not backups:
         print("⚠️ No backups found to upload")
         return
     
-    # Get latest backup
-    latest = max(all_zips, key=lambda p: p.stat().st_mtime)
-    latest_size = latest.stat().st_size / 1024 / 1024
+    # Get latest backup (scan is sorted newest first)
+    all_zips = [z for z, _ in backups]
+    latest = all_zips[0]
+    latest_size = backups[0][1].st_size / 1024 / 1024
     
     print()
     print("━" * 50)
@@ -797,7 +1614,7 @@ def upload_to_cloud():
     for zip_file in files_to_upload:
         try:
             dest = os.path.join(onedrive_path, zip_file.name)
-            shutil.copy2(zip_file, dest)
+            copy_backup(str(zip_file), dest)
             print(f"  ✅ {zip_file.name}")
             uploaded += 1
         except Exception as e:
@@ -813,24 +1630,43 @@ def upload_to_cloud():
 # ⏰ SCHEDULER
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def countdown_timer(minutes: int):
-    """Display countdown."""
-    for remaining in range(minutes * 60, 0, -1):
-        mins, secs = divmod(remaining, 60)
-        print(f"\r⏳ Next backup in {mins:02d}:{secs:02d}", end="", flush=True)
-        time.sleep(1)
-    print()
+def seconds_until(clock: str) -> float:
+    """Get seconds from now until the next HH:MM."""
+    hour, minute = map(int, clock.split(":"))
+    now = datetime.now()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+async def backup_loop():
+    """Back up now, then once per interval (one sleep per cycle, no 1 Hz ticking)."""
+    interval = CONFIG.backup_interval_minutes * 60
+    while True:
+        try:
+            await backup_project_async()
+        except Exception as e:
+            logger.error(f"Backup failed: {e}")
+        next_run = datetime.now() + timedelta(seconds=interval)
+        logger.info(f"⏳ Next backup at {next_run:%H:%M:%S}")
+        await asyncio.sleep(interval)
+
+
+async def cleanup_loop():
+    """Run cleanup daily at CONFIG.cleanup_time."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(seconds_until(CONFIG.cleanup_time))
+        await loop.run_in_executor(None, cleanup_old_backups)
+
+
+async def run_scheduled_async():
+    await asyncio.gather(backup_loop(), cleanup_loop())
 
 
 def run_scheduled():
     """Run on schedule."""
-    if not HAS_SCHEDULE:
-        logger.error("'schedule' package required for scheduled backups")
-        return
-    
-    schedule.every(CONFIG.backup_interval_minutes).minutes.do(backup_project)
-    schedule.every().day.at(CONFIG.cleanup_time).do(cleanup_old_backups)
-    
     logger.info("━" * 60)
     logger.info("🏆 WORLD-CLASS BACKUP SYSTEM v2.0")
     logger.info("━" * 60)
@@ -841,12 +1677,8 @@ def run_scheduled():
     logger.info(f"🧹 Keep {CONFIG.keep_days} days (min {CONFIG.keep_min_backups})")
     logger.info("━" * 60)
     
-    backup_project()
-    
     try:
-        while True:
-            schedule.run_pending()
-            countdown_timer(CONFIG.backup_interval_minutes)
+        asyncio.run(run_scheduled_async())
     except KeyboardInterrupt:
         logger.info("\n👋 Stopped by user.")
 
@@ -899,12 +1731,10 @@ def show_interactive_menu():
     elif choice == "5":
         print()
         # Find latest backup
-        backup_path = Path(CONFIG.backup_base_dir)
-        zips = list(backup_path.rglob("*.zip"))
-        if zips:
-            latest = max(zips, key=lambda p: p.stat().st_mtime)
+        latest = latest_zip(CONFIG.backup_base_dir)
+        if latest:
             print(f"🔍 Verifying: {latest}")
-            if verify_zip(str(latest)):
+            if verify_zip(latest):
                 print("✅ Backup is valid!")
             else:
                 print("❌ Backup is corrupted!")
@@ -938,9 +1768,14 @@ if __name__ == "__main__":
     parser.add_argument("--cleanup", action="store_true", help="Run cleanup only")
     parser.add_argument("--verify", type=str, help="Verify a ZIP file")
     parser.add_argument("--full", action="store_true", help="Force full backup")
+    parser.add_argument("--rehash", action="store_true",
+                        help="Ignore the files cache: re-read and re-hash every file")
     parser.add_argument("--menu", action="store_true", help="Show interactive menu")
     args = parser.parse_args()
     
+    if args.rehash:
+        CONFIG.files_cache = False
+    
     # If no args provided, show interactive menu
     if len(sys.argv) == 1:
         show_interactive_menu()
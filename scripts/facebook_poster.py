@@ -6,18 +6,37 @@ Complete automation system with error handling, logging, and analytics.
 
 import os
 import sys
+import json
+import hashlib
 import signal
+import socket
+import selectors
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import random
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 from functools import wraps
-from openai import OpenAI
+from urllib.parse import quote
+from openai import OpenAI, APIConnectionError
 from dotenv import load_dotenv
 import schedule
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 # ==================== CONFIGURATION ====================
 
 # Load from project root config.env
@@ -55,6 +74,21 @@ client = OpenAI(
     timeout=30.0
 )
 
+# ==================== GRAPH API SESSION ====================
+
+# One pooled keep-alive session for every Graph API call; urllib3 retries
+# throttled/5xx responses (honoring Retry-After). POSTs are not retried so a
+# timed-out publish can't be posted twice.
+graph_session = requests.Session()
+graph_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Graph responses are parsed from raw bytes with orjson when available
+json_loads = orjson.loads if HAS_ORJSON else json.loads
+
 # ==================== UTILITY FUNCTIONS ====================
 
 def rate_limit(seconds: int = 5):
@@ -73,8 +107,45 @@ def rate_limit(seconds: int = 5):
         return wrapper
     return decorator
 
-def retry_with_backoff(max_retries: int = 3, base_delay: int = 2):
-    """Decorator for exponential backoff retry logic."""
+def retry_after_seconds(e: Exception) -> Optional[float]:
+    """Get the Retry-After delay from an HTTP 429 error response, if any."""
+    response = getattr(e, "response", None)
+    if response is None or getattr(response, "status_code", None) != 429:
+        return None
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+# Throttled or server-side failures, worth another attempt
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def error_status(e: Exception) -> Optional[int]:
+    """Get the HTTP status behind a requests or OpenAI client error, if any."""
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    return status
+
+def is_transient_error(e: Exception) -> bool:
+    """Check if an error is a network failure or a 429/5xx response."""
+    if isinstance(e, (requests.ConnectionError, requests.Timeout, APIConnectionError,
+                      ConnectionError, TimeoutError)):
+        return True
+    return error_status(e) in TRANSIENT_STATUS_CODES
+
+def is_rate_limited(e: Exception) -> bool:
+    """Check if an error is an HTTP 429 (the request was rejected, not processed)."""
+    return error_status(e) == 429
+
+def retry_with_backoff(max_retries: int = 3, base_delay: int = 2, max_delay: float = 60,
+                       retry_if=is_transient_error):
+    """Decorator for exponential backoff retry logic.
+    
+    Delays are base_delay * 2**attempt (capped at max_delay) plus up to
+    base_delay of random jitter; a 429's Retry-After takes precedence.
+    Errors for which retry_if(e) is false are raised straight away.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -82,53 +153,91 @@ def retry_with_backoff(max_retries: int = 3, base_delay: int = 2):
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
+                    if not retry_if(e):
+                        raise
                     if attempt == max_retries - 1:
                         logger.error(f"[ERROR] All {max_retries} attempts failed: {e}")
                         raise
-                    delay = base_delay ** attempt
-                    logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {delay}s...")
+                    delay = retry_after_seconds(e)
+                    if delay is None:
+                        delay = min(max_delay, base_delay * 2 ** attempt) + random.uniform(0, base_delay)
+                    logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {delay:.1f}s...")
                     time.sleep(delay)
         return wrapper
     return decorator
 
+# Graph batches only read, so throttled/5xx/network failures are safe to repeat
+@retry_with_backoff(max_retries=3)
+def graph_batch(relative_urls: List[str], timeout: int = 10) -> List[tuple]:
+    """Run GET sub-requests in one Graph batch round trip: [(code, body), ...].
+    
+    Raises requests.HTTPError if the batch itself is rejected (e.g. bad token).
+    """
+    batch = [{"method": "GET", "relative_url": url} for url in relative_urls]
+    response = graph_session.post(
+        "https://graph.facebook.com/",
+        data={"batch": json.dumps(batch), "access_token": PAGE_ACCESS_TOKEN},
+        timeout=timeout
+    )
+    response.raise_for_status()
+    
+    results = []
+    for item in json_loads(response.content):
+        item = item or {}  # null when a sub-request timed out
+        results.append((item.get("code"), json_loads(item.get("body") or "{}")))
+    return results
+
 # ==================== TOKEN VALIDATION ====================
 
-def validate_facebook_token() -> bool:
-    """Check if Facebook token is valid and has required permissions."""
+def validate_facebook_token(with_page_stats: bool = False) -> bool:
+    """Check if Facebook token is valid and has required permissions.
+    
+    With with_page_stats, the page stats are fetched and logged in the same
+    batched round trip instead of a separate request.
+    """
     try:
-        url = "https://graph.facebook.com/v20.0/me"
-        params = {"access_token": PAGE_ACCESS_TOKEN}
-        response = requests.get(url, params=params, timeout=10)
+        # /me and /debug_token (and page stats) in one batched round trip
+        relative_urls = [
+            "v20.0/me",
+            f"v20.0/debug_token?input_token={quote(PAGE_ACCESS_TOKEN)}"
+        ]
+        if with_page_stats:
+            relative_urls.append(f"v20.0/{PAGE_ID}?fields={PAGE_FIELDS}")
+        try:
+            (me_code, me), (debug_code, debug), *stats = graph_batch(relative_urls)
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"[ERROR] Invalid token: {e.response.status_code} - {e.response.text}")
+            return False
         
-        if response.status_code == 200:
-            logger.info("[OK] Facebook token is valid")
-            
-            # Check token expiration
-            debug_url = "https://graph.facebook.com/v20.0/debug_token"
-            debug_params = {
-                "input_token": PAGE_ACCESS_TOKEN,
-                "access_token": PAGE_ACCESS_TOKEN
-            }
-            debug_response = requests.get(debug_url, params=debug_params, timeout=10)
+        if me_code != 200:
+            logger.error(f"[ERROR] Invalid token: {me_code} - {me}")
+            return False
+        
+        logger.info("[OK] Facebook token is valid")
+        
+        # Check token expiration
+        if debug_code == 200:
+            data = debug.get("data", {})
+            expires_at = data.get("expires_at", 0)
             
-            if debug_response.status_code == 200:
-                data = debug_response.json().get("data", {})
-                expires_at = data.get("expires_at", 0)
+            if expires_at == 0:
+                logger.info("[OK] Token never expires")
+            else:
+                expiry_date = datetime.fromtimestamp(expires_at)
+                days_left = (expiry_date - datetime.now()).days
+                logger.info(f"Token expires on {expiry_date.strftime('%Y-%m-%d')} ({days_left} days left)")
                 
-                if expires_at == 0:
-                    logger.info("[OK] Token never expires")
-                else:
-                    expiry_date = datetime.fromtimestamp(expires_at)
-                    days_left = (expiry_date - datetime.now()).days
-                    logger.info(f"Token expires on {expiry_date.strftime('%Y-%m-%d')} ({days_left} days left)")
-                    
-                    if days_left < 7:
-                        logger.warning(f"Token expires soon! Renew within {days_left} days.")
-            
-            return True
-        else:
-            logger.error(f"[ERROR] Invalid token: {response.status_code} - {response.text}")
-            return False
+                if days_left < 7:
+                    logger.warning(f"Token expires soon! Renew within {days_left} days.")
+        
+        if stats:
+            stats_code, page_stats = stats[0]
+            if stats_code == 200:
+                log_page_stats(page_stats)
+            else:
+                logger.warning(f"⚠️ Could not fetch page stats: {stats_code}")
+        
+        return True
             
     except Exception as e:
         logger.error(f"[ERROR] Token validation error: {e}")
@@ -136,61 +245,137 @@ def validate_facebook_token() -> bool:
 
 # ==================== CONTENT GENERATION ====================
 
+# The system message never changes, so it's built once
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "You are a professional social media manager for a trading/quantitative finance page "
+        "targeting Indian retail traders and algo developers. "
+        "Create engaging, informative Facebook posts (150-200 words). "
+        "Requirements:\n"
+        "- Conversational tone with strategic emoji use (2-4 max)\n"
+        "- Include 1-2 specific facts/stats with sources when available\n"
+        "- End with engaging CTA (question or call-to-action)\n"
+        "- Reference Indian markets (NSE/BSE) and platforms (Angel One, Zerodha)\n"
+        "- Avoid overhyped language or financial advice\n"
+        "- Add relevant hashtags (3-5 max) at the end"
+    )
+}
+
+POST_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'cache', 'perplexity')
+POST_CACHE_TTL = 6 * 3600  # 6 hours
+
+def post_cache_path(topic: str) -> str:
+    """Get the cache file for a topic, keyed by (model, topic, today)."""
+    key = f"{PERPLEXITY_MODEL}|{topic}|{datetime.now().date().isoformat()}"
+    return os.path.join(POST_CACHE_DIR, hashlib.md5(key.encode()).hexdigest() + ".json")
+
+def get_cached_post(topic: str) -> Optional[str]:
+    """Get previously generated content for a topic if still fresh."""
+    cache_path = post_cache_path(topic)
+    try:
+        if time.time() - os.path.getmtime(cache_path) > POST_CACHE_TTL:
+            return None
+        with open(cache_path, 'rb') as f:
+            return json_loads(f.read())["content"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def prune_post_cache():
+    """Delete cache files past POST_CACHE_TTL (entries are keyed by day, so none are reused)."""
+    cutoff = time.time() - POST_CACHE_TTL
+    try:
+        with os.scandir(POST_CACHE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+def cache_post(topic: str, content: str):
+    """Store generated content for a topic (atomic write), pruning expired entries."""
+    cache_path = post_cache_path(topic)
+    tmp_path = cache_path + ".tmp"
+    try:
+        os.makedirs(POST_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"topic": topic, "content": content}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not cache generated content: {e}")
+    prune_post_cache()
+
 @retry_with_backoff(max_retries=3)
+def request_ai_post(topic: str) -> str:
+    """Ask Perplexity for a post; transient failures are retried, others raised."""
+    response = client.chat.completions.create(
+        model=PERPLEXITY_MODEL,
+        messages=[SYSTEM_MESSAGE, {"role": "user", "content": topic}],
+        temperature=0.7,
+        max_tokens=600
+    )
+    return response.choices[0].message.content.strip()
+
 def generate_ai_post(topic: str) -> str:
-    """Generate engaging post using Perplexity Sonar model."""
+    """Generate engaging post using Perplexity Sonar model.
+    
+    Content is cached on disk per (model, topic, day) for POST_CACHE_TTL, so
+    repeated runs for the same topic skip the API call. Errors aren't cached.
+    """
+    cached = get_cached_post(topic)
+    if cached is not None:
+        logger.info(f"♻️ Using cached content for: {topic}")
+        return cached
+    
     try:
         logger.info(f"🤖 Generating content for: {topic}")
         
-        response = client.chat.completions.create(
-            model=PERPLEXITY_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a professional social media manager for a trading/quantitative finance page "
-                        "targeting Indian retail traders and algo developers. "
-                        "Create engaging, informative Facebook posts (150-200 words). "
-                        "Requirements:\n"
-                        "- Conversational tone with strategic emoji use (2-4 max)\n"
-                        "- Include 1-2 specific facts/stats with sources when available\n"
-                        "- End with engaging CTA (question or call-to-action)\n"
-                        "- Reference Indian markets (NSE/BSE) and platforms (Angel One, Zerodha)\n"
-                        "- Avoid overhyped language or financial advice\n"
-                        "- Add relevant hashtags (3-5 max) at the end"
-                    )
-                },
-                {"role": "user", "content": topic}
-            ],
-            temperature=0.7,
-            max_tokens=600
-        )
-        
-        content = response.choices[0].message.content.strip()
+        content = request_ai_post(topic)
         logger.info(f"✅ Generated {len(content)} characters")
+        cache_post(topic, content)
         return content
         
     except Exception as e:
         logger.error(f"❌ Content generation failed: {e}")
         return f"[Generation Error: {str(e)}]"
 
+# Forbidden terms (customize based on your needs)
+FORBIDDEN_TERMS = [
+    "guaranteed returns", "risk-free", "get rich quick",
+    "buy now", "pump", "dump", "insider tip"
+]
+
+# One Aho-Corasick automaton finds any forbidden term in a single pass
+if HAS_AHOCORASICK:
+    FORBIDDEN_AUTOMATON = ahocorasick.Automaton()
+    for term in FORBIDDEN_TERMS:
+        FORBIDDEN_AUTOMATON.add_word(term, term)
+    FORBIDDEN_AUTOMATON.make_automaton()
+
+def find_forbidden_term(content_lower: str) -> Optional[str]:
+    """Get the first forbidden term found in already-lowercased content."""
+    if HAS_AHOCORASICK:
+        for _, term in FORBIDDEN_AUTOMATON.iter(content_lower):
+            return term
+        return None
+    
+    for term in FORBIDDEN_TERMS:
+        if term in content_lower:
+            return term
+    return None
+
 def moderate_content(content: str) -> tuple[bool, str]:
     """Basic content moderation to avoid policy violations."""
     if not ENABLE_MODERATION:
         return True, "Moderation disabled"
     
-    # Forbidden terms (customize based on your needs)
-    forbidden_terms = [
-        "guaranteed returns", "risk-free", "get rich quick",
-        "buy now", "pump", "dump", "insider tip"
-    ]
-    
-    content_lower = content.lower()
-    
-    for term in forbidden_terms:
-        if term in content_lower:
-            logger.warning(f"⚠️ Content flagged: contains '{term}'")
-            return False, f"Contains forbidden term: {term}"
+    term = find_forbidden_term(content.lower())
+    if term is not None:
+        logger.warning(f"⚠️ Content flagged: contains '{term}'")
+        return False, f"Contains forbidden term: {term}"
     
     # Check length
     if len(content) < 50:
@@ -204,8 +389,10 @@ def moderate_content(content: str) -> tuple[bool, str]:
 
 # ==================== FACEBOOK POSTING ====================
 
+# A 429 means Graph rejected the post, so it is safe to send again once
+# Retry-After has passed; 5xx/timeouts are not retried (it may have gone out)
 @rate_limit(seconds=5)
-@retry_with_backoff(max_retries=3)
+@retry_with_backoff(max_retries=3, retry_if=is_rate_limited)
 def post_to_facebook(message: str, image_url: Optional[str] = None) -> Optional[Dict]:
     """Post message to Facebook Page with error handling."""
     try:
@@ -224,10 +411,10 @@ def post_to_facebook(message: str, image_url: Optional[str] = None) -> Optional[
         if image_url:
             payload["link"] = image_url
         
-        response = requests.post(url, data=payload, timeout=15)
+        response = graph_session.post(url, data=payload, timeout=15)
         response.raise_for_status()
         
-        post_data = response.json()
+        post_data = json_loads(response.content)
         post_id = post_data.get('id')
         
         logger.info(f"✅ Post published successfully: {post_id}")
@@ -247,19 +434,28 @@ def post_to_facebook(message: str, image_url: Optional[str] = None) -> Optional[
 
 # ==================== ANALYTICS ====================
 
+POST_METRICS = "post_impressions,post_engaged_users,post_clicks"
+PAGE_FIELDS = "name,fan_count,followers_count,talking_about_count"
+
+def log_page_stats(stats: Dict):
+    """Log a one-line page summary."""
+    logger.info(f"📈 Page Stats: {stats.get('name')} - "
+               f"{stats.get('fan_count', 0)} likes, "
+               f"{stats.get('followers_count', 0)} followers")
+
 def get_post_insights(post_id: str) -> Optional[Dict]:
     """Fetch engagement metrics for a post."""
     try:
         url = f"https://graph.facebook.com/v20.0/{post_id}/insights"
         params = {
-            "metric": "post_impressions,post_engaged_users,post_clicks",
+            "metric": POST_METRICS,
             "access_token": PAGE_ACCESS_TOKEN
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = graph_session.get(url, params=params, timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             logger.info(f"📊 Insights for {post_id}: {data}")
             return data
         else:
@@ -275,17 +471,15 @@ def get_page_stats() -> Optional[Dict]:
     try:
         url = f"https://graph.facebook.com/v20.0/{PAGE_ID}"
         params = {
-            "fields": "name,fan_count,followers_count,talking_about_count",
+            "fields": PAGE_FIELDS,
             "access_token": PAGE_ACCESS_TOKEN
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = graph_session.get(url, params=params, timeout=10)
         
         if response.status_code == 200:
-            stats = response.json()
-            logger.info(f"📈 Page Stats: {stats.get('name')} - "
-                       f"{stats.get('fan_count', 0)} likes, "
-                       f"{stats.get('followers_count', 0)} followers")
+            stats = json_loads(response.content)
+            log_page_stats(stats)
             return stats
         else:
             logger.warning(f"⚠️ Could not fetch page stats: {response.status_code}")
@@ -295,12 +489,54 @@ def get_page_stats() -> Optional[Dict]:
         logger.error(f"❌ Error fetching page stats: {e}")
         return None
 
+def fetch_post_and_page_metrics(post_id: str) -> tuple:
+    """Fetch a post's insights and the page stats in one batched round trip.
+    
+    Returns:
+        (insights, page stats), either None if unavailable
+    """
+    try:
+        (insights_code, insights), (stats_code, stats) = graph_batch([
+            f"v20.0/{post_id}/insights?metric={POST_METRICS}",
+            f"v20.0/{PAGE_ID}?fields={PAGE_FIELDS}"
+        ])
+    except Exception as e:
+        logger.error(f"❌ Error fetching metrics: {e}")
+        return None, None
+    
+    if insights_code == 200:
+        logger.info(f"📊 Insights for {post_id}: {insights}")
+    else:
+        logger.warning(f"⚠️ Could not fetch insights: {insights_code}")
+        insights = None
+    
+    if stats_code == 200:
+        log_page_stats(stats)
+    else:
+        logger.warning(f"⚠️ Could not fetch page stats: {stats_code}")
+        stats = None
+    
+    return insights, stats
+
 # ==================== TOPIC MANAGEMENT ====================
 
+class TemplateFields(dict):
+    """Format fields that leave unknown placeholders as-is."""
+    
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+TOPIC_STATE_FILE = os.path.join(os.path.dirname(__file__), '..', 'cache', 'facebook_topics.json')
+
 class TopicManager:
-    """Manages post topics with rotation and tracking."""
+    """Manages post topics with rotation and tracking.
+    
+    The rotation (topic order and unused count) is saved to state_file after
+    every pick, so a restart carries on the same rotation.
+    """
     
-    def __init__(self):
+    def __init__(self, state_file: str = TOPIC_STATE_FILE):
+        self.state_file = state_file
         self.topics = [
             "latest NSE options trading strategies for {month}",
             "Angel One API updates and new features for algo traders",
@@ -313,27 +549,58 @@ class TopicManager:
             "statistical arbitrage opportunities in NSE stocks",
             "automated trading system architecture best practices"
         ]
-        self.used_topics = []
+        # Only templates with date placeholders need formatting
+        self.templated = {t for t in self.topics if "{month}" in t or "{date}" in t}
+        # Topics in self.topics[:self.unused] haven't been used this rotation
+        self.unused = len(self.topics)
+        self._load()
+    
+    def _load(self):
+        """Restore the saved rotation if it matches the current topic list."""
+        try:
+            with open(self.state_file, 'rb') as f:
+                state = json_loads(f.read())
+            topics, unused = state["topics"], int(state["unused"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        
+        if sorted(topics) == sorted(self.topics) and 0 <= unused <= len(topics):
+            self.topics = topics
+            self.unused = unused
+    
+    def _save(self):
+        """Atomically write the rotation state."""
+        tmp_file = self.state_file + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"topics": self.topics, "unused": self.unused}, f)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save topic rotation: {e}")
     
     def get_next_topic(self) -> str:
         """Get next topic with smart rotation."""
         # Reset if all topics used
-        if len(self.used_topics) >= len(self.topics):
-            self.used_topics = []
+        if self.unused == 0:
+            self.unused = len(self.topics)
             logger.info("🔄 Resetting topic rotation")
         
-        # Get unused topics
-        available = [t for t in self.topics if t not in self.used_topics]
-        
-        # Select random topic
-        topic = random.choice(available)
-        self.used_topics.append(topic)
+        # Select a random unused topic and swap it behind the unused partition
+        topics = self.topics
+        i = random.randrange(self.unused)
+        self.unused -= 1
+        topics[i], topics[self.unused] = topics[self.unused], topics[i]
+        topic = topics[self.unused]
+        self._save()
         
         # Format with current date
-        topic = topic.format(
-            month=datetime.now().strftime('%B %Y'),
-            date=datetime.now().strftime('%Y-%m-%d')
-        )
+        if topic in self.templated:
+            now = datetime.now()
+            topic = topic.format_map(TemplateFields(
+                month=now.strftime('%B %Y'),
+                date=now.strftime('%Y-%m-%d')
+            ))
         
         return topic
 
@@ -347,9 +614,6 @@ def daily_post_job():
         logger.info("=" * 50)
         logger.info(f"🚀 Starting scheduled post at {datetime.now()}")
         
-        # Get page stats
-        get_page_stats()
-        
         # Generate content
         topic = topic_manager.get_next_topic()
         logger.info(f"📝 Topic: {topic}")
@@ -369,9 +633,11 @@ def daily_post_job():
             post_id = result.get('id')
             logger.info(f"✅ Daily post completed: {post_id}")
             
-            # Wait a bit before fetching insights
+            # Wait a bit before fetching insights (page stats ride along)
             time.sleep(10)
-            get_post_insights(post_id)
+            fetch_post_and_page_metrics(post_id)
+        else:
+            get_page_stats()
         
         logger.info("=" * 50)
         
@@ -380,14 +646,29 @@ def daily_post_job():
 
 # ==================== SIGNAL HANDLING ====================
 
-def signal_handler(sig, frame):
-    """Graceful shutdown handler."""
+# Cleared by request_shutdown once the scheduler loop is running
+RUNNING = True
+
+def shutdown():
+    """Log final page stats before exiting."""
     logger.info("\n🛑 Shutdown signal received. Cleaning up...")
     logger.info("📊 Final page stats:")
     get_page_stats()
     logger.info("👋 Goodbye!")
+
+def signal_handler(sig, frame):
+    """Graceful shutdown handler."""
+    shutdown()
     sys.exit(0)
 
+def request_shutdown(sig, frame):
+    """Scheduler-loop signal handler: just ask the loop to stop.
+    
+    The signal also lands on the wakeup socket, which ends the loop's wait.
+    """
+    global RUNNING
+    RUNNING = False
+
 # ==================== MAIN EXECUTION ====================
 
 def test_generation_only():
@@ -407,8 +688,13 @@ def test_generation_only():
     
     # Write to file to avoid Windows console encoding issues
     output_file = os.path.join(os.path.dirname(__file__), '..', 'logs', 'test_post_output.txt')
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    data = content.encode('utf-8')
+    fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        # One unbuffered write for a few hundred bytes
+        os.write(fd, data)
+    finally:
+        os.close(fd)
     print(f"[Content saved to: {output_file}]")
     
     logger.info("=" * 50)
@@ -432,14 +718,11 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
-    # Validate token
-    if not validate_facebook_token():
+    # Validate token and get initial page stats in one round trip
+    if not validate_facebook_token(with_page_stats=True):
         logger.error("❌ Token validation failed. Exiting.")
         sys.exit(1)
     
-    # Get initial page stats
-    get_page_stats()
-    
     # Test run (optional - comment out for production)
     user_input = input("\n🧪 Run test post now? (y/n): ").lower()
     if user_input == 'y':
@@ -454,10 +737,39 @@ def main():
     logger.info(f"\n⏰ Scheduler active. Next post at {POST_SCHEDULE}")
     logger.info("📊 Press Ctrl+C to stop\n")
     
-    # Run scheduler loop
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
+    # Signals write to a wakeup socket, so waiting on it ends the sleep immediately
+    # (a socket pair rather than os.pipe so select() also works on Windows)
+    wakeup_r, wakeup_w = socket.socketpair()
+    wakeup_r.setblocking(False)
+    wakeup_w.setblocking(False)
+    signal.set_wakeup_fd(wakeup_w.fileno())
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
+    selector = selectors.DefaultSelector()
+    selector.register(wakeup_r, selectors.EVENT_READ)
+    
+    # Run scheduler loop: wait until the next job is due (capped to bound clock skew) or a signal
+    try:
+        while RUNNING:
+            idle = schedule.idle_seconds()
+            if idle is None:
+                break
+            if idle > 0 and selector.select(timeout=min(idle, 3600)):
+                try:
+                    while wakeup_r.recv(4096):
+                        pass
+                except BlockingIOError:
+                    pass
+                continue
+            schedule.run_pending()
+    finally:
+        signal.set_wakeup_fd(-1)
+        selector.close()
+        wakeup_r.close()
+        wakeup_w.close()
+    
+    if not RUNNING:
+        shutdown()
 
 if __name__ == "__main__":
     # Check for --test flag
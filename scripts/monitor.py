@@ -5,16 +5,46 @@ Real-time status monitoring and analytics viewer.
 Usage:
     python monitor.py
     python monitor.py --watch  # Auto-refresh every 30 seconds
+
+In --watch mode slow-changing Graph data (page info, token expiry) is cached
+between refreshes; set DASHBOARD_CACHE_TTL (seconds) to tune page info.
+Page info snapshots are kept in logs/monitor.sqlite, so a restart reuses a
+fresh one, a Graph outage shows the last one, and follower changes show up.
 """
 
 import os
 import sys
 import time
+import json
+import hashlib
 import argparse
+import sqlite3
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import quote
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from dotenv import load_dotenv
 
+try:
+    import liburing
+    HAS_IORING = sys.platform.startswith("linux")
+except ImportError:
+    HAS_IORING = False
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Load environment from project root
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', 'config.env'))
 
@@ -22,74 +52,380 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', 'config.en
 PAGE_ID = os.getenv("FB_PAGE_ID")
 PAGE_ACCESS_TOKEN = os.getenv("FB_ACCESS_TOKEN")
 
-def clear_screen():
-    """Clear terminal screen."""
-    os.system('clear' if os.name != 'nt' else 'cls')
-
-def print_header():
-    """Print dashboard header."""
-    print("=" * 80)
-    print("  FACEBOOK AI POSTER - MONITORING DASHBOARD")
-    print("=" * 80)
-    print(f"  Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 80)
-    print()
-
-def get_page_info():
-    """Fetch page information."""
-    try:
-        url = f"https://graph.facebook.com/v20.0/{PAGE_ID}"
-        params = {
-            "fields": "name,fan_count,followers_count,talking_about_count,link,category",
-            "access_token": PAGE_ACCESS_TOKEN
-        }
-        response = requests.get(url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            return response.json()
+# Home, clear screen, clear scrollback
+CLEAR_SCREEN = '\x1b[H\x1b[2J\x1b[3J'
+
+if os.name == 'nt':
+    # An empty command makes cmd.exe turn on VT escape processing for this console
+    os.system('')
+
+# Output templates, built once and filled with format_map on each refresh
+HEADER_TEMPLATE = (
+    "=" * 80 + "\n"
+    "  FACEBOOK AI POSTER - MONITORING DASHBOARD\n"
+    + "=" * 80 + "\n"
+    "  Last Updated: {updated}\n"
+    + "=" * 80 + "\n"
+)
+PAGE_INFO_TEMPLATE = (
+    "Name:           {name}\n"
+    "Category:       {category}\n"
+    "Page Likes:     {fan_count:,}\n"
+    "Followers:      {followers_count:,}{followers_delta}\n"
+    "Talking About:  {talking_about_count:,}\n"
+    "URL:            {link}"
+)
+PAGE_INFO_DEFAULTS = {'name': 'N/A', 'category': 'N/A', 'fan_count': 0,
+                      'followers_count': 0, 'talking_about_count': 0, 'link': 'N/A'}
+POST_TEMPLATE = (
+    "\n{index}. Posted {ago}\n"
+    "   {message}\n"
+    "   Reactions: {reactions}  |  Comments: {comments}  |  Shares: {shares}"
+)
+INSIGHTS_TEMPLATE = "   Impressions: {post_impressions:,}  |  Engaged: {post_engaged_users}  |  Clicks: {post_clicks}"
+INSIGHTS_DEFAULTS = {'post_impressions': 0, 'post_engaged_users': 0, 'post_clicks': 0}
+
+def dig(d, *keys, default=0):
+    """Walk nested dicts by keys, returning default at the first missing level."""
+    for key in keys:
+        if not isinstance(d, dict):
+            return default
+        d = d.get(key)
+        if d is None:
+            return default
+    return d
+
+def render_header():
+    """Build the dashboard header."""
+    return HEADER_TEMPLATE.format_map({'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')})
+
+GRAPH_URL = "https://graph.facebook.com/"
+PAGE_FIELDS = "name,fan_count,followers_count,talking_about_count,link,category"
+POST_FIELDS = "id,message,created_time,reactions.summary(true),comments.summary(true),shares"
+POST_METRICS = "post_impressions,post_engaged_users,post_clicks"
+
+# Seconds each dashboard section is served from memory between --watch refreshes
+# (DASHBOARD_CACHE_TTL tunes the slow-changing page info; 0 disables caching it)
+CACHE_TTL = {
+    'page_info': int(os.getenv("DASHBOARD_CACHE_TTL", "3600")),
+    'token': 21600,
+    'posts': 60,
+    'insights': 300,
+    'poster_running': 15,
+}
+GRAPH_SECTIONS = ('page_info', 'posts', 'token', 'insights')
+MISSING = object()
+_cache = {}  # section -> (time.monotonic(), value)
+
+# Graph responses and snapshots are parsed from raw bytes with orjson when available
+json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+# Keep-alive session so --watch refreshes reuse one TCP/TLS connection; the
+# batch POST only reads, so it's safe for urllib3 to retry it on 429/5xx
+session = requests.Session()
+session.headers['Accept-Encoding'] = 'gzip'
+session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=1,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({"GET", "POST"}))
+))
+
+def graph_batch(entries):
+    """Run GET sub-requests in one Graph batch round trip.
+    
+    Args:
+        entries: Batch entries (dicts with at least relative_url)
+    
+    Returns each sub-request's parsed body, or None where it failed.
+    Raises if the batch itself can't be sent.
+    """
+    batch = [{"method": "GET", **entry} for entry in entries]
+    response = session.post(
+        GRAPH_URL,
+        data={"batch": json.dumps(batch), "access_token": PAGE_ACCESS_TOKEN},
+        timeout=10
+    )
+    response.raise_for_status()
+    
+    results = []
+    for item in json_loads(response.content):
+        if item and item.get('code') == 200:
+            results.append(json_loads(item['body']))
         else:
-            return None
-    except Exception as e:
-        return None
+            results.append(None)
+    return results
 
-def get_recent_posts(limit=5):
-    """Fetch recent posts."""
+def parse_insights(data):
+    """Map insight metric names to their latest value."""
+    insights = {}
+    for metric in data.get('data', []):
+        insights[metric['name']] = metric['values'][0]['value']
+    return insights
+
+def cache_get(key, now):
+    """Get a cached dashboard section, or MISSING once its TTL has passed."""
+    entry = _cache.get(key)
+    if entry is not None and now - entry[0] < CACHE_TTL[key]:
+        return entry[1]
+    return MISSING
+
+SNAPSHOT_DB = os.path.join(os.path.dirname(__file__), '..', 'logs', 'monitor.sqlite')
+SNAPSHOT_KEEP = 1000  # rows kept per kind
+_db = None
+# Dashboard sections persisted as snapshots, by snapshot kind. Token checks are
+# keyed by a hash of the token, so a new FB_ACCESS_TOKEN is checked right away.
+SNAPSHOT_KINDS = {
+    'page_info': 'page',
+    'token': 'token:' + hashlib.sha256((PAGE_ACCESS_TOKEN or '').encode()).hexdigest()[:32],
+}
+
+def snapshot_db():
+    """Open the snapshot database on first use (WAL, so readers don't block writes)."""
+    global _db
+    if _db is None:
+        os.makedirs(os.path.dirname(SNAPSHOT_DB), exist_ok=True)
+        db = sqlite3.connect(SNAPSHOT_DB)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("CREATE TABLE IF NOT EXISTS snapshots(ts REAL, kind TEXT, payload BLOB)")
+        db.execute("CREATE INDEX IF NOT EXISTS snapshots_kind_ts ON snapshots(kind, ts)")
+        _db = db
+    return _db
+
+def save_snapshot(kind, payload):
+    """Store a snapshot and trim the kind to its last SNAPSHOT_KEEP rows."""
     try:
-        url = f"https://graph.facebook.com/v20.0/{PAGE_ID}/posts"
-        params = {
-            "fields": "id,message,created_time,reactions.summary(true),comments.summary(true),shares",
-            "limit": limit,
-            "access_token": PAGE_ACCESS_TOKEN
-        }
-        response = requests.get(url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            return response.json().get('data', [])
-        else:
-            return []
-    except Exception as e:
+        db = snapshot_db()
+        with db:
+            db.execute("INSERT INTO snapshots VALUES(?, ?, ?)",
+                       (time.time(), kind, json.dumps(payload).encode()))
+            db.execute(
+                "DELETE FROM snapshots WHERE kind = ? AND ts < "
+                "(SELECT ts FROM snapshots WHERE kind = ? ORDER BY ts DESC LIMIT 1 OFFSET ?)",
+                (kind, kind, SNAPSHOT_KEEP - 1)
+            )
+    except sqlite3.Error:
+        pass
+
+def recent_snapshots(kind, count=1):
+    """Get the newest snapshots of a kind as [(unix time, payload)], newest first."""
+    try:
+        rows = snapshot_db().execute(
+            "SELECT ts, payload FROM snapshots WHERE kind = ? ORDER BY ts DESC LIMIT ?",
+            (kind, count)
+        ).fetchall()
+    except sqlite3.Error:
         return []
+    return [(ts, json_loads(payload)) for ts, payload in rows]
 
-def get_post_insights(post_id):
-    """Fetch post insights."""
+def delete_snapshots(kind):
+    """Drop every stored snapshot of a kind."""
     try:
-        url = f"https://graph.facebook.com/v20.0/{post_id}/insights"
-        params = {
-            "metric": "post_impressions,post_engaged_users,post_clicks",
-            "access_token": PAGE_ACCESS_TOKEN
-        }
-        response = requests.get(url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json().get('data', [])
-            insights = {}
-            for metric in data:
-                insights[metric['name']] = metric['values'][0]['value']
-            return insights
+        db = snapshot_db()
+        with db:
+            db.execute("DELETE FROM snapshots WHERE kind = ?", (kind,))
+    except sqlite3.Error:
+        pass
+
+def forget_token():
+    """Evict the cached token check, in memory and on disk, so it's re-run."""
+    _cache.pop('token', None)
+    delete_snapshots(SNAPSHOT_KINDS['token'])
+
+def get_dashboard_data(limit=5):
+    """Fetch everything the dashboard shows in at most one Graph round trip.
+    
+    Sections still within their CACHE_TTL are served from memory and left
+    out of the batch. When posts are fetched too, the insights request
+    depends on them through a batch JSONPath reference, so Graph resolves
+    the post ids server-side.
+    
+    Page info and the token check are also persisted: a snapshot younger
+    than its TTL stands in for the in-memory cache after a restart, so a
+    long-lived token isn't re-checked on every start. Only a token check
+    that came back valid is kept; if Graph rejects the batch (a revoked
+    token does that) the cached check is evicted and the token reported
+    invalid. If Graph fails, the latest page info snapshot is shown with
+    page_info_stale set to its unix time.
+    
+    Returns:
+        Dict with page_info, page_info_stale, posts, insights
+        ({post_id: insights}), token (debug data or None) and token_checked
+    """
+    now = time.monotonic()
+    for key, kind in SNAPSHOT_KINDS.items():
+        if key not in _cache:
+            for ts, payload in recent_snapshots(kind):
+                _cache[key] = (now - max(0, time.time() - ts), payload)
+    data = {key: cache_get(key, now) for key in GRAPH_SECTIONS}
+    if data['token'] is not MISSING and not data['token'].get('is_valid'):
+        # Never let a cached failed check stand in for a fresh one
+        forget_token()
+        data['token'] = MISSING
+    
+    entries, keys = [], []
+    if data['page_info'] is MISSING:
+        entries.append({"relative_url": f"v20.0/{PAGE_ID}?fields={PAGE_FIELDS}"})
+        keys.append('page_info')
+    if data['posts'] is MISSING:
+        entries.append({"relative_url": f"v20.0/{PAGE_ID}/posts?fields={POST_FIELDS}&limit={limit}",
+                        "name": "posts", "omit_response_on_success": False})
+        keys.append('posts')
+    if data['token'] is MISSING:
+        entries.append({"relative_url": f"v20.0/debug_token?input_token={quote(PAGE_ACCESS_TOKEN or '')}"})
+        keys.append('token')
+    if data['insights'] is MISSING:
+        if data['posts'] is MISSING:
+            ids = "{result=posts:$.data.*.id}"
         else:
-            return {}
-    except Exception:
-        return {}
+            ids = ",".join(post['id'] for post in data['posts'])
+        if ids:
+            entries.append({"relative_url": f"v20.0/?ids={ids}&fields=insights.metric({POST_METRICS})"})
+            keys.append('insights')
+        else:
+            data['insights'] = {}
+    
+    results = {}
+    token_checked = True
+    # Without credentials Graph can't answer anything; fall through to the
+    # "could not fetch" / "invalid or expired" messages
+    if entries and PAGE_ID and PAGE_ACCESS_TOKEN:
+        try:
+            results = dict(zip(keys, graph_batch(entries)))
+        except requests.exceptions.HTTPError:
+            # Graph rejects the whole batch when the access token is bad, so
+            # a cached check can no longer vouch for it
+            forget_token()
+            data['token'] = None
+        except Exception:
+            token_checked = data['token'] is not MISSING
+    
+    # Only successful responses are cached
+    if results.get('page_info') is not None:
+        data['page_info'] = results['page_info']
+        save_snapshot(SNAPSHOT_KINDS['page_info'], data['page_info'])
+    if results.get('posts') is not None:
+        data['posts'] = results['posts'].get('data', [])
+    if results.get('token') is not None:
+        data['token'] = results['token'].get('data', {})
+        if data['token'].get('is_valid'):
+            save_snapshot(SNAPSHOT_KINDS['token'], data['token'])
+        else:
+            forget_token()
+            results['token'] = None
+    if results.get('insights') is not None:
+        data['insights'] = {
+            post_id: parse_insights(node['insights'])
+            for post_id, node in results['insights'].items()
+            if node.get('insights')
+        }
+    for key in keys:
+        if results.get(key) is not None:
+            _cache[key] = (now, data[key])
+    
+    data['page_info_stale'] = None
+    if data['page_info'] is MISSING:
+        for ts, payload in recent_snapshots(SNAPSHOT_KINDS['page_info']):
+            data['page_info'], data['page_info_stale'] = payload, ts
+    
+    defaults = {'page_info': None, 'posts': [], 'insights': {}, 'token': None}
+    for key, default in defaults.items():
+        if data[key] is MISSING:
+            data[key] = default
+    data['token_checked'] = token_checked
+    return data
+
+REFRESH_INTERVAL = 30  # seconds between --watch refreshes
+
+LOG_TAIL_LINES = 100
+TAIL_CHUNK_SIZE = 8192
+RING_TAIL_SIZE = 64 * 1024
+# Level field of an error record in facebook_poster's '%(asctime)s - %(levelname)s - %(message)s' log
+LOG_ERROR_MARKER = b' - ERROR - '
+_ring = None  # io_uring set up on first use and kept for later refreshes
+
+def ring_read_tail(path, lines):
+    """Read a file's last RING_TAIL_SIZE bytes in one io_uring read.
+    
+    Returns the last lines, or None if that much of the file doesn't hold
+    them all (or io_uring can't be set up).
+    """
+    global _ring, HAS_IORING
+    if _ring is None:
+        ring = liburing.Ring()
+        try:
+            liburing.io_uring_queue_init(8, ring)
+        except OSError:
+            # e.g. disabled by sysctl or a container's seccomp profile
+            HAS_IORING = False
+            return None
+        _ring = ring
+    
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        offset = max(0, size - RING_TAIL_SIZE)
+        buf = bytearray(size - offset)
+        sqe = liburing.io_uring_get_sqe(_ring)
+        liburing.io_uring_prep_read(sqe, fd, buf, offset)
+        liburing.io_uring_submit(_ring)
+        cqe = liburing.Cqe()
+        liburing.io_uring_wait_cqe(_ring, cqe)
+        entry = cqe[0]
+        try:
+            nbytes = entry.res  # raises OSError for a failed read (e.g. kernel < 5.6)
+        finally:
+            liburing.io_uring_cqe_seen(_ring, entry)
+    finally:
+        os.close(fd)
+    
+    tail = bytes(buf[:nbytes]).splitlines()
+    # Unless the read started at 0, the first line is partial
+    if offset > 0 and len(tail) <= lines:
+        return None
+    return tail[-lines:]
+
+def read_tail(path, lines):
+    """Read a file's last lines (as bytes) by seeking backwards from the end.
+    
+    Only the tail is read, so the cost doesn't grow with the log. On Linux
+    with liburing the tail is read through io_uring first.
+    """
+    if HAS_IORING:
+        try:
+            tail = ring_read_tail(path, lines)
+        except OSError:
+            tail = None
+        if tail is not None:
+            return tail
+    
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+        # One extra newline: the file usually ends with one
+        while pos > 0 and newlines <= lines:
+            step = min(TAIL_CHUNK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            newlines += chunk.count(b'\n')
+            chunks.append(chunk)
+    return b''.join(reversed(chunks)).splitlines()[-lines:]
+
+def is_poster_running():
+    """Check whether facebook_poster.py is running (cached for a few seconds)."""
+    now = time.monotonic()
+    running = cache_get('poster_running', now)
+    if running is MISSING:
+        running = False
+        for proc in psutil.process_iter(['cmdline']):
+            cmdline = proc.info.get('cmdline')
+            if cmdline and any('facebook_poster.py' in part for part in cmdline):
+                running = True
+                break
+        _cache['poster_running'] = (now, running)
+    return running
 
 def check_log_file():
     """Check log file status."""
@@ -107,14 +443,11 @@ def check_log_file():
     size_mb = stat.st_size / (1024 * 1024)
     last_modified = datetime.fromtimestamp(stat.st_mtime)
     
-    # Count recent errors
+    # Count recent errors: one C-level scan of the tail for the level field
     recent_errors = 0
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            for line in f.readlines()[-100:]:  # Last 100 lines
-                if 'ERROR' in line:
-                    recent_errors += 1
-    except:
+        recent_errors = b'\n'.join(read_tail(log_file, LOG_TAIL_LINES)).count(LOG_ERROR_MARKER)
+    except OSError:
         pass
     
     return {
@@ -124,155 +457,166 @@ def check_log_file():
         'recent_errors': recent_errors
     }
 
-def format_time_ago(dt):
-    """Format datetime as 'X hours ago'."""
+@lru_cache(maxsize=64)
+def parse_graph_time(value):
+    """Parse a Graph timestamp (e.g. 2024-01-01T09:00:00+0000) into an aware datetime."""
+    return datetime.fromisoformat(value.replace('+0000', '+00:00'))
+
+def format_time_ago(dt, now=None):
+    """Format datetime as 'X hours ago'.
+    
+    Accepts Graph timestamp strings (UTC) or naive local datetimes; pass
+    now (aware, e.g. datetime.now(timezone.utc)) to share one clock read.
+    """
     if not dt:
         return "Unknown"
     
     try:
         # Parse ISO format from Facebook
         if isinstance(dt, str):
-            dt = datetime.strptime(dt, "%Y-%m-%dT%H:%M:%S%z").replace(tzinfo=None)
-        
-        diff = datetime.now() - dt
-        
-        if diff.days > 0:
-            return f"{diff.days}d ago"
-        elif diff.seconds >= 3600:
-            return f"{diff.seconds // 3600}h ago"
-        elif diff.seconds >= 60:
-            return f"{diff.seconds // 60}m ago"
-        else:
-            return f"{diff.seconds}s ago"
-    except:
+            dt = parse_graph_time(dt)
+    except ValueError:
         return str(dt)
+    
+    if dt.tzinfo is None:
+        dt = dt.astimezone()  # naive local time
+    if now is None:
+        now = datetime.now(timezone.utc)
+    seconds = max(0, int((now - dt).total_seconds()))
+    
+    if seconds >= 86400:
+        return f"{seconds // 86400}d ago"
+    elif seconds >= 3600:
+        return f"{seconds // 3600}h ago"
+    elif seconds >= 60:
+        return f"{seconds // 60}m ago"
+    else:
+        return f"{seconds}s ago"
+
+def format_followers_delta(page_info):
+    """Format the follower change since the snapshot before the one shown."""
+    current = page_info.get('followers_count')
+    for _, previous in recent_snapshots(SNAPSHOT_KINDS['page_info'], 2)[1:]:
+        if current is not None and previous.get('followers_count') is not None:
+            return f"  ({current - previous['followers_count']:+,} since last snapshot)"
+    return ""
 
 def display_dashboard(watch_mode=False):
-    """Display the monitoring dashboard."""
-    clear_screen()
-    print_header()
+    """Display the monitoring dashboard.
+    
+    The whole screen is built first and written in one call, so a refresh
+    doesn't tear on slow terminals.
+    """
+    sys.stdout.write(render_dashboard(watch_mode))
+    sys.stdout.flush()
+
+def render_dashboard(watch_mode=False):
+    """Build the dashboard screen as one string (prefixed by a clear on a TTY)."""
+    now = datetime.now(timezone.utc)
+    out = [render_header()]
     
     # Page Information
-    print("[PAGE INFORMATION]")
-    print("-" * 80)
-    page_info = get_page_info()
+    out.append("[PAGE INFORMATION]")
+    out.append("-" * 80)
+    data = get_dashboard_data(limit=5)
+    page_info = data['page_info']
     
     if page_info:
-        print(f"Name:           {page_info.get('name', 'N/A')}")
-        print(f"Category:       {page_info.get('category', 'N/A')}")
-        print(f"Page Likes:     {page_info.get('fan_count', 0):,}")
-        print(f"Followers:      {page_info.get('followers_count', 0):,}")
-        print(f"Talking About:  {page_info.get('talking_about_count', 0):,}")
-        print(f"URL:            {page_info.get('link', 'N/A')}")
+        if data['page_info_stale']:
+            stale_at = datetime.fromtimestamp(data['page_info_stale'], timezone.utc)
+            out.append(f"[stale] Graph unavailable, showing snapshot from {format_time_ago(stale_at, now)}")
+        out.append(PAGE_INFO_TEMPLATE.format_map({
+            **PAGE_INFO_DEFAULTS, **page_info,
+            'followers_delta': format_followers_delta(page_info),
+        }))
     else:
-        print("[!] Could not fetch page information")
+        out.append("[!] Could not fetch page information")
     
-    print()
-    print()
+    out.append("")
+    out.append("")
     
     # Log File Status
-    print("[LOG FILE STATUS]")
-    print("-" * 80)
+    out.append("[LOG FILE STATUS]")
+    out.append("-" * 80)
     log_info = check_log_file()
     
     if log_info['exists']:
-        print(f"Status:         [OK] Active")
-        print(f"Size:           {log_info['size']:.2f} MB")
-        print(f"Last Modified:  {format_time_ago(log_info['last_modified'])}")
-        print(f"Recent Errors:  {'[!] ' + str(log_info['recent_errors']) if log_info['recent_errors'] > 0 else '[OK] 0'}")
+        out.append(f"Status:         [OK] Active")
+        out.append(f"Size:           {log_info['size']:.2f} MB")
+        out.append(f"Last Modified:  {format_time_ago(log_info['last_modified'], now)}")
+        out.append(f"Recent Errors:  {'[!] ' + str(log_info['recent_errors']) if log_info['recent_errors'] > 0 else '[OK] 0'}")
     else:
-        print("Status:         [!] Log file not found")
+        out.append("Status:         [!] Log file not found")
     
-    print()
-    print()
+    out.append("")
+    out.append("")
     
     # Recent Posts
-    print("[RECENT POSTS (Last 5)]")
-    print("-" * 80)
-    posts = get_recent_posts(limit=5)
+    out.append("[RECENT POSTS (Last 5)]")
+    out.append("-" * 80)
+    posts = data['posts']
     
     if posts:
         for i, post in enumerate(posts, 1):
-            post_id = post.get('id')
-            message = post.get('message', 'No message')[:60] + '...' if post.get('message') else '[No text]'
-            created = post.get('created_time')
-            
-            reactions = post.get('reactions', {}).get('summary', {}).get('total_count', 0)
-            comments = post.get('comments', {}).get('summary', {}).get('total_count', 0)
-            shares = post.get('shares', {}).get('count', 0)
-            
-            print(f"\n{i}. Posted {format_time_ago(created)}")
-            print(f"   {message}")
-            print(f"   Reactions: {reactions}  |  Comments: {comments}  |  Shares: {shares}")
+            message = post.get('message')
+            out.append(POST_TEMPLATE.format_map({
+                'index': i,
+                'ago': format_time_ago(post.get('created_time'), now),
+                'message': message[:60] + '...' if message else '[No text]',
+                'reactions': dig(post, 'reactions', 'summary', 'total_count'),
+                'comments': dig(post, 'comments', 'summary', 'total_count'),
+                'shares': dig(post, 'shares', 'count'),
+            }))
             
-            # Try to get insights
-            insights = get_post_insights(post_id)
+            insights = data['insights'].get(post.get('id'))
             if insights:
-                impressions = insights.get('post_impressions', 0)
-                engaged = insights.get('post_engaged_users', 0)
-                clicks = insights.get('post_clicks', 0)
-                print(f"   Impressions: {impressions:,}  |  Engaged: {engaged}  |  Clicks: {clicks}")
+                out.append(INSIGHTS_TEMPLATE.format_map({**INSIGHTS_DEFAULTS, **insights}))
     else:
-        print("[!] No recent posts found")
+        out.append("[!] No recent posts found")
     
-    print()
-    print()
+    out.append("")
+    out.append("")
     
     # System Status
-    print("[SYSTEM STATUS]")
-    print("-" * 80)
+    out.append("[SYSTEM STATUS]")
+    out.append("-" * 80)
     
     # Check if script is running (basic check)
-    script_running = False
-    try:
-        import psutil
-        for proc in psutil.process_iter(['name', 'cmdline']):
-            try:
-                cmdline = proc.info['cmdline']
-                if cmdline and 'facebook_poster.py' in ' '.join(cmdline):
-                    script_running = True
-                    break
-            except:
-                pass
-        print(f"Poster Script:  {'[OK] Running' if script_running else '[!] Not Running'}")
-    except ImportError:
-        print("Poster Script:  [?] psutil not installed, cannot check")
+    if HAS_PSUTIL:
+        out.append(f"Poster Script:  {'[OK] Running' if is_poster_running() else '[!] Not Running'}")
+    else:
+        out.append("Poster Script:  [?] psutil not installed, cannot check")
     
     # Token expiration check
-    try:
-        debug_url = "https://graph.facebook.com/v20.0/debug_token"
-        debug_params = {
-            "input_token": PAGE_ACCESS_TOKEN,
-            "access_token": PAGE_ACCESS_TOKEN
-        }
-        debug_response = requests.get(debug_url, params=debug_params, timeout=10)
+    token_data = data['token']
+    if not data['token_checked']:
+        out.append("Token:          [?] Could not validate")
+    elif token_data is None or not token_data.get('is_valid'):
+        out.append("Token:          [X] Invalid or expired")
+    else:
+        expires_at = token_data.get('expires_at', 0)
         
-        if debug_response.status_code == 200:
-            data = debug_response.json().get('data', {})
-            expires_at = data.get('expires_at', 0)
+        if expires_at == 0:
+            out.append("Token:          [OK] Never expires")
+        else:
+            expiry_date = datetime.fromtimestamp(expires_at)
+            days_left = (expiry_date - datetime.now()).days
             
-            if expires_at == 0:
-                print("Token:          [OK] Never expires")
+            if days_left < 7:
+                out.append(f"Token:          [!] Expires in {days_left} days!")
             else:
-                expiry_date = datetime.fromtimestamp(expires_at)
-                days_left = (expiry_date - datetime.now()).days
-                
-                if days_left < 7:
-                    print(f"Token:          [!] Expires in {days_left} days!")
-                else:
-                    print(f"Token:          [OK] Valid ({days_left} days left)")
-        else:
-            print("Token:          [X] Invalid or expired")
-    except:
-        print("Token:          [?] Could not validate")
+                out.append(f"Token:          [OK] Valid ({days_left} days left)")
     
-    print()
-    print("=" * 80)
+    out.append("")
+    out.append("=" * 80)
     
     if watch_mode:
-        print("\n[Auto-refreshing every 30 seconds... Press Ctrl+C to exit]")
+        out.append("\n[Auto-refreshing every 30 seconds... Press Ctrl+C to exit]")
     else:
-        print("\nRun with --watch to auto-refresh")
+        out.append("\nRun with --watch to auto-refresh")
+    
+    clear = CLEAR_SCREEN if sys.stdout.isatty() else ""
+    return clear + "\n".join(out) + "\n"
 
 def main():
     """Main function."""
@@ -282,9 +626,18 @@ def main():
     
     try:
         if args.watch:
+            # Refresh on a fixed cadence: sleep to the next deadline, not a fixed 30 s
+            # after each (network-bound) render; the sleep is interrupted by Ctrl+C
+            next_tick = time.monotonic()
             while True:
                 display_dashboard(watch_mode=True)
-                time.sleep(30)
+                next_tick += REFRESH_INTERVAL
+                remaining = next_tick - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    # The refresh overran the interval; start the next one now
+                    next_tick = time.monotonic()
         else:
             display_dashboard(watch_mode=False)
     except KeyboardInterrupt:
@@ -8,20 +8,17 @@ Usage:
     python scripts/youtube_auth.py
 """
 import os
+import re
 import sys
+import importlib.util
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 os.chdir(PROJECT_ROOT)
 
-from dotenv import load_dotenv
-load_dotenv("config.env")
-
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-import json
+# The whole YOUTUBE_REFRESH_TOKEN= line in config.env
+REFRESH_TOKEN_LINE = re.compile(r'^YOUTUBE_REFRESH_TOKEN=.*$', re.MULTILINE)
 
 # YouTube API scopes
 SCOPES = [
@@ -32,6 +29,13 @@ SCOPES = [
 
 def get_credentials():
     """Get or refresh YouTube credentials."""
+    # Deferred so importing this module (or an early exit) stays fast
+    from dotenv import load_dotenv
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.oauth2.credentials import Credentials
+    from google.auth.transport.requests import Request
+    
+    load_dotenv("config.env")
     
     client_id = os.getenv("YOUTUBE_CLIENT_ID")
     client_secret = os.getenv("YOUTUBE_CLIENT_SECRET")
@@ -136,18 +140,21 @@ def update_config_env(new_refresh_token):
         with open(config_path, 'r') as f:
             content = f.read()
         
-        # Replace the refresh token line
-        import re
-        pattern = r'YOUTUBE_REFRESH_TOKEN=.*'
+        # Replace the refresh token line in one pass (append it if missing)
         replacement = f'YOUTUBE_REFRESH_TOKEN={new_refresh_token}'
+        new_content, count = REFRESH_TOKEN_LINE.subn(lambda _: replacement, content)
+        if count == 0:
+            new_content = content.rstrip() + f"\n{replacement}\n"
         
-        if re.search(pattern, content):
-            new_content = re.sub(pattern, replacement, content)
-        else:
-            new_content = content + f"\nYOUTUBE_REFRESH_TOKEN={new_refresh_token}\n"
+        if new_content == content:
+            print("[OK] Token unchanged, config.env left as is")
+            return
         
-        with open(config_path, 'w') as f:
+        # Write beside it and rename, so reload watchers never see a half-written file
+        tmp_path = config_path.with_name(config_path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
             f.write(new_content)
+        os.replace(tmp_path, config_path)
         
         print("[OK] config.env updated successfully!")
         print("[*] Please restart the pipeline to use the new token.")
@@ -189,10 +196,8 @@ if __name__ == "__main__":
     print("\nYouTube OAuth2 Setup")
     print("=" * 40)
     
-    # Check for required packages
-    try:
-        import google_auth_oauthlib
-    except ImportError:
+    # Check for required packages (without importing them)
+    if importlib.util.find_spec("google_auth_oauthlib") is None:
         print("[X] Missing package: google-auth-oauthlib")
         print("[*] Install with: pip install google-auth-oauthlib")
         sys.exit(1)
@@ -1,27 +1,34 @@
 """
 OneClick Reels AI - API Server Entry Point
+
+Usage:
+    python server.py [port]
+    DEV_RELOAD=1 python server.py  # Restart on code changes (development)
+
+WEB_CONCURRENCY sets the number of worker processes (default 1).
 """
-import uvicorn
-import socket
+import os
 import sys
+import socket
+import uvicorn
+from uvicorn.supervisors import ChangeReload, Multiprocess
 
-def is_port_available(port: int) -> bool:
-    """Check if a port is available."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        try:
-            s.bind(("0.0.0.0", port))
-            return True
-        except OSError:
-            return False
-
-def find_available_port(start_port: int = 8000, max_attempts: int = 10) -> int:
-    """Find an available port starting from start_port."""
-    for i in range(max_attempts):
-        port = start_port + i
-        if is_port_available(port):
-            return port
-    return start_port
+def bind_socket(port: int = 8000) -> socket.socket:
+    """Bind the requested port, or a kernel-chosen free one if it's busy.
+    
+    The bound socket is handed straight to uvicorn, so there's no
+    probe-then-rebind race.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if os.name != "nt":
+        # On Windows SO_REUSEADDR would let us steal a port in use
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.bind(("0.0.0.0", port))
+    except OSError:
+        # Port 0: one bind, and the kernel picks a port nobody holds
+        sock.bind(("0.0.0.0", 0))
+    return sock
 
 if __name__ == "__main__":
     port = 8000
@@ -32,10 +39,11 @@ if __name__ == "__main__":
         except ValueError:
             pass
     
-    if not is_port_available(port):
-        new_port = find_available_port(port + 1)
-        print(f"[!] Port {port} busy, trying {new_port}")
-        port = new_port
+    sock = bind_socket(port)
+    bound_port = sock.getsockname()[1]
+    if bound_port != port:
+        print(f"[!] Port {port} busy, using {bound_port}")
+        port = bound_port
     
     print("")
     print("OneClick Reels AI - API Server")
@@ -44,16 +52,28 @@ if __name__ == "__main__":
     print(f"   API Docs: http://localhost:{port}/docs")
     print("")
     
+    # The reloader's file watcher and supervisor process are opt-in for development;
+    # in production access logging is left to the reverse proxy
+    dev_reload = os.getenv("DEV_RELOAD", "0") == "1"
+    
     config = uvicorn.Config(
         "backend.api.main:app",
         host="0.0.0.0",
         port=port,
-        reload=True,
+        reload=dev_reload,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        access_log=dev_reload,
+        limit_concurrency=1000,
         log_level="info"
     )
     
     server = uvicorn.Server(config)
-    server.run()
+    if config.should_reload:
+        ChangeReload(config, target=server.run, sockets=[sock]).run()
+    elif config.workers > 1:
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run(sockets=[sock])
 
 # Force reload
 
@@ -7,21 +7,110 @@ Automatically uploads all files from output/ folder to Google Drive
 import os
 import sys
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 import datetime
+import fnmatch
 import hashlib
+import mimetypes
+import struct
+
+try:
+    import pathspec
+    HAS_PATHSPEC = True
+except ImportError:
+    HAS_PATHSPEC = False
 
 # Configuration
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
 TOKEN_FILE = 'drive_oauth_token.json'
 OUTPUT_DIR = 'output'
 DRIVE_FOLDER_NAME = 'OneClick_Reels_AI'
-SYNC_LOG_FILE = 'sync_log.json'
+# Append-only JSON lines, one record per uploaded file or cached folder (last wins)
+SYNC_LOG_FILE = 'sync_log.jsonl'
+LEGACY_SYNC_LOG_FILE = 'sync_log.json'
+COMPACT_EVERY = 100  # appended records before the log is rewritten as a snapshot
+# Parallel upload sessions (Drive has no batch media upload); keep it well
+# under Drive's per-user write rate
+SYNC_WORKERS = int(os.getenv('DRIVE_SYNC_WORKERS', '4'))
+# Retries (exponential backoff) for 429/5xx and 403 rate-limit responses
+DRIVE_NUM_RETRIES = 5
+# Resumable upload chunk size; Drive needs a multiple of 256 KiB. Files
+# under SIMPLE_UPLOAD_MAX_SIZE go up in one multipart request instead.
+UPLOAD_CHUNK_SIZE = max(1, int(float(os.getenv('DRIVE_CHUNK_MB', '100')) * 4)) * 256 * 1024
+SIMPLE_UPLOAD_MAX_SIZE = 5 * 1024 * 1024
+HTTP_TIMEOUT = 120  # seconds per request on the Drive connections
+BATCH_LIMIT = 100  # Drive's cap on calls per batch request
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+# gitignore-style patterns (relative to OUTPUT_DIR) for files and folders not to sync
+DRIVEIGNORE_FILE = os.path.join(OUTPUT_DIR, '.driveignore')
+DEFAULT_IGNORE = ['.git/', '__pycache__/', '*.tmp', '*.log', '.driveignore']
+
+# Types for the media we produce; anything else is looked up in mimetypes' table
+MIME_TYPES = {
+    '.mp4': 'video/mp4',
+    '.mov': 'video/quicktime',
+    '.avi': 'video/x-msvideo',
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.txt': 'text/plain',
+    '.json': 'application/json'
+}
+mimetypes.init()
+
+def load_ignore_patterns(path=DRIVEIGNORE_FILE):
+    """Load the default ignore patterns plus any from the .driveignore file"""
+    lines = list(DEFAULT_IGNORE)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            lines += f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+
+IGNORE_PATTERNS = load_ignore_patterns()
+IGNORE_SPEC = pathspec.PathSpec.from_lines('gitwildmatch', IGNORE_PATTERNS) if HAS_PATHSPEC else None
+
+def is_ignored(rel_path, is_dir=False):
+    """Check a '/'-separated path, relative to the synced folder, against the ignore patterns
+    
+    Without pathspec, patterns are matched with fnmatch: a pattern without
+    a slash matches the name at any depth, a trailing slash only matches
+    folders, and negated (!) patterns aren't supported.
+    """
+    if IGNORE_SPEC is not None:
+        return IGNORE_SPEC.match_file(rel_path + '/' if is_dir else rel_path)
+    
+    name = rel_path.rsplit('/', 1)[-1]
+    for pattern in IGNORE_PATTERNS:
+        if pattern.startswith('!'):
+            continue
+        if pattern.endswith('/'):
+            if not is_dir:
+                continue
+            pattern = pattern[:-1]
+        if '/' in pattern:
+            if fnmatch.fnmatch(rel_path, pattern.lstrip('/')):
+                return True
+        elif fnmatch.fnmatch(name, pattern):
+            return True
+    return False
+
+_thread = threading.local()
+_sync_log_lock = threading.RLock()
+_log_file = None  # append handle on SYNC_LOG_FILE
+_appended = 0
+# Drive folder ids by (parent_id, folder_name); persisted as sync log records
+folder_id_cache = {}
 
 def load_credentials():
     """Load existing OAuth credentials"""
@@ -43,65 +132,297 @@ def load_credentials():
     
     return creds
 
+HASH_CHUNK_SIZE = 1024 * 1024
+# Files above QUICK_HASH_MIN_SIZE are compared by their first and last
+# QUICK_HASH_EDGE bytes; STRICT_HASH=1 compares full MD5s instead
+QUICK_HASH_MIN_SIZE = 256 * 1024
+QUICK_HASH_EDGE = 128 * 1024
+STRICT_HASH = os.getenv('STRICT_HASH', '0') == '1'
+
 def get_file_hash(file_path):
     """Get MD5 hash of file for change detection"""
-    hash_md5 = hashlib.md5()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: the read/update loop runs in C
+            return hashlib.file_digest(f, 'md5').hexdigest()
+        hash_md5 = hashlib.md5()
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
             hash_md5.update(chunk)
     return hash_md5.hexdigest()
 
+class HashingReader:
+    """Read-only binary file wrapper that MD5s the bytes an upload reads
+    
+    Each byte is hashed the first time it's read, so the resumable upload
+    re-reading a chunk after a retry doesn't corrupt the digest.
+    """
+    
+    def __init__(self, f):
+        self._f = f
+        self._md5 = hashlib.md5()
+        self._hashed = 0  # bytes [0, _hashed) are in the digest
+    
+    def read(self, size=-1):
+        pos = self._f.tell()
+        data = self._f.read(size)
+        if pos <= self._hashed < pos + len(data):
+            self._md5.update(memoryview(data)[self._hashed - pos:])
+            self._hashed = pos + len(data)
+        return data
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self._f.seek(offset, whence)
+    
+    def tell(self):
+        return self._f.tell()
+    
+    def hexdigest(self):
+        """Get the MD5 of the whole file, reading any part the upload didn't"""
+        self._f.seek(self._hashed)
+        for chunk in iter(lambda: self._f.read(HASH_CHUNK_SIZE), b""):
+            self._md5.update(chunk)
+            self._hashed += len(chunk)
+        return self._md5.hexdigest()
+
+def quick_hash(file_path, size):
+    """Get MD5 of a large file's head, tail and size (of the whole file if small)"""
+    if size <= QUICK_HASH_MIN_SIZE:
+        return get_file_hash(file_path)
+    
+    hash_md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        hash_md5.update(f.read(QUICK_HASH_EDGE))
+        f.seek(-QUICK_HASH_EDGE, os.SEEK_END)
+        hash_md5.update(f.read(QUICK_HASH_EDGE))
+    hash_md5.update(struct.pack('<Q', size))
+    return hash_md5.hexdigest()
+
+def folder_record(parent_id, folder_name, folder_id):
+    """Build the sync log record for a cached folder id (None forgets it)"""
+    return {'folder': f"{parent_id or ''}/{folder_name}", 'id': folder_id}
+
 def load_sync_log():
-    """Load sync log to track uploaded files"""
-    if os.path.exists(SYNC_LOG_FILE):
-        with open(SYNC_LOG_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    """Load sync log to track uploaded files (and the cached folder ids)
+    
+    Records are folded in order, so the last one for a file or folder
+    wins. Lines that don't parse as a record (a torn write from an
+    interrupted run) are skipped without affecting the rest of the log.
+    """
+    sync_log = {}
+    if not os.path.exists(SYNC_LOG_FILE):
+        if os.path.exists(LEGACY_SYNC_LOG_FILE):
+            with open(LEGACY_SYNC_LOG_FILE, 'r') as f:
+                sync_log = json.load(f)
+            sync_log.pop('_folders', None)
+        return sync_log
+    
+    with open(SYNC_LOG_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if 'folder' in record:
+                    parent_id, _, folder_name = record['folder'].partition('/')
+                    key = (parent_id or None, folder_name)
+                    if record['id']:
+                        folder_id_cache[key] = record['id']
+                    else:
+                        folder_id_cache.pop(key, None)
+                else:
+                    sync_log[record.pop('key')] = record
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+    return sync_log
+
+def ends_with_newline(path):
+    """Check whether a file is empty or its last byte is a newline"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+    except FileNotFoundError:
+        return True
+
+def append_sync_log(record):
+    """Append one record to the sync log and make sure it reached the disk"""
+    global _log_file, _appended
+    with _sync_log_lock:
+        if _log_file is None:
+            # Terminate a torn last line so it can't swallow the next record
+            torn = not ends_with_newline(SYNC_LOG_FILE)
+            _log_file = open(SYNC_LOG_FILE, 'a', encoding='utf-8')
+            if torn:
+                _log_file.write('\n')
+        _log_file.write(json.dumps(record) + '\n')
+        _log_file.flush()
+        os.fsync(_log_file.fileno())
+        _appended += 1
+
+def record_sync(sync_log, sync_key, entry):
+    """Store a file's sync entry, appending it to the log right away"""
+    with _sync_log_lock:
+        sync_log[sync_key] = entry
+        append_sync_log({'key': sync_key, **entry})
+        if _appended >= COMPACT_EVERY:
+            save_sync_log(sync_log)
 
 def save_sync_log(sync_log):
-    """Save sync log"""
-    with open(SYNC_LOG_FILE, 'w') as f:
-        json.dump(sync_log, f, indent=2)
+    """Save sync log
+    
+    Rewrites the log as one record per file and folder (dropping
+    superseded records) and atomically replaces the old one.
+    """
+    global _log_file, _appended
+    with _sync_log_lock:
+        if _log_file is not None:
+            _log_file.close()
+            _log_file = None
+        
+        tmp_file = SYNC_LOG_FILE + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for sync_key, entry in sync_log.items():
+                f.write(json.dumps({'key': sync_key, **entry}) + '\n')
+            for (parent_id, folder_name), folder_id in folder_id_cache.items():
+                f.write(json.dumps(folder_record(parent_id, folder_name, folder_id)) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, SYNC_LOG_FILE)
+        _appended = 0
 
-def find_or_create_folder(service, folder_name, parent_id=None):
-    """Find or create a folder in Google Drive"""
-    query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder'"
+def remember_folder(parent_id, folder_name, folder_id):
+    """Cache a folder id and append it to the sync log"""
+    with _sync_log_lock:
+        folder_id_cache[(parent_id, folder_name)] = folder_id
+        append_sync_log(folder_record(parent_id, folder_name, folder_id))
+
+def forget_folder(folder_id):
+    """Drop a folder that no longer exists, and its subfolders' entries, from the cache"""
+    with _sync_log_lock:
+        for key, cached_id in list(folder_id_cache.items()):
+            if folder_id in (cached_id, key[0]):
+                del folder_id_cache[key]
+                append_sync_log(folder_record(*key, None))
+
+def build_service(creds):
+    """Build a Drive service on its own long-lived keep-alive connection
+    
+    The httplib2.Http is created once and reused for every request made
+    through the service, so only its first request pays the TCP/TLS handshake.
+    """
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+    return build('drive', 'v3', http=http, cache_discovery=False)
+
+def thread_service(creds):
+    """Get this thread's Drive service (the underlying httplib2 client isn't thread-safe)"""
+    service = getattr(_thread, 'service', None)
+    if service is None:
+        service = build_service(creds)
+        _thread.service = service
+    return service
+
+def folder_query(folder_name, parent_id=None):
+    """Build the Drive search query for a folder by name"""
+    query = f"name='{folder_name}' and mimeType='{FOLDER_MIME_TYPE}'"
     if parent_id:
         query += f" and '{parent_id}' in parents"
+    return query
+
+def execute_batch(service, requests):
+    """Run a list of Drive metadata requests in batches of up to BATCH_LIMIT calls
+    
+    Returns the responses in request order, with None for calls that failed.
+    """
+    responses = [None] * len(requests)
+    
+    def callback(request_id, response, exception):
+        if exception is None:
+            responses[int(request_id)] = response
+    
+    for start in range(0, len(requests), BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=callback)
+        for i in range(start, min(start + BATCH_LIMIT, len(requests))):
+            batch.add(requests[i], request_id=str(i))
+        batch.execute()
+    return responses
+
+def find_or_create_folders(service, folder_names, parent_id):
+    """Find or create sibling folders with one batch of lookups and one of creates
+    
+    Returns {folder_name: folder_id}. Cached folders aren't looked up, and
+    calls that fail in a batch are retried one at a time through
+    find_or_create_folder.
+    """
+    folder_ids = {name: folder_id_cache[(parent_id, name)]
+                  for name in folder_names if (parent_id, name) in folder_id_cache}
+    folder_names = [name for name in folder_names if name not in folder_ids]
+    lookups = execute_batch(service, [
+        service.files().list(q=folder_query(name, parent_id)) for name in folder_names
+    ])
+    for name, result in zip(folder_names, lookups):
+        folders = (result or {}).get('files', [])
+        if folders:
+            folder_ids[name] = folders[0]['id']
+            remember_folder(parent_id, name, folders[0]['id'])
     
-    results = service.files().list(q=query).execute()
+    # Only names whose lookup succeeded with no match are created in the batch
+    missing = [name for name, result in zip(folder_names, lookups)
+               if result is not None and name not in folder_ids]
+    created = execute_batch(service, [
+        service.files().create(
+            body={'name': name, 'mimeType': FOLDER_MIME_TYPE, 'parents': [parent_id]},
+            fields='id'
+        ) for name in missing
+    ])
+    for name, folder in zip(missing, created):
+        if folder is not None:
+            folder_ids[name] = folder['id']
+            remember_folder(parent_id, name, folder['id'])
+            safe_print(f"[+] Created folder: {name}")
+    
+    for name in folder_names:
+        if name not in folder_ids:
+            folder_ids[name] = find_or_create_folder(service, name, parent_id)
+    return folder_ids
+
+def find_or_create_folder(service, folder_name, parent_id=None):
+    """Find or create a folder in Google Drive (cached by parent and name)"""
+    key = (parent_id, folder_name)
+    if key in folder_id_cache:
+        return folder_id_cache[key]
+    
+    query = folder_query(folder_name, parent_id)
+    
+    results = service.files().list(q=query).execute(num_retries=DRIVE_NUM_RETRIES)
     folders = results.get('files', [])
     
     if folders:
+        remember_folder(parent_id, folder_name, folders[0]['id'])
         return folders[0]['id']
     
     folder_metadata = {
         'name': folder_name,
-        'mimeType': 'application/vnd.google-apps.folder'
+        'mimeType': FOLDER_MIME_TYPE
     }
     if parent_id:
         folder_metadata['parents'] = [parent_id]
     
-    folder = service.files().create(body=folder_metadata, fields='id').execute()
+    try:
+        folder = service.files().create(body=folder_metadata, fields='id').execute(num_retries=DRIVE_NUM_RETRIES)
+    except HttpError as e:
+        if e.resp.status == 404 and parent_id:
+            # The cached parent was deleted on Drive; the next sync looks it up again
+            forget_folder(parent_id)
+        raise
     safe_print(f"[+] Created folder: {folder_name}")
+    remember_folder(parent_id, folder_name, folder.get('id'))
     return folder.get('id')
 
 def get_mime_type(file_path):
     """Get MIME type based on file extension"""
-    ext = Path(file_path).suffix.lower()
-    mime_types = {
-        '.mp4': 'video/mp4',
-        '.mov': 'video/quicktime',
-        '.avi': 'video/x-msvideo',
-        '.mp3': 'audio/mpeg',
-        '.wav': 'audio/wav',
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.txt': 'text/plain',
-        '.json': 'application/json'
-    }
-    return mime_types.get(ext, 'application/octet-stream')
+    ext = os.path.splitext(file_path)[1].lower()
+    return MIME_TYPES.get(ext) or mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
 
 def safe_print(text):
     """Print text safely, handling Unicode characters on Windows"""
@@ -111,21 +432,43 @@ def safe_print(text):
         # Replace non-ASCII characters with ?
         print(text.encode('ascii', 'replace').decode('ascii'))
 
-def upload_file(service, local_path, drive_folder_id, sync_log):
-    """Upload a single file to Google Drive"""
+def upload_file(service, local_path, drive_folder_id, sync_log, stats=None):
+    """Upload a single file to Google Drive (stats: its os.stat_result, if already known)"""
     file_path = Path(local_path)
     file_name = file_path.name
     
-    file_hash = get_file_hash(local_path)
     sync_key = str(file_path)
+    if stats is None:
+        stats = file_path.stat()
+    size_mtime = [stats.st_size, stats.st_mtime_ns]
+    entry = sync_log.get(sync_key)
+    
+    # Same size and mtime as when it was synced: unchanged, no need to hash it
+    if entry and entry.get('size_mtime') == size_mtime:
+        safe_print(f"[SKIP] {file_name} (already synced)")
+        return entry['drive_id']
     
-    if sync_key in sync_log:
-        if sync_log[sync_key].get('hash') == file_hash:
+    file_hash = None
+    file_quick_hash = quick_hash(local_path, stats.st_size)
+    
+    if entry:
+        if STRICT_HASH or 'quick_hash' not in entry:
+            file_hash = get_file_hash(local_path)
+            unchanged = entry.get('hash') == file_hash
+        else:
+            unchanged = entry['quick_hash'] == file_quick_hash
+        
+        if unchanged:
+            # Only touched; record the new mtime so the next sync skips the hash
+            record_sync(sync_log, sync_key, {**entry, 'size_mtime': size_mtime, 'quick_hash': file_quick_hash})
             safe_print(f"[SKIP] {file_name} (already synced)")
-            return sync_log[sync_key]['drive_id']
+            return entry['drive_id']
+    
+    if file_hash is None and stats.st_size <= QUICK_HASH_MIN_SIZE:
+        # Small files' quick hash already is the full MD5
+        file_hash = file_quick_hash
     
     try:
-        stats = file_path.stat()
         file_size_mb = round(stats.st_size / (1024 * 1024), 2)
         
         safe_print(f"[UPLOAD] {file_name} ({file_size_mb} MB)...")
@@ -136,29 +479,48 @@ def upload_file(service, local_path, drive_folder_id, sync_log):
         }
         
         mime_type = get_mime_type(local_path)
-        media = MediaFileUpload(local_path, mimetype=mime_type, resumable=True)
-        
-        request = service.files().create(
-            body=file_metadata,
-            media_body=media,
-            fields='id,name,webViewLink,size'
-        )
         
-        response = None
-        while response is None:
-            status, response = request.next_chunk()
-            if status:
-                progress = int(status.progress() * 100)
-                safe_print(f"   Progress: {progress}%")
+        # Any MD5 still needed is taken from the bytes being uploaded, not a second read
+        with open(local_path, 'rb') as f:
+            reader = HashingReader(f)
+            resumable = stats.st_size >= SIMPLE_UPLOAD_MAX_SIZE
+            media = MediaIoBaseUpload(reader, mimetype=mime_type, chunksize=UPLOAD_CHUNK_SIZE,
+                                      resumable=resumable)
+            
+            request = service.files().create(
+                body=file_metadata,
+                media_body=media,
+                fields='id,name,webViewLink,size'
+            )
+            
+            if resumable:
+                response = None
+                last_printed = -1
+                while response is None:
+                    status, response = request.next_chunk(num_retries=DRIVE_NUM_RETRIES)
+                    if status:
+                        progress = int(status.progress() * 100)
+                        # At most one line per 10% however small the chunks are
+                        if progress // 10 != last_printed // 10:
+                            safe_print(f"   Progress: {progress}%")
+                            last_printed = progress
+            else:
+                # Small file: no upload session to open, just one request
+                response = request.execute(num_retries=DRIVE_NUM_RETRIES)
+            
+            if file_hash is None:
+                file_hash = reader.hexdigest()
         
-        sync_log[sync_key] = {
+        record_sync(sync_log, sync_key, {
             'drive_id': response['id'],
             'drive_name': response['name'],
             'hash': file_hash,
+            'quick_hash': file_quick_hash,
+            'size_mtime': size_mtime,
             'size': response.get('size', '0'),
             'uploaded_at': datetime.datetime.now().isoformat(),
             'web_link': response.get('webViewLink', '')
-        }
+        })
         
         safe_print(f"   [OK] Uploaded: {response['name']}")
         safe_print(f"   Link: {response.get('webViewLink', 'N/A')}")
@@ -167,13 +529,25 @@ def upload_file(service, local_path, drive_folder_id, sync_log):
         
     except HttpError as e:
         safe_print(f"   [ERROR] Upload failed: {e}")
+        if e.resp.status == 404:
+            # The cached Drive folder was deleted; the next sync looks it up again
+            forget_folder(drive_folder_id)
         return None
     except Exception as e:
         safe_print(f"   [ERROR] {e}")
         return None
 
-def sync_directory(service, local_dir, drive_folder_id, sync_log, folder_name=""):
-    """Recursively sync a directory"""
+def upload_in_thread(creds, local_path, drive_folder_id, sync_log, stats=None):
+    """Upload a file from a worker thread with that thread's own service"""
+    return upload_file(thread_service(creds), local_path, drive_folder_id, sync_log, stats)
+
+def walk_directory(service, local_dir, drive_folder_id, upload, folder_name="", rel_dir=""):
+    """Create Drive folders for a directory tree, calling upload(path, folder_id, stats) per file
+    
+    Entries matching the ignore patterns are skipped, ignored folders
+    without being entered at all. rel_dir is local_dir relative to the
+    top of the walk.
+    """
     local_path = Path(local_dir)
     
     if not local_path.exists():
@@ -183,17 +557,45 @@ def sync_directory(service, local_dir, drive_folder_id, sync_log, folder_name=""
     safe_print(f"\n[FOLDER] Syncing: {folder_name or local_path.name}")
     safe_print("-" * 50)
     
-    items = list(local_path.iterdir())
-    files = [item for item in items if item.is_file()]
-    dirs = [item for item in items if item.is_dir()]
+    # DirEntry type checks come from readdir itself; only files need a stat
+    with os.scandir(local_path) as it:
+        items = list(it)
+    prefix = rel_dir + '/' if rel_dir else ''
+    files = [item for item in items if item.is_file() and not is_ignored(prefix + item.name)]
+    dirs = [item for item in items if item.is_dir() and not is_ignored(prefix + item.name, is_dir=True)]
+    
+    for entry in files:
+        upload(str(local_path / entry.name), drive_folder_id, entry.stat())
     
-    for file_path in files:
-        upload_file(service, str(file_path), drive_folder_id, sync_log)
+    # All of this level's folders are resolved together; their children need their ids
+    folder_ids = find_or_create_folders(service, [d.name for d in dirs], drive_folder_id) if dirs else {}
+    
+    for entry in dirs:
+        subdir_name = entry.name
+        walk_directory(service, str(local_path / subdir_name), folder_ids[subdir_name], upload,
+                       subdir_name, prefix + subdir_name)
+
+def sync_directory(service, local_dir, drive_folder_id, sync_log, folder_name="", creds=None):
+    """Recursively sync a directory
+    
+    Folders are created on this thread. With creds, files are uploaded on
+    SYNC_WORKERS threads, each with its own service; returns once all
+    uploads are done.
+    """
+    if creds is None:
+        walk_directory(service, local_dir, drive_folder_id,
+                       lambda path, folder_id, stats: upload_file(service, path, folder_id, sync_log, stats),
+                       folder_name)
+        return
     
-    for dir_path in dirs:
-        subdir_name = dir_path.name
-        sub_drive_folder_id = find_or_create_folder(service, subdir_name, drive_folder_id)
-        sync_directory(service, str(dir_path), sub_drive_folder_id, sync_log, subdir_name)
+    with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as pool:
+        futures = []
+        walk_directory(service, local_dir, drive_folder_id,
+                       lambda path, folder_id, stats: futures.append(
+                           pool.submit(upload_in_thread, creds, path, folder_id, sync_log, stats)),
+                       folder_name)
+        for future in futures:
+            future.result()
 
 def main():
     """Main sync function"""
@@ -205,7 +607,7 @@ def main():
     if not creds:
         return
     
-    service = build('drive', 'v3', credentials=creds)
+    service = build_service(creds)
     safe_print("[OK] Connected to Google Drive")
     
     sync_log = load_sync_log()
@@ -218,7 +620,7 @@ def main():
     start_time = datetime.datetime.now()
     
     try:
-        sync_directory(service, OUTPUT_DIR, output_folder_id, sync_log, "output")
+        sync_directory(service, OUTPUT_DIR, output_folder_id, sync_log, "output", creds=creds)
         
         save_sync_log(sync_log)
         
@@ -0,0 +1,7 @@
+"""Shared keep-alive session for the Facebook Graph probe scripts."""
+import requests
+from requests.adapters import HTTPAdapter
+
+# One pooled session, so a script's Graph calls reuse a single TLS connection
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
@@ -1,10 +1,14 @@
 import os
-import requests
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Load config
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from tests._fb_session import session
+
+# Load config
 load_dotenv(PROJECT_ROOT / "config.env", override=True)
 
 PAGE_ID = os.getenv("FB_PAGE_ID")
@@ -18,13 +22,27 @@ if not PAGE_ID or not ACCESS_TOKEN:
     print("[X] Missing Credentials")
     exit(1)
 
+# The two checks don't depend on each other, so both requests go out at once
+pool = ThreadPoolExecutor(max_workers=2)
+perm_future = pool.submit(
+    session.get,
+    "https://graph.facebook.com/v20.0/me/permissions",
+    params={"access_token": ACCESS_TOKEN}
+)
+link_future = pool.submit(
+    session.get,
+    f"https://graph.facebook.com/v20.0/{PAGE_ID}",
+    params={
+        "fields": "instagram_business_account",
+        "access_token": ACCESS_TOKEN
+    }
+)
+pool.shutdown(wait=False)
+
 # 1. Check Permissions
 print("\n[*] Checking Token Permissions...")
 try:
-    perm_res = requests.get(
-        "https://graph.facebook.com/v20.0/me/permissions",
-        params={"access_token": ACCESS_TOKEN}
-    )
+    perm_res = perm_future.result()
     perms = perm_res.json().get('data', [])
     granted = [p['permission'] for p in perms if p['status'] == 'granted']
     
@@ -43,13 +61,7 @@ except Exception as e:
 # 2. Check Linked Account
 print("\n[*] Checking for Linked Instagram Account...")
 try:
-    link_res = requests.get(
-        f"https://graph.facebook.com/v20.0/{PAGE_ID}",
-        params={
-            "fields": "instagram_business_account",
-            "access_token": ACCESS_TOKEN
-        }
-    )
+    link_res = link_future.result()
     data = link_res.json()
     
     if 'instagram_business_account' in data:
@@ -1,10 +1,13 @@
 import os
-import requests
+import sys
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Load config
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from tests._fb_session import session
+
+# Load config
 load_dotenv(PROJECT_ROOT / "config.env", override=True)
 
 PAGE_ID = os.getenv("FB_PAGE_ID")
@@ -16,7 +19,7 @@ url = f"https://graph.facebook.com/v20.0/{PAGE_ID}"
 params = {"access_token": ACCESS_TOKEN, "fields": "name,followers_count,link,username"}
 
 try:
-    res = requests.get(url, params=params)
+    res = session.get(url, params=params)
     print(f"Status: {res.status_code}")
     print(res.text)
 except Exception as e:
@@ -47,15 +47,13 @@ async def debug_create_page():
         
         # Find all links
         print('\n[*] All links on page:')
-        links = await page.query_selector_all('a')
-        for link in links[:30]:
-            try:
-                href = await link.get_attribute('href')
-                text = await link.inner_text()
-                if href and ('create' in href.lower() or 'edit' in href.lower()):
-                    print(f'  FOUND: href="{href}" text="{text[:30]}"')
-            except:
-                pass
+        # Read every link's href and text in one round trip
+        links = await page.eval_on_selector_all(
+            'a', 'els => els.slice(0, 30).map(el => [el.getAttribute("href"), el.innerText])'
+        )
+        for href, text in links:
+            if href and ('create' in href.lower() or 'edit' in href.lower()):
+                print(f'  FOUND: href="{href}" text="{text[:30]}"')
         
         # Find all buttons
         print('\n[*] Buttons with edit/create/open text:')
@@ -1,10 +1,13 @@
 import os
-import requests
+import sys
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Load config
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from tests._fb_session import session
+
+# Load config
 load_dotenv(PROJECT_ROOT / "config.env", override=True)
 
 PAGE_ID = os.getenv("FB_PAGE_ID")
@@ -18,7 +21,7 @@ print(f"Page ID: {PAGE_ID}")
 # Exchange User Token for Page Token
 print("\n[*] Exchanging User Token for Page Token...")
 token_url = f"https://graph.facebook.com/v20.0/{PAGE_ID}?fields=access_token&access_token={ACCESS_TOKEN}"
-token_res = requests.get(token_url)
+token_res = session.get(token_url)
 if token_res.status_code == 200 and "access_token" in token_res.json():
     PAGE_TOKEN = token_res.json()["access_token"]
     print("✅ Got Page Token!")
@@ -37,13 +40,13 @@ payload = {
 
 print(f"\n[*] Sending POST to: {url}")
 try:
-    res = requests.post(url, data=payload)
+    res = session.post(url, data=payload)
     print(f"Status Code: {res.status_code}")
     print(res.text)
     
     if res.status_code == 400 or res.status_code == 404:
         print(f"\n[*] Retrying with ALT URL: {alt_url}")
-        res2 = requests.post(alt_url, data=payload)
+        res2 = session.post(alt_url, data=payload)
         print(f"ALT Status Code: {res2.status_code}")
         print(res2.text)
 
@@ -1,7 +1,12 @@
 import os
-import requests
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests._fb_session import session
+
 # Load config
 load_dotenv("d:/oneclick_reels_ai/config.env")
 
@@ -16,9 +21,16 @@ def check_token():
         print("❌ Error: FB_ACCESS_TOKEN is missing in config.env")
         return
 
-    # 1. Debug Token
+    # The token debug and page lookup are independent; send them together
+    # (the endpoint probe below needs the page token, so it waits)
     url = f"https://graph.facebook.com/debug_token?input_token={ACCESS_TOKEN}&access_token={ACCESS_TOKEN}"
-    res = requests.get(url)
+    page_url = f"https://graph.facebook.com/v20.0/{PAGE_ID}?fields=id,name,access_token&access_token={ACCESS_TOKEN}"
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        res_future = pool.submit(session.get, url)
+        page_future = pool.submit(session.get, page_url) if PAGE_ID else None
+
+    # 1. Debug Token
+    res = res_future.result()
     data = res.json()
     
     if "error" in data:
@@ -38,8 +50,7 @@ def check_token():
         return
 
     print(f"\n[Checking Page ID: {PAGE_ID}]")
-    page_url = f"https://graph.facebook.com/v20.0/{PAGE_ID}?fields=id,name,access_token&access_token={ACCESS_TOKEN}"
-    page_res = requests.get(page_url)
+    page_res = page_future.result()
     
     page_token = ACCESS_TOKEN  # Default to user token
     if page_res.status_code == 200:
@@ -57,7 +68,7 @@ def check_token():
     print("\n[Testing /video_reels endpoint capability]")
     test_url = f"https://graph.facebook.com/v20.0/{PAGE_ID}/video_reels"
     # Use the PAGE TOKEN, not the user token
-    test_res = requests.get(test_url, params={"access_token": page_token})
+    test_res = session.get(test_url, params={"access_token": page_token})
     print(f"Endpoint Check Response: {test_res.status_code} - {test_res.text}")
 
 if __name__ == "__main__":
@@ -2,6 +2,21 @@
 import asyncio
 from playwright.async_api import async_playwright
 
+# Candidate selectors for the "Add music" control
+MUSIC_SELECTORS = (
+    'button:has-text("Add music")',
+    'div:has-text("Add music")',
+    '[aria-label*="music"]',
+    '[aria-label*="audio"]',
+    'text=Add music',
+    'text="Add music"',
+)
+
+async def probe_selector(page, sel):
+    """Find a selector's first match and its bounding box."""
+    el = await page.query_selector(sel)
+    return el, (await el.bounding_box() if el else None)
+
 async def inspect_music_ui():
     async with async_playwright() as p:
         context = await p.chromium.launch_persistent_context(
@@ -19,25 +34,19 @@ async def inspect_music_ui():
         # Get page content and find all text
         print('[*] Looking for Add music...')
         
-        # Try different selectors
-        selectors = [
-            'button:has-text("Add music")',
-            'div:has-text("Add music")',
-            '[aria-label*="music"]',
-            '[aria-label*="audio"]',
-            'text=Add music',
-            'text="Add music"',
-        ]
-        
-        for sel in selectors:
-            try:
-                el = await page.query_selector(sel)
-                if el:
-                    print(f'[OK] Found with selector: {sel}')
-                    box = await el.bounding_box()
-                    print(f'    Position: {box}')
-            except Exception as e:
-                print(f'[X] {sel}: {e}')
+        # Try different selectors, all in flight at once
+        results = await asyncio.gather(
+            *(probe_selector(page, sel) for sel in MUSIC_SELECTORS),
+            return_exceptions=True
+        )
+        for sel, result in zip(MUSIC_SELECTORS, results):
+            if isinstance(result, Exception):
+                print(f'[X] {sel}: {result}')
+                continue
+            el, box = result
+            if el:
+                print(f'[OK] Found with selector: {sel}')
+                print(f'    Position: {box}')
         
         # Get all visible text on page
         print('\n[*] All buttons on page:')
@@ -57,23 +66,27 @@ async def inspect_music_ui():
         
         # Get all text containing "music" or "audio"
         print('\n[*] Elements with music/audio text:')
-        all_elements = await page.query_selector_all('*')
-        for el in all_elements[:500]:
-            try:
-                text = await el.inner_text()
-                if text and ('music' in text.lower() or 'audio' in text.lower()) and len(text) < 100:
-                    tag = await el.evaluate('el => el.tagName')
-                    print(f'  <{tag}>: "{text.strip()}"')
-            except:
-                pass
+        # Filtered in the page: one round trip instead of two per element
+        matches = await page.evaluate('''() => {
+            const out = [];
+            for (const el of Array.from(document.querySelectorAll('*')).slice(0, 500)) {
+                const text = el.innerText;
+                if (text && text.length < 100 && /music|audio/i.test(text)) {
+                    out.push({tag: el.tagName, text: text.trim()});
+                }
+            }
+            return out;
+        }''')
+        for match in matches:
+            print(f'  <{match["tag"]}>: "{match["text"]}"')
         
         print('\n[*] Browser open - check manually')
-        print('Press Ctrl+C to close...')
+        print('Close the browser (or press Ctrl+C) to exit...')
         
+        # Block until the page closes instead of waking up every second
         try:
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
+            await page.wait_for_event('close', timeout=0)
+        except (KeyboardInterrupt, asyncio.CancelledError):
             pass
         
         await context.close()
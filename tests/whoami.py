@@ -1,10 +1,13 @@
 import os
-import requests
+import sys
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Load config
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from tests._fb_session import session
+
+# Load config
 load_dotenv(PROJECT_ROOT / "config.env", override=True)
 
 ACCESS_TOKEN = os.getenv("FB_ACCESS_TOKEN")
@@ -23,7 +26,7 @@ url = "https://graph.facebook.com/v20.0/me"
 params = {"access_token": ACCESS_TOKEN}
 
 try:
-    res = requests.get(url, params=params)
+    res = session.get(url, params=params)
     data = res.json()
     print(f"Token Owner: {data.get('name')}")
     print(f"Owner ID: {data.get('id')}")
@@ -7,12 +7,14 @@ from tools.trending_analyzer import (
     analyze_video,
     analyze_trending_topics,
     youtube_analyzer,
-    get_comprehensive_trend_analysis
+    get_comprehensive_trend_analysis,
+    get_comprehensive_trend_analysis_async
 )
 
 __all__ = [
     "analyze_video",
     "analyze_trending_topics",
     "youtube_analyzer",
-    "get_comprehensive_trend_analysis"
+    "get_comprehensive_trend_analysis",
+    "get_comprehensive_trend_analysis_async"
 ]
@@ -7,142 +7,326 @@ Integrates with ai_engine.trend_analyzer for comprehensive trend analysis
 """
 import os
 import sys
+import json
+import time
+import atexit
+import asyncio
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit, parse_qs
+from typing import Dict, List, Any, Optional, Tuple
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+import numpy as np
 from video_engine.youtube_downloader_ytdlp import get_video_info
-from dotenv import load_dotenv
-from rich import print
-from rich.table import Table
-from rich.console import Console
 
-load_dotenv("config.env")
-console = Console()
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# Rich is only imported once something is actually printed
+_rich_console = None
+
+
+def _console():
+    """Get the shared Rich console, creating it on first use."""
+    global _rich_console
+    if _rich_console is None:
+        from rich.console import Console
+        _rich_console = Console()
+    return _rich_console
+
+
+def print(*args, **kwargs):
+    """Print with Rich markup through the shared console."""
+    _console().print(*args, **kwargs)
+
+
+# Upper bound on metadata fetches in flight at once (each is one yt-dlp round-trip)
+MAX_CONCURRENT_FETCHES = 16
+
+# Fetch pool shared by every batch, created on first use
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Trending insights go stale within hours; keep a bounded number of niches
+INSIGHTS_TTL = 6 * 3600
+INSIGHTS_MAXSIZE = 128
+
+# Most recent single-video analyses kept by YouTubeTrendingAnalyzer
+MAX_HISTORY = 1024
+
+# Per-URL analysis results, so repeat lookups skip the yt-dlp round-trip
+VIDEO_CACHE_TTL = 3600
+VIDEO_CACHE_MAXSIZE = 512
+_video_cache: Dict[str, tuple] = {}  # canonical url -> (expires_at, analysis)
+_video_cache_lock = threading.Lock()
+
+# Fields kept from get_video_info(), with the value used when one is missing
+_VIDEO_FIELDS = (
+    ("title", None),
+    ("channel", None),
+    ("views", 0),
+    ("likes", 0),
+    ("duration", 0),
+    ("upload_date", None),
+    ("description", ""),
+)
+
+# AI trend lookups per (method, niche, argument); opportunities are date-bound so expire sooner
+TOPICS_CACHE_TTL = 3600
+OPPORTUNITIES_CACHE_TTL = 1800
+TREND_CACHE_MAXSIZE = 128
+_trend_cache: Dict[tuple, tuple] = {}  # key -> (expires_at, result)
+_trend_cache_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared metadata fetch pool, starting it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES,
+                                           thread_name_prefix="trendfetch")
+            atexit.register(_executor.shutdown, wait=False)
+        return _executor
+
+
+def _cached_trend_call(method, niche: str, arg: int, ttl: float):
+    """Call a trend_analyzer method, reusing its result for ttl seconds."""
+    key = (method.__name__, niche, arg)
+    with _trend_cache_lock:
+        entry = _trend_cache.get(key)
+        if entry is not None:
+            if time.monotonic() < entry[0]:
+                return entry[1]
+            del _trend_cache[key]
+    
+    result = method(niche, arg)
+    if result:
+        with _trend_cache_lock:
+            while len(_trend_cache) >= TREND_CACHE_MAXSIZE:
+                del _trend_cache[next(iter(_trend_cache))]
+            _trend_cache[key] = (time.monotonic() + ttl, result)
+    return result
+
+
+def _canon_url(url: str) -> str:
+    """Normalize a YouTube URL so share links and bare links map to the same video."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.").removeprefix("m.")
+    path = parts.path.rstrip("/")
+    
+    if host == "youtu.be":
+        return f"youtube.com/watch?v={path.lstrip('/')}"
+    if path == "/watch":
+        video_id = parse_qs(parts.query).get("v", [""])[0]
+        return f"{host}/watch?v={video_id}"
+    return f"{host}{path}"
+
 
 def analyze_video(video_url: str):
     """
     Analyze a single video for insights (metadata only)
     
+    Successful results are cached per video for VIDEO_CACHE_TTL seconds.
+    
     Args:
         video_url: YouTube video/shorts URL
     
     Returns:
         dict: Analysis results
     """
+    key = _canon_url(video_url)
+    with _video_cache_lock:
+        entry = _video_cache.get(key)
+        if entry is not None:
+            if time.monotonic() < entry[0]:
+                return entry[1]
+            del _video_cache[key]
+    
+    analysis = _fetch_video_analysis(video_url)
+    if analysis:
+        with _video_cache_lock:
+            while len(_video_cache) >= VIDEO_CACHE_MAXSIZE:
+                del _video_cache[next(iter(_video_cache))]
+            _video_cache[key] = (time.monotonic() + VIDEO_CACHE_TTL, analysis)
+    return analysis
+
+
+def _fetch_video_analysis(video_url: str):
+    """Fetch metadata for one video, filling in defaults for missing fields."""
     try:
         info = get_video_info(video_url)
         
-        # Extract insights
-        engagement_rate = 0
-        if info.get('views', 0) > 0:
-            engagement_rate = (info.get('likes', 0) / info['views']) * 100
-        
-        return {
-            "title": info.get("title"),
-            "channel": info.get("channel"),
-            "views": info.get("views", 0),
-            "likes": info.get("likes", 0),
-            "duration": info.get("duration", 0),
-            "engagement_rate": round(engagement_rate, 2),
-            "upload_date": info.get("upload_date"),
-            "description": info.get("description", "")[:100]
-        }
+        # engagement_rate is filled in by the callers, a whole batch at a time
+        analysis = {key: info.get(key) or default for key, default in _VIDEO_FIELDS}
+        analysis["description"] = analysis["description"][:100]
+        return analysis
     except Exception as e:
-        print(f"❌ Error analyzing {video_url}: {e}")
+        # Logged rather than printed: this runs on worker threads
+        logger.warning("analyze_video failed for %s: %s", video_url, e)
         return None
 
 
-def analyze_trending_topics(video_urls: list, niche: str = "General"):
+def engagement_rates(views: np.ndarray, likes: np.ndarray) -> np.ndarray:
+    """Likes per 100 views for each video (0 where a video has no views), to 2 decimals."""
+    rates = np.zeros(len(views), dtype=np.float64)
+    np.divide(likes * 100.0, views, out=rates, where=views > 0)
+    return rates.round(2)
+
+
+def analyze_trending_topics(video_urls: list, niche: str = "General", display: bool = True):
     """
     Analyze multiple trending videos and extract insights
     
     Args:
         video_urls: List of YouTube URLs to analyze
         niche: Topic category (e.g., "Comedy", "Motivation", "Finance")
+        display: Print the results table and recommendations (False for programmatic use)
     
     Returns:
         dict: Aggregated insights and recommendations
     """
-    print(f"\n[cyan]🔍 Analyzing {len(video_urls)} trending videos in '{niche}' niche...[/cyan]\n")
+    if display:
+        print(f"\n[cyan]🔍 Analyzing {len(video_urls)} trending videos in '{niche}' niche...[/cyan]\n")
     
+    # Fetch metadata concurrently; map() keeps results in input order, and the
+    # numeric columns are filled in as each result arrives
     results = []
-    total_views = 0
-    total_engagement = 0
+    views = np.empty(len(video_urls), dtype=np.int64)
+    likes = np.empty(len(video_urls), dtype=np.int64)
+    durations = np.empty(len(video_urls), dtype=np.int64)
     
-    for url in video_urls:
-        analysis = analyze_video(url)
+    for analysis in _get_executor().map(analyze_video, video_urls):
         if analysis:
+            i = len(results)
+            views[i] = analysis['views']
+            likes[i] = analysis['likes']
+            durations[i] = analysis['duration'] or 0
             results.append(analysis)
-            total_views += analysis["views"]
-            total_engagement += analysis["engagement_rate"]
+    
+    failed = len(video_urls) - len(results)
+    if failed:
+        logger.warning("%d of %d videos could not be analyzed in '%s'", failed, len(video_urls), niche)
     
     if not results:
-        print("[red]❌ No videos analyzed successfully[/red]")
+        if display:
+            print("[red]❌ No videos analyzed successfully[/red]")
         return None
     
     # Create results table
-    table = Table(title=f"📊 {niche} Niche Analysis", show_lines=True)
-    table.add_column("Title", style="cyan", width=40)
-    table.add_column("Channel", style="green")
-    table.add_column("Views", style="yellow", justify="right")
-    table.add_column("Engagement %", style="magenta", justify="right")
-    table.add_column("Duration", style="blue", justify="right")
-    
-    for result in results:
-        views_formatted = f"{result['views']:,}" if result['views'] else "N/A"
-        duration_formatted = f"{result['duration']}s" if result['duration'] else "N/A"
+    if display:
+        from rich.table import Table
+        from rich.text import Text
         
-        table.add_row(
-            result['title'][:40] + "..." if len(result['title']) > 40 else result['title'],
-            result['channel'],
-            views_formatted,
-            f"{result['engagement_rate']:.2f}%",
-            duration_formatted
-        )
+        table = Table(title=f"📊 {niche} Niche Analysis", show_lines=True)
+        table.add_column("Title", style="cyan", width=40, overflow="ellipsis", no_wrap=True)
+        table.add_column("Channel", style="green")
+        table.add_column("Views", style="yellow", justify="right")
+        table.add_column("Engagement %", style="magenta", justify="right")
+        table.add_column("Duration", style="blue", justify="right")
     
-    console.print(table)
+    count = len(results)
+    views, likes, durations = views[:count], likes[:count], durations[:count]
+    engagement = engagement_rates(views, likes)
+    
+    for result, rate in zip(results, engagement):
+        rate = result['engagement_rate'] = float(rate)
+        
+        # Plain Text cells skip markup parsing, so brackets in titles print as-is
+        if display:
+            table.add_row(
+                Text(result['title'] or ""),
+                Text(result['channel'] or ""),
+                Text(format(result['views'], ',d') if result['views'] else "N/A"),
+                Text(f"{rate:.2f}%"),
+                Text(f"{result['duration']}s" if result['duration'] else "N/A")
+            )
+    
+    if display:
+        _console().print(table)
     
     # Calculate insights
-    avg_views = total_views // len(results)
-    avg_engagement = total_engagement / len(results)
+    avg_views = int(views.sum()) // count
+    avg_engagement = float(engagement.mean())
     
     insights = {
         "niche": niche,
-        "videos_analyzed": len(results),
+        "videos_analyzed": count,
         "avg_views": avg_views,
         "avg_engagement": round(avg_engagement, 2),
-        "top_video": max(results, key=lambda x: x['views']),
+        "top_video": results[int(views.argmax())],
         "recommendations": []
     }
     
     # Generate recommendations
-    print("\n[bold green]💡 Content Strategy Recommendations:[/bold green]")
-    
     if avg_engagement > 5:
-        print("✅ High engagement niche - Great opportunity!")
+        message = "✅ High engagement niche - Great opportunity!"
         insights["recommendations"].append("High engagement potential")
     elif avg_engagement > 2:
-        print("⚠️ Moderate engagement - Focus on quality")
+        message = "⚠️ Moderate engagement - Focus on quality"
         insights["recommendations"].append("Focus on quality over quantity")
     else:
-        print("⚠️ Low engagement - Consider different angles")
+        message = "⚠️ Low engagement - Consider different angles"
         insights["recommendations"].append("Try unique angles or different subtopics")
     
-    # Duration insights
-    avg_duration = sum(r['duration'] for r in results if r['duration']) / len([r for r in results if r['duration']])
-    print(f"\n📏 Optimal duration: ~{int(avg_duration)}s")
+    # Duration insights (unknown durations are stored as 0, so they add nothing
+    # to the sum and are left out of the count)
+    known_count = np.count_nonzero(durations)
+    avg_duration = int(durations.sum()) / known_count if known_count else 0
     insights["optimal_duration"] = int(avg_duration)
     
+    if display:
+        print("\n[bold green]💡 Content Strategy Recommendations:[/bold green]")
+        print(message)
+        print(f"\n📏 Optimal duration: ~{int(avg_duration)}s")
+    
     return insights
 
 
+# Idea templates per niche, filled in with the optimal duration
+_IDEA_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    "Comedy": (
+        "Create {duration}s comedy shorts about daily life",
+        "Use Indian humor style with Hindi/Hinglish mix",
+        "Focus on relatable situations (work, family, relationships)"
+    ),
+    "Motivation": (
+        "Make {duration}s motivational clips",
+        "Use powerful quotes with dynamic visuals",
+        "Focus on discipline and consistency themes"
+    ),
+    "Finance": (
+        "Create {duration}s money tips",
+        "Explain investing concepts simply",
+        "Share practical wealth-building strategies"
+    ),
+    "General": (
+        "Create {duration}s engaging shorts",
+        "Focus on high-quality visuals and clear messaging",
+        "Test different content angles"
+    )
+}
+
+# Ideas offered for a niche that hasn't been analyzed yet
+_DEFAULT_IDEAS: Tuple[str, ...] = (
+    "Create engaging {niche} content",
+    "Focus on trending topics in your niche",
+    "Analyze competitor videos for inspiration"
+)
+
+
 def suggest_content_ideas(analyzed_data: dict):
     """
     Generate original content ideas based on trending analysis
@@ -152,36 +336,19 @@ def suggest_content_ideas(analyzed_data: dict):
     """
     print("\n[bold magenta]🎯 Original Content Ideas (Based on Trends):[/bold magenta]")
     
-    niche = analyzed_data["niche"]
-    
-    ideas = {
-        "Comedy": [
-            f"Create {int(analyzed_data['optimal_duration'])}s comedy shorts about daily life",
-            "Use Indian humor style with Hindi/Hinglish mix",
-            "Focus on relatable situations (work, family, relationships)"
-        ],
-        "Motivation": [
-            f"Make {int(analyzed_data['optimal_duration'])}s motivational clips",
-            "Use powerful quotes with dynamic visuals",
-            "Focus on discipline and consistency themes"
-        ],
-        "Finance": [
-            f"Create {int(analyzed_data['optimal_duration'])}s money tips",
-            "Explain investing concepts simply",
-            "Share practical wealth-building strategies"
-        ],
-        "General": [
-            f"Create {int(analyzed_data['optimal_duration'])}s engaging shorts",
-            "Focus on high-quality visuals and clear messaging",
-            "Test different content angles"
-        ]
-    }
+    templates = _IDEA_TEMPLATES.get(analyzed_data["niche"], _IDEA_TEMPLATES["General"])
+    duration = int(analyzed_data['optimal_duration'])
     
-    for idea in ideas.get(niche, ideas["General"]):
-        print(f"  💡 {idea}")
+    for template in templates:
+        print(f"  💡 {template.format(duration=duration)}")
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from rich.logging import RichHandler
+    load_dotenv("config.env")
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", handlers=[RichHandler()])
+    
     # Example: Analyze trending comedy shorts
     comedy_urls = [
         "https://www.youtube.com/shorts/EXAMPLE1",
@@ -199,10 +366,13 @@ if __name__ == "__main__":
 
 
 
-def get_comprehensive_trend_analysis(niche: str, video_urls: List[str] = None) -> Dict[str, Any]:
+async def get_comprehensive_trend_analysis_async(niche: str, video_urls: List[str] = None) -> Dict[str, Any]:
     """
     Combine YouTube video analysis with AI trend analysis for comprehensive insights.
     
+    Competitor analysis, trending-topic discovery and opportunity finding don't
+    depend on each other, so they run concurrently on worker threads.
+    
     Args:
         niche: Content niche (motivation, finance, facts, comedy)
         video_urls: Optional list of YouTube URLs to analyze
@@ -221,18 +391,29 @@ def get_comprehensive_trend_analysis(niche: str, video_urls: List[str] = None) -
             "recommendations": []
         }
         
+        async def no_competitors():
+            return None
+        
         # 1. Analyze competitor videos if URLs provided
         if video_urls:
             print(f"\n[cyan]📊 Analyzing {len(video_urls)} competitor videos...[/cyan]")
-            results["competitor_analysis"] = analyze_trending_topics(video_urls, niche)
-        
-        # 2. Get AI-powered trending topics
-        print(f"\n[cyan]🔍 Discovering trending topics for '{niche}'...[/cyan]")
-        results["trending_topics"] = trend_analyzer.get_trending_topics(niche, limit=10)
+            competitor_task = asyncio.to_thread(analyze_trending_topics, video_urls, niche)
+        else:
+            competitor_task = no_competitors()
         
-        # 3. Find content opportunities
-        print(f"\n[cyan]💡 Finding content opportunities...[/cyan]")
-        results["content_opportunities"] = trend_analyzer.find_content_opportunities(niche, days_ahead=7)
+        # 2. Get AI-powered trending topics, 3. Find content opportunities
+        print(f"\n[cyan]🔍 Discovering trending topics and content opportunities for '{niche}'...[/cyan]")
+        (
+            results["competitor_analysis"],
+            results["trending_topics"],
+            results["content_opportunities"],
+        ) = await asyncio.gather(
+            competitor_task,
+            asyncio.to_thread(_cached_trend_call, trend_analyzer.get_trending_topics,
+                              niche, 10, TOPICS_CACHE_TTL),
+            asyncio.to_thread(_cached_trend_call, trend_analyzer.find_content_opportunities,
+                              niche, 7, OPPORTUNITIES_CACHE_TTL),
+        )
         
         # 4. Generate combined recommendations
         recommendations = []
@@ -265,43 +446,86 @@ def get_comprehensive_trend_analysis(niche: str, video_urls: List[str] = None) -
     except ImportError:
         print("[yellow]⚠️ ai_engine.trend_analyzer not available. Using basic analysis only.[/yellow]")
         if video_urls:
-            return {"competitor_analysis": analyze_trending_topics(video_urls, niche)}
+            return {"competitor_analysis": await asyncio.to_thread(analyze_trending_topics, video_urls, niche)}
         return {"error": "No video URLs provided and AI trend analyzer not available"}
     except Exception as e:
         logger.error(f"Comprehensive analysis failed: {e}")
         return {"error": str(e)}
 
 
+def get_comprehensive_trend_analysis(niche: str, video_urls: List[str] = None) -> Dict[str, Any]:
+    """
+    Synchronous wrapper around get_comprehensive_trend_analysis_async().
+    
+    Must not be called from a running event loop - await the async version there.
+    """
+    return asyncio.run(get_comprehensive_trend_analysis_async(niche, video_urls))
+
+
 class YouTubeTrendingAnalyzer:
     """
     Class-based analyzer for integration with other modules.
     """
     
-    def __init__(self):
-        self.analyzed_videos = []
+    def __init__(self, ttl: float = INSIGHTS_TTL, maxsize: int = INSIGHTS_MAXSIZE,
+                 max_history: int = MAX_HISTORY):
+        self.analyzed_videos = deque(maxlen=max_history)
+        # canonical URLs of analyzed_videos, in the same order
+        self._seen_order = deque()
+        self._seen = set()
+        # niche -> (expires_at, insights), oldest first
         self.insights_cache = {}
+        self.ttl = ttl
+        self.maxsize = maxsize
+    
+    def _get_insights(self, niche: str) -> Optional[Dict[str, Any]]:
+        """Get cached insights for a niche, dropping them once expired."""
+        entry = self.insights_cache.get(niche)
+        if entry is None:
+            return None
+        
+        expires_at, insights = entry
+        if time.monotonic() >= expires_at:
+            del self.insights_cache[niche]
+            return None
+        return insights
+    
+    def _store_insights(self, niche: str, insights: Dict[str, Any]):
+        """Cache insights for a niche, evicting the oldest entry when full."""
+        self.insights_cache.pop(niche, None)
+        while len(self.insights_cache) >= self.maxsize:
+            del self.insights_cache[next(iter(self.insights_cache))]
+        self.insights_cache[niche] = (time.monotonic() + self.ttl, insights)
     
     def analyze_single_video(self, video_url: str) -> Optional[Dict[str, Any]]:
         """Analyze a single YouTube video."""
         result = analyze_video(video_url)
         if result:
-            self.analyzed_videos.append(result)
+            result['engagement_rate'] = float(
+                engagement_rates(np.array([result['views']]), np.array([result['likes']]))[0]
+            )
+            key = _canon_url(video_url)
+            if key not in self._seen:
+                if len(self.analyzed_videos) == self.analyzed_videos.maxlen:
+                    self._seen.discard(self._seen_order.popleft())
+                self._seen.add(key)
+                self._seen_order.append(key)
+                self.analyzed_videos.append(result)
         return result
     
     def analyze_batch(self, video_urls: List[str], niche: str = "General") -> Dict[str, Any]:
         """Analyze multiple videos and generate insights."""
-        return analyze_trending_topics(video_urls, niche)
+        insights = analyze_trending_topics(video_urls, niche, display=False)
+        if insights:
+            self._store_insights(niche, insights)
+        return insights
     
     def get_content_ideas(self, niche: str) -> List[str]:
         """Get content ideas based on analyzed data."""
-        if niche not in self.insights_cache:
-            return [
-                f"Create engaging {niche} content",
-                "Focus on trending topics in your niche",
-                "Analyze competitor videos for inspiration"
-            ]
+        analyzed_data = self._get_insights(niche)
+        if analyzed_data is None:
+            return [idea.format(niche=niche) for idea in _DEFAULT_IDEAS]
         
-        analyzed_data = self.insights_cache[niche]
         ideas = []
         
         if analyzed_data.get("optimal_duration"):
@@ -314,15 +538,24 @@ class YouTubeTrendingAnalyzer:
     
     def export_analysis(self, format: str = "json") -> str:
         """Export analysis results."""
-        import json
         
         export_data = {
-            "analyzed_videos": self.analyzed_videos,
-            "insights": self.insights_cache,
+            "analyzed_videos": list(self.analyzed_videos),
+            "insights": {
+                niche: insights
+                for niche in list(self.insights_cache)
+                if (insights := self._get_insights(niche)) is not None
+            },
             "total_videos_analyzed": len(self.analyzed_videos)
         }
         
         if format == "json":
+            if HAS_ORJSON:
+                return orjson.dumps(
+                    export_data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                    default=str
+                ).decode()
             return json.dumps(export_data, indent=2, default=str)
         else:
             return str(export_data)